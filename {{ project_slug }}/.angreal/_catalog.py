@@ -0,0 +1,242 @@
+"""SQLite catalog of the project's epochs and notebooks.
+
+The catalog lives in ``.cache/catalog.sqlite`` and is refreshed incrementally:
+``refresh`` stats every notebook but only re-parses the ones whose mtime or
+size changed since they were last indexed, and drops rows for deleted files.
+Test timings come from the ``angreal test notebook`` results cache, so
+"slowest notebooks" reflects the last test run.
+"""
+import ast
+import json
+import os
+import re
+import sqlite3
+from pathlib import Path
+
+CATALOG_FILE = os.path.join(".cache", "catalog.sqlite")
+NOTEBOOK_TESTS_FILE = os.path.join(".cache", "notebook_tests.json")
+
+EPOCH_PATTERN = re.compile(r"epoch_(\d+)$")
+TITLE_PATTERN = re.compile(r"^#\s+(.+)$", re.MULTILINE)
+AUTHOR_PATTERN = re.compile(r"\*\*Author:\*\*\s*(.+)")
+DATE_PATTERN = re.compile(r"\*\*Date:\*\*\s*(.+)")
+IMPORT_PATTERN = re.compile(r"^\s*(?:from\s+([\w.]+)\s+import|import\s+([\w.]+))", re.MULTILINE)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS epochs (
+    number INTEGER PRIMARY KEY,
+    path TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS notebooks (
+    path TEXT PRIMARY KEY,
+    epoch INTEGER,
+    title TEXT,
+    author TEXT,
+    date TEXT,
+    last_executed TEXT,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    test_result TEXT,
+    test_seconds REAL,
+    peak_rss_mb REAL
+);
+CREATE TABLE IF NOT EXISTS imports (
+    path TEXT NOT NULL REFERENCES notebooks(path) ON DELETE CASCADE,
+    module TEXT NOT NULL,
+    PRIMARY KEY (path, module)
+);
+CREATE INDEX IF NOT EXISTS imports_module ON imports(module);
+CREATE INDEX IF NOT EXISTS notebooks_epoch ON notebooks(epoch);
+"""
+
+
+def _source(cell):
+    source = cell.get("source", "")
+    return "".join(source) if isinstance(source, list) else source
+
+
+def _imports(code):
+    """Top-level module names imported by a notebook's code cells."""
+    # IPython magics and shell escapes are not Python; blank them out for ast.
+    cleaned = "\n".join(
+        "" if line.lstrip().startswith(("%", "!")) else line for line in code.splitlines()
+    )
+    modules = set()
+    try:
+        tree = ast.parse(cleaned)
+    except SyntaxError:
+        for match in IMPORT_PATTERN.finditer(cleaned):
+            modules.add((match.group(1) or match.group(2)).split(".")[0])
+        return modules
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            modules.update(alias.name.split(".")[0] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            modules.add(node.module.split(".")[0])
+    return modules
+
+
+def parse_notebook(path):
+    """Extract catalog fields from a notebook file.
+
+    Returns:
+        A dict with ``title``, ``author``, ``date``, ``last_executed`` and
+        ``imports``. Fields that cannot be found are None.
+    """
+    with open(path) as f:
+        cells = json.load(f).get("cells", [])
+    markdown = "\n".join(_source(c) for c in cells if c.get("cell_type") == "markdown")
+    code = "\n".join(_source(c) for c in cells if c.get("cell_type") == "code")
+
+    # Jupyter records per-cell timestamps when execution timing is enabled.
+    executed = [
+        c.get("metadata", {}).get("execution", {}).get("shell.execute_reply")
+        for c in cells if c.get("cell_type") == "code"
+    ]
+    executed = [ts for ts in executed if ts]
+
+    fields = {}
+    for name, pattern in (("title", TITLE_PATTERN), ("author", AUTHOR_PATTERN), ("date", DATE_PATTERN)):
+        match = pattern.search(markdown)
+        fields[name] = match.group(1).strip() if match else None
+    fields["last_executed"] = max(executed) if executed else None
+    fields["imports"] = _imports(code)
+    return fields
+
+
+class Catalog:
+    """Incrementally maintained index of epochs and notebooks.
+
+    Args:
+        project_root: Directory containing ``notebooks/``.
+    """
+
+    def __init__(self, project_root):
+        self.root = Path(project_root).resolve()
+        self.notebooks_dir = self.root / "notebooks"
+        db_path = self.root / CATALOG_FILE
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(str(db_path))
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("PRAGMA foreign_keys = ON")
+        self.db.execute("PRAGMA journal_mode = WAL")
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def refresh(self):
+        """Bring the catalog in line with the files on disk.
+
+        Returns:
+            Number of notebooks that were (re-)parsed.
+        """
+        epochs = {}
+        on_disk = {}
+        if self.notebooks_dir.is_dir():
+            for entry in os.scandir(self.notebooks_dir):
+                match = EPOCH_PATTERN.match(entry.name)
+                if not (match and entry.is_dir()):
+                    continue
+                number = int(match.group(1))
+                epochs[number] = os.path.relpath(entry.path, self.root)
+                for nb in os.scandir(entry.path):
+                    if nb.name.endswith(".ipynb") and nb.is_file():
+                        stat = nb.stat()
+                        on_disk[os.path.relpath(nb.path, self.root)] = (number, stat.st_mtime_ns, stat.st_size)
+
+        known = {
+            row["path"]: (row["mtime_ns"], row["size"])
+            for row in self.db.execute("SELECT path, mtime_ns, size FROM notebooks")
+        }
+        changed = [path for path, (_, mtime, size) in on_disk.items() if known.get(path) != (mtime, size)]
+        removed = [path for path in known if path not in on_disk]
+
+        with self.db:
+            self.db.execute("DELETE FROM epochs")
+            self.db.executemany("INSERT INTO epochs VALUES (?, ?)", epochs.items())
+            self.db.executemany("DELETE FROM notebooks WHERE path = ?", [(p,) for p in removed])
+            for path in changed:
+                epoch, mtime, size = on_disk[path]
+                try:
+                    fields = parse_notebook(self.root / path)
+                except (OSError, ValueError) as e:
+                    print(f"Warning: could not parse {path}: {e}")
+                    fields = {"title": None, "author": None, "date": None, "last_executed": None, "imports": ()}
+                self.db.execute(
+                    "INSERT INTO notebooks (path, epoch, title, author, date, last_executed, mtime_ns, size) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT(path) DO UPDATE SET epoch = excluded.epoch, title = excluded.title, "
+                    "author = excluded.author, date = excluded.date, last_executed = excluded.last_executed, "
+                    "mtime_ns = excluded.mtime_ns, size = excluded.size",
+                    (path, epoch, fields["title"], fields["author"], fields["date"],
+                     fields["last_executed"], mtime, size),
+                )
+                self.db.execute("DELETE FROM imports WHERE path = ?", (path,))
+                self.db.executemany(
+                    "INSERT INTO imports VALUES (?, ?)", [(path, module) for module in sorted(fields["imports"])]
+                )
+            self._load_test_results()
+        return len(changed)
+
+    def _load_test_results(self):
+        try:
+            with open(self.root / NOTEBOOK_TESTS_FILE) as f:
+                results = json.load(f)
+        except (OSError, ValueError):
+            return
+        self.db.execute("UPDATE notebooks SET test_result = NULL, test_seconds = NULL, peak_rss_mb = NULL")
+        self.db.executemany(
+            "UPDATE notebooks SET test_result = ?, test_seconds = ?, peak_rss_mb = ? WHERE path = ?",
+            [
+                (entry.get("result"), entry.get("seconds"), entry.get("peak_rss_mb"),
+                 os.path.normpath(name))
+                for name, entry in results.items()
+            ],
+        )
+
+    def latest_epoch(self):
+        """Highest epoch number, or 0 if there are none."""
+        return self.db.execute("SELECT COALESCE(MAX(number), 0) FROM epochs").fetchone()[0]
+
+    def notebooks(self, epoch=None, title=None, author=None, imports=None):
+        """Notebooks matching every given filter, oldest epoch first.
+
+        ``title`` and ``author`` are case-insensitive substring matches;
+        ``imports`` is a top-level module name.
+        """
+        query = "SELECT * FROM notebooks WHERE 1 = 1"
+        params = []
+        if epoch is not None:
+            query += " AND epoch = ?"
+            params.append(int(epoch))
+        if title:
+            query += " AND title LIKE ?"
+            params.append(f"%{title}%")
+        if author:
+            query += " AND author LIKE ?"
+            params.append(f"%{author}%")
+        if imports:
+            query += " AND path IN (SELECT path FROM imports WHERE module = ?)"
+            params.append(imports.split(".")[0])
+        return self.db.execute(query + " ORDER BY epoch, path", params).fetchall()
+
+    def slowest(self, limit=10):
+        """Notebooks with the longest last test run."""
+        return self.db.execute(
+            "SELECT * FROM notebooks WHERE test_seconds IS NOT NULL ORDER BY test_seconds DESC LIMIT ?",
+            (limit,),
+        ).fetchall()
+
+    def recently_executed(self, limit=10):
+        """Notebooks with the most recent recorded execution."""
+        return self.db.execute(
+            "SELECT * FROM notebooks WHERE last_executed IS NOT NULL ORDER BY last_executed DESC LIMIT ?",
+            (limit,),
+        ).fetchall()
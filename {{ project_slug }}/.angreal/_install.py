@@ -0,0 +1,105 @@
+"""Shared install helper for angreal tasks.
+
+Tasks call ``ensure_installed`` instead of ``venv.install`` so that repeated
+runs skip the resolver entirely. Each venv keeps a stamp file recording, per
+requested package set, the fingerprint of ``pyproject.toml`` it was installed
+against; the install only runs again when that fingerprint changes.
+
+Installs go through ``uv`` when it is available. uv is asked to resolve from
+its local wheel cache first (``--offline``) and only goes to the network when
+something is missing, so repeat installs work on machines without network
+access. Set ``UV_CACHE_DIR`` to share a pre-populated cache.
+"""
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+
+STAMP_FILE = ".angreal-installs.json"
+
+
+def _fingerprint(project_root, packages):
+    hasher = hashlib.sha256()
+    pyproject = Path(project_root) / "pyproject.toml"
+    if pyproject.is_file():
+        hasher.update(pyproject.read_bytes())
+    for package in packages:
+        hasher.update(package.encode())
+        hasher.update(b"\0")
+    return hasher.hexdigest()
+
+
+def _load_stamps(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_stamps(path, stamps):
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    with os.fdopen(fd, "w") as f:
+        json.dump(stamps, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def find_uv(venv_path):
+    """Path to a uv executable, preferring the one installed in the venv."""
+    candidate = Path(venv_path) / "bin" / "uv"
+    if candidate.is_file():
+        return str(candidate)
+    return shutil.which("uv")
+
+
+def uv_install(uv, python, packages, cwd, extra_args=()):
+    """Install with uv, from the local cache if possible, else from the index.
+
+    Returns:
+        The exit code of the last uv invocation.
+    """
+    cmd = [uv, "pip", "install", "--python", str(python), *extra_args, *packages]
+    result = subprocess.run(cmd + ["--offline"], cwd=cwd, capture_output=True, text=True)
+    if result.returncode == 0:
+        return 0
+    print("Some packages are not in the local uv cache; installing from the index...")
+    return subprocess.run(cmd, cwd=cwd).returncode
+
+
+def ensure_installed(venv, packages, project_root, force=False):
+    """Install ``packages`` into ``venv`` unless they already are.
+
+    Args:
+        venv: An angreal ``VirtualEnv``.
+        packages: pip-style requirement strings.
+        project_root: Directory holding ``pyproject.toml``.
+        force: Install even if the stamp says nothing changed.
+
+    Returns:
+        True if an install ran, False if it was skipped.
+    """
+    packages = sorted(packages)
+    key = " ".join(packages)
+    stamp_path = os.path.join(str(venv.path), STAMP_FILE)
+    stamps = _load_stamps(stamp_path)
+    fingerprint = _fingerprint(project_root, packages)
+    if not force and stamps.get(key) == fingerprint:
+        print(f"Dependencies up to date: {key}")
+        return False
+
+    print(f"Installing {key}...")
+    uv = find_uv(venv.path)
+    if uv is None:
+        cmd = [str(venv.python_executable), "-m", "pip", "install", *packages]
+        returncode = subprocess.run(cmd, cwd=project_root).returncode
+    else:
+        returncode = uv_install(uv, venv.python_executable, packages, project_root)
+    if returncode != 0:
+        raise RuntimeError(f"Failed to install {key}")
+
+    stamps[key] = fingerprint
+    _save_stamps(stamp_path, stamps)
+    return True
@@ -0,0 +1,234 @@
+"""Execute notebooks in forks of a pre-warmed IPython process.
+
+Used by ``angreal test notebook --warm`` and run with the project venv's
+python, not by angreal itself:
+
+    python .angreal/_warm_kernels.py --workers 4 --timeout 600 --preload my_package a.ipynb b.ipynb
+
+A cold notebook run starts a kernel and re-imports IPython, the package and
+its dependencies before the first cell executes. This script pays that once:
+it creates an IPython shell, imports the preloaded modules and every module
+the notebooks import at the top level, and then forks one child per notebook.
+Each child starts from the warm state with an empty user namespace and its
+own copy-on-write memory, so nothing a notebook defines or mutates can reach
+another notebook or the parent.
+
+A notebook passes when none of its code cells raise, as with
+``pytest --nbval-lax``. Cells marked ``# NBVAL_SKIP`` are not run and cells
+marked ``# NBVAL_RAISES_EXCEPTION`` may raise. Unlike a Jupyter kernel there
+is no comm channel, so notebooks relying on widgets should use the cold mode.
+
+The parent writes one JSON line per finished notebook to stdout, then a
+``summary`` line with the one-off warm-up time. POSIX only (uses os.fork).
+"""
+import argparse
+import ast
+import importlib
+import json
+import os
+import re
+import signal
+import sys
+import tempfile
+import time
+
+SKIP_MARKER = re.compile(r"^\s*#\s*NBVAL_SKIP\b", re.MULTILINE)
+RAISES_MARKER = re.compile(r"^\s*#\s*NBVAL_RAISES_EXCEPTION\b", re.MULTILINE)
+# How often the parent checks for finished or overdue children.
+POLL_SECONDS = 0.05
+
+
+def _code_cells(notebook):
+    try:
+        with open(notebook) as f:
+            cells = json.load(f).get("cells", [])
+    except (OSError, ValueError):
+        return None
+    sources = []
+    for cell in cells:
+        if cell.get("cell_type") == "code":
+            source = cell.get("source", "")
+            sources.append("".join(source) if isinstance(source, list) else source)
+    return sources
+
+
+def _notebook_imports(notebooks):
+    """Top-level module names imported by the notebooks' code cells."""
+    modules = set()
+    for notebook in notebooks:
+        for source in _code_cells(notebook) or []:
+            # Magics and shell escapes are not Python; drop them before parsing.
+            lines = [line for line in source.splitlines() if not line.lstrip().startswith(("%", "!"))]
+            try:
+                tree = ast.parse("\n".join(lines))
+            except SyntaxError:
+                continue
+            for node in tree.body:
+                if isinstance(node, ast.Import):
+                    modules.update(alias.name for alias in node.names)
+                elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+                    modules.add(node.module)
+    return sorted(modules)
+
+
+def _warm_up(preload):
+    """Create the shell and import everything the children will need."""
+    start = time.perf_counter()
+    # Children must never try to open a GUI window.
+    os.environ.setdefault("MPLBACKEND", "Agg")
+    from traitlets.config import Config
+    from IPython.core.interactiveshell import InteractiveShell
+
+    config = Config()
+    # The history database is an open sqlite connection plus a writer thread;
+    # neither survives a fork.
+    config.HistoryManager.enabled = False
+    # Tracebacks end up in a plain-text report.
+    config.InteractiveShell.colors = "NoColor"
+    shell = InteractiveShell.instance(config=config)
+    loaded = []
+    for name in dict.fromkeys(preload):
+        try:
+            importlib.import_module(name)
+        except Exception:
+            # The child will hit (and report) the same error when the notebook imports it.
+            continue
+        loaded.append(name)
+    return shell, time.perf_counter() - start, loaded
+
+
+def _execute(shell, notebook, log_path, result_path, forked_at):
+    """Child process body: run one notebook's code cells, then exit."""
+    status = 2
+    try:
+        os.setpgid(0, 0)
+        log = os.open(log_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        os.dup2(log, 1)
+        os.dup2(log, 2)
+        os.chdir(os.path.dirname(os.path.abspath(notebook)))
+        cells = _code_cells(notebook)
+        startup = time.perf_counter() - forked_at
+        failed_cell = None
+        if cells is None:
+            print(f"Could not read {notebook}")
+            failed_cell = -1
+        for index, source in enumerate(cells or []):
+            if SKIP_MARKER.search(source):
+                continue
+            result = shell.run_cell(source, store_history=True)
+            if not result.success and not RAISES_MARKER.search(source):
+                print(f"\nCell {index} raised an exception:\n{source}")
+                failed_cell = index
+                break
+        with open(result_path, "w") as f:
+            json.dump({"startup_seconds": startup, "failed_cell": failed_cell}, f)
+        status = 0 if failed_cell is None else 1
+    except BaseException:
+        import traceback
+
+        traceback.print_exc()
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        # Skip the parent's atexit handlers and buffered output.
+        os._exit(status)
+
+
+def _kill(pid):
+    try:
+        os.killpg(pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+def run(notebooks, workers, timeout, preload, out):
+    shell, warmup, loaded = _warm_up(list(preload) + _notebook_imports(notebooks))
+    pending = list(enumerate(notebooks))
+    running = {}
+    timed_out = set()
+    startups = []
+
+    with tempfile.TemporaryDirectory(prefix="warm-kernels-") as tmp:
+        while pending or running:
+            while pending and len(running) < workers:
+                index, notebook = pending.pop(0)
+                log_path = os.path.join(tmp, f"{index}.log")
+                result_path = os.path.join(tmp, f"{index}.json")
+                sys.stdout.flush()
+                sys.stderr.flush()
+                forked_at = time.perf_counter()
+                pid = os.fork()
+                if pid == 0:
+                    _execute(shell, notebook, log_path, result_path, forked_at)
+                try:
+                    os.setpgid(pid, pid)
+                except OSError:
+                    pass  # The child already did it (or has exited).
+                running[pid] = (notebook, forked_at, log_path, result_path)
+
+            pid, status, usage = os.wait4(-1, os.WNOHANG)
+            if pid == 0:
+                now = time.perf_counter()
+                for child, (_, forked_at, _, _) in running.items():
+                    if child not in timed_out and now - forked_at > timeout:
+                        timed_out.add(child)
+                        _kill(child)
+                time.sleep(POLL_SECONDS)
+                continue
+            if pid not in running:
+                continue
+            notebook, forked_at, log_path, result_path = running.pop(pid)
+            # Reap anything the notebook left running in its process group.
+            _kill(pid)
+            seconds = time.perf_counter() - forked_at
+            try:
+                with open(result_path) as f:
+                    startup = json.load(f)["startup_seconds"]
+                startups.append(startup)
+            except (OSError, ValueError, KeyError):
+                startup = None
+            if pid in timed_out:
+                result = "timeout"
+            else:
+                result = "passed" if os.waitstatus_to_exitcode(status) == 0 else "failed"
+            output = ""
+            if result != "passed":
+                with open(log_path, errors="replace") as f:
+                    output = f.read()
+            out.write(json.dumps({
+                "notebook": notebook,
+                "result": result,
+                "seconds": round(seconds, 3),
+                # ru_maxrss is in KiB on Linux
+                "peak_rss_mb": round(usage.ru_maxrss / 1024, 1),
+                "startup_seconds": None if startup is None else round(startup, 4),
+                "output": output,
+            }) + "\n")
+            out.flush()
+
+    out.write(json.dumps({"summary": {
+        "warmup_seconds": round(warmup, 3),
+        "fork_startup_seconds": round(sum(startups), 3),
+        "preloaded": loaded,
+    }}) + "\n")
+    out.flush()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("notebooks", nargs="+")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--timeout", type=float, default=600)
+    parser.add_argument("--preload", action="append", default=[],
+                        help="module to import before forking; may be repeated")
+    args = parser.parse_args(argv)
+
+    # Results go to the original stdout; anything printed while importing goes to stderr.
+    out = os.fdopen(os.dup(1), "w")
+    os.dup2(2, 1)
+    run(args.notebooks, max(1, args.workers), args.timeout, args.preload, out)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
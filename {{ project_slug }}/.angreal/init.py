@@ -1,5 +1,62 @@
 import subprocess
 import os
+import shutil
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Directory of pre-built wheels for every dependency (including setuptools and
+# wheel for the editable build). When set and uv is on PATH, init installs from
+# it without touching the network.
+WHEELHOUSE_ENV = "WHEELHOUSE"
+
+
+def _timed(phases, name, func, *args, **kwargs):
+    start = time.perf_counter()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        phases.append((name, time.perf_counter() - start))
+
+
+def _setup_git(project_dir):
+    subprocess.run(["git", "config", "--global", "init.defaultBranch", "main"], cwd=project_dir, check=True)
+    subprocess.run(["git", "init", "."], cwd=project_dir, check=True)
+    subprocess.run(["git", "add", "."], cwd=project_dir, check=True)
+
+
+def _bootstrap(project_dir, uv, wheelhouse, phases):
+    """Create the venv and install everything from the wheelhouse with uv, offline.
+
+    Git setup runs alongside venv creation and the install, which uv itself
+    parallelizes. Hook environments come from $PRE_COMMIT_HOME when it was
+    populated beforehand (``pre-commit install-hooks`` on a connected machine).
+    """
+    import angreal
+
+    sys.path.insert(0, angreal.get_root())
+    from _install import uv_install
+
+    venv_path = os.path.join(project_dir, ".venv")
+    python = os.path.join(venv_path, "bin", "python")
+
+    def install():
+        _timed(phases, "create venv (uv)", subprocess.run, [uv, "venv", venv_path], cwd=project_dir, check=True)
+        returncode = _timed(
+            phases, "install from wheelhouse (uv)", uv_install, uv, python, ["-e", ".[dev]"], project_dir,
+            extra_args=("--no-index", "--find-links", wheelhouse),
+        )
+        if returncode != 0:
+            raise RuntimeError(f"Could not install from {wheelhouse}; is every dependency in it?")
+
+    print(f"Bootstrapping offline from {wheelhouse} with {uv}...")
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        git = pool.submit(_timed, phases, "git setup", _setup_git, project_dir)
+        venv = pool.submit(install)
+        git.result()
+        venv.result()
+    return python
+
 
 def init():
     import angreal
@@ -7,33 +64,59 @@ def init():
 
     # Get the project directory (one level up from .angreal)
     project_dir = os.path.dirname(angreal.get_root())
-    
+    phases = []
+    start = time.perf_counter()
+
     print("Initializing project...")
-    
-    # Set up git
-    subprocess.run(["git", "config", "--global", "init.defaultBranch", "main"], cwd=project_dir, check=True)
-    subprocess.run(["git", "init", "."], cwd=project_dir, check=True)
-    subprocess.run(["git", "add", "."], cwd=project_dir, check=True)
-    
-    # Create and activate virtual environment
-    print("Creating virtual environment...")
-    venv_path = os.path.join(project_dir, ".venv")
-    venv = VirtualEnv(venv_path)
-    venv.create()
-    venv.activate()
-    
-    # Install dependencies
-    print("Installing dependencies...")
-    venv.install(["-e", "..[dev]"])
-    venv.install(["pre-commit"])
-    
+
+    wheelhouse = os.environ.get(WHEELHOUSE_ENV)
+    uv = shutil.which("uv")
+    offline = bool(wheelhouse and uv and os.path.isdir(wheelhouse))
+    if offline:
+        python_executable = _bootstrap(project_dir, uv, os.path.abspath(wheelhouse), phases)
+    else:
+        if wheelhouse:
+            print(f"{WHEELHOUSE_ENV} is set but uv or the directory is missing; installing with pip.")
+        # Set up git
+        _timed(phases, "git setup", _setup_git, project_dir)
+
+        # Create and activate virtual environment
+        print("Creating virtual environment...")
+        venv_path = os.path.join(project_dir, ".venv")
+        venv = VirtualEnv(venv_path)
+        _timed(phases, "create venv", venv.create)
+        venv.activate()
+
+        # Install dependencies
+        print("Installing dependencies...")
+        _timed(phases, "install (pip)", venv.install, ["-e", "..[dev]"])
+        _timed(phases, "install pre-commit (pip)", venv.install, ["pre-commit"])
+        python_executable = venv.python_executable
+
     # Set up pre-commit
     print("Setting up pre-commit...")
-    subprocess.run([venv.python_executable, "-m", "pre_commit", "install"], cwd=project_dir, check=False) 
-    subprocess.run([venv.python_executable, "-m", "pre_commit", "run", "--all-files"], cwd=project_dir, check=False)#first run actually cleans up
-    
+    _timed(phases, "pre-commit install", subprocess.run,
+           [python_executable, "-m", "pre_commit", "install"], cwd=project_dir, check=False)
+    hooks_ready = True
+    if offline:
+        # Offline, hook environments can only come from a pre-populated $PRE_COMMIT_HOME.
+        result = _timed(phases, "pre-commit hook envs", subprocess.run,
+                        [python_executable, "-m", "pre_commit", "install-hooks"], cwd=project_dir, check=False)
+        hooks_ready = result.returncode == 0
+        if not hooks_ready:
+            print("Hook environments are not in the pre-commit cache (set PRE_COMMIT_HOME); "
+                  "skipping hooks for the initial commit.")
+    if hooks_ready:
+        _timed(phases, "pre-commit run", subprocess.run,
+               [python_executable, "-m", "pre_commit", "run", "--all-files"], cwd=project_dir, check=False)#first run actually cleans up
+
     # Commit changes
     print("Creating initial commit...")
-    subprocess.run(["git", "commit", "-am", "{{ project_slug }} initialized via angreal"], cwd=project_dir, check=True)
+    commit = ["git", "commit", "-am", "{{ project_slug }} initialized via angreal"]
+    subprocess.run(commit if hooks_ready else [*commit, "--no-verify"], cwd=project_dir, check=True)
 
-    print("Initialization complete.")
\ No newline at end of file
+    print("\nPhase timings:")
+    for name, seconds in phases:
+        print(f"  {name:<30} {seconds:>7.2f}s")
+    print(f"  {'total':<30} {time.perf_counter() - start:>7.2f}s")
+    print("Initialization complete.")
@@ -0,0 +1,55 @@
+import angreal
+
+import os
+import sys
+import time
+
+sys.path.insert(0, angreal.get_root())
+from _catalog import Catalog
+
+cwd = os.path.join(angreal.get_root(), '..')
+
+
+def _print_notebooks(rows, columns):
+    if not rows:
+        print("No matching notebooks.")
+        return
+    for row in rows:
+        print("  ".join(str(row[column] if row[column] is not None else "-") for column in columns))
+
+
+@angreal.command(name="catalog", about="search the notebook catalog")
+@angreal.argument(name="title", long="title", short='t',
+                 takes_value=True, help="Notebooks whose title contains this text")
+@angreal.argument(name="author", long="author", short='a',
+                 takes_value=True, help="Notebooks whose author contains this text")
+@angreal.argument(name="imports", long="imports", short='i',
+                 takes_value=True, help="Notebooks importing this module (e.g. pandas)")
+@angreal.argument(name="epoch", long="epoch", short='e',
+                 takes_value=True, help='Notebooks in this epoch (e.g., "001")')
+@angreal.argument(name="slowest", long="slowest",
+                 takes_value=True, help="Show the N notebooks with the slowest last test run")
+@angreal.argument(name="recent", long="recent",
+                 takes_value=True, help="Show the N most recently executed notebooks")
+def catalog(title=None, author=None, imports=None, epoch=None, slowest=None, recent=None):
+    """Refresh the notebook catalog and query it.
+
+    Only notebooks changed since the last refresh are re-parsed. With no
+    options, prints the latest epoch and every notebook.
+    """
+    start = time.perf_counter()
+    with Catalog(cwd) as index:
+        parsed = index.refresh()
+        if slowest:
+            rows = index.slowest(int(slowest))
+            _print_notebooks(rows, ["test_seconds", "peak_rss_mb", "test_result", "path"])
+        elif recent:
+            rows = index.recently_executed(int(recent))
+            _print_notebooks(rows, ["last_executed", "path"])
+        else:
+            if not any((title, author, imports, epoch)):
+                print(f"Latest epoch: {index.latest_epoch():03d}")
+            rows = index.notebooks(epoch=epoch, title=title, author=author, imports=imports)
+            _print_notebooks(rows, ["path", "title", "author"])
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"\n{len(rows)} notebooks ({parsed} re-indexed) in {elapsed:.0f} ms")
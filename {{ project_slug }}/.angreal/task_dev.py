@@ -1,8 +1,18 @@
 import angreal
 from angreal.integrations.venv import VirtualEnv
 
+import hashlib
 import os
+import re
+import shutil
 import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, angreal.get_root())
+from _install import ensure_installed
 
 dev = angreal.command_group(name="dev", about="commands for development tasks")
 
@@ -46,29 +56,149 @@ def clean():
     )
 
 
+# Top-level files that end up in (or shape) the sdist and wheel, besides src/.
+BUILD_INPUTS = ("pyproject.toml", "setup.py", "setup.cfg", "MANIFEST.in", "README.md", "LICENCE", "LICENSE",
+                "CHANGELOG.md")
+# Builds kept in the cache, most recently used first.
+DIST_CACHE = os.path.join(".cache", "dist")
+DIST_CACHE_KEEP = 5
+
+
+def _build_fingerprint(project_root):
+    """Hash of every file that can change the built artifacts."""
+    root = Path(project_root)
+    paths = [root / name for name in BUILD_INPUTS if (root / name).is_file()]
+    paths += sorted(
+        path for path in (root / "src").rglob("*")
+        if path.is_file() and "__pycache__" not in path.parts and not any(
+            part.endswith(".egg-info") for part in path.parts)
+    )
+    hasher = hashlib.sha256()
+    for path in paths:
+        hasher.update(str(path.relative_to(root)).encode())
+        hasher.update(b"\0")
+        hasher.update(path.read_bytes())
+    return hasher.hexdigest()
+
+
+def _build_requires(project_root):
+    """``[build-system] requires`` from pyproject.toml, or None if it cannot be read."""
+    try:
+        with open(os.path.join(project_root, "pyproject.toml")) as f:
+            text = f.read()
+    except OSError:
+        return None
+    try:
+        import tomllib
+        return tomllib.loads(text).get("build-system", {}).get("requires")
+    except ImportError:
+        # Python < 3.11: the array is a simple list of quoted strings.
+        match = re.search(r"^\[build-system\].*?^requires\s*=\s*\[(.*?)\]", text, re.S | re.M)
+        return re.findall(r"[\"']([^\"']+)[\"']", match.group(1)) if match else None
+    except ValueError:
+        return None
+
+
+def _link_or_copy(source, target):
+    if os.path.exists(target):
+        os.unlink(target)
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copy2(source, target)
+
+
+def _prune_dist_cache(cache_root, keep):
+    # Dot-prefixed entries are builds in progress.
+    entries = [entry for entry in Path(cache_root).iterdir() if not entry.name.startswith(".")]
+    entries.sort(key=lambda p: p.stat().st_mtime, reverse=True)
+    for entry in entries[keep:]:
+        shutil.rmtree(entry, ignore_errors=True)
+
+
 @dev()
 @angreal.command(name="dist", about="build your project for distribution")
-def dist():
+@angreal.argument(name="force", long="force", short='f',
+                  takes_value=False,
+                  help="Rebuild even if an identical build is cached")
+@angreal.argument(name="isolated", long="isolated",
+                  takes_value=False,
+                  help="Always build in a fresh isolated environment")
+def dist(force=False, isolated=False):
+    """Build the sdist and wheel into dist/, reusing cached identical builds.
+
+    Builds are cached in .cache/dist/ under a hash of src/ and the top-level
+    build files (pyproject.toml, README.md, licence, ...); if nothing changed,
+    the cached artifacts are linked into dist/ without running the build.
+    Otherwise the build-system requirements are installed into the venv and
+    the build runs with --no-isolation, skipping the throwaway environment;
+    it falls back to an isolated build when the requirements cannot be read.
+    """
     one_up = os.path.join(angreal.get_root(), "..")
     venv_path = os.path.join(one_up, '.venv')
+    out_dir = os.path.join(one_up, "dist")
+    cache_root = os.path.join(one_up, DIST_CACHE)
+    phases = []
+
+    def phase(name, start):
+        phases.append((name, time.perf_counter() - start))
+
+    start = time.perf_counter()
+    fingerprint = _build_fingerprint(one_up)
+    cache_dir = os.path.join(cache_root, fingerprint[:16])
+    phase("fingerprint", start)
+
+    cached = os.path.isdir(cache_dir) and os.listdir(cache_dir)
+    if cached and not force:
+        start = time.perf_counter()
+        os.makedirs(out_dir, exist_ok=True)
+        for name in sorted(os.listdir(cache_dir)):
+            _link_or_copy(os.path.join(cache_dir, name), os.path.join(out_dir, name))
+            print(f"  {name}")
+        os.utime(cache_dir)
+        phase("reuse cached build", start)
+        print(f"Sources unchanged since a previous build ({fingerprint[:12]}); reused it.")
+        returncode = 0
+    else:
+        with VirtualEnv(path=venv_path, now=True) as venv:
+            # NOTE: Using direct subprocess calls instead of venv.install() due to
+            # apparent bug in current Angreal VirtualEnv interface causing
+            # "os.dirname not found" errors
+            python_path = venv.path / "bin" / "python"
+
+            # Install build dependencies (skipped when already installed)
+            start = time.perf_counter()
+            requires = None if isolated else _build_requires(one_up)
+            ensure_installed(venv, ["build", *(requires or ["setuptools>=64", "wheel"])], one_up)
+            phase("install build tools", start)
+
+            # The venv now satisfies the build requirements, so the isolated
+            # environment python -m build would create is redundant.
+            start = time.perf_counter()
+            os.makedirs(cache_root, exist_ok=True)
+            build_dir = tempfile.mkdtemp(prefix=".build-", dir=cache_root)
+            try:
+                cmd = [str(python_path), "-m", "build", "--sdist", "--wheel", "--outdir", build_dir]
+                if requires is not None:
+                    cmd.append("--no-isolation")
+                returncode = subprocess.run(cmd, cwd=one_up).returncode
+                phase("build" + (" (no isolation)" if requires is not None else " (isolated)"), start)
+
+                if returncode == 0:
+                    start = time.perf_counter()
+                    shutil.rmtree(cache_dir, ignore_errors=True)
+                    os.makedirs(cache_dir)
+                    os.makedirs(out_dir, exist_ok=True)
+                    for name in sorted(os.listdir(build_dir)):
+                        os.replace(os.path.join(build_dir, name), os.path.join(cache_dir, name))
+                        _link_or_copy(os.path.join(cache_dir, name), os.path.join(out_dir, name))
+                    _prune_dist_cache(cache_root, DIST_CACHE_KEEP)
+                    phase("store in cache", start)
+            finally:
+                shutil.rmtree(build_dir, ignore_errors=True)
 
-    with VirtualEnv(path=venv_path, now=True) as venv:
-        # NOTE: Using direct subprocess calls instead of venv.install() due to
-        # apparent bug in current Angreal VirtualEnv interface causing 
-        # "os.dirname not found" errors
-        python_path = venv.path / "bin" / "python"
-        pip_path = venv.path / "bin" / "pip"
-        
-        # Install build dependencies
-        subprocess.run(
-            f"{pip_path} install build setuptools>=64 wheel", 
-            shell=True, 
-            cwd=one_up
-        )
-        
-        # Build the project
-        subprocess.run(
-            f"{python_path} -m build --sdist --wheel --outdir dist/", 
-            shell=True, 
-            cwd=one_up
-        )
+    print("\nPhase timings:")
+    for name, seconds in phases:
+        print(f"  {name:<28} {seconds:>7.2f}s")
+    print(f"  {'total':<28} {sum(seconds for _, seconds in phases):>7.2f}s")
+    return returncode
@@ -3,27 +3,110 @@ from angreal.integrations.venv import VirtualEnv
 
 import os
 import subprocess
+import time
 
 cwd = os.path.join(angreal.get_root(),'..')
 
+# Refs tried, in order, as the base of --fast when --base is not given.
+BASE_CANDIDATES = ("@{upstream}", "origin/main", "origin/master", "main", "master")
+
+
+def _git(*args):
+    result = subprocess.run(["git", *args], cwd=cwd, capture_output=True, text=True)
+    return result.stdout.strip() if result.returncode == 0 else None
+
+
+def _merge_base(base):
+    """Commit where this branch left ``base`` (or the first candidate ref that exists)."""
+    for ref in [base] if base else BASE_CANDIDATES:
+        commit = _git("merge-base", "HEAD", ref)
+        if commit:
+            return ref, commit
+    return None, None
+
+
+def _changed_python_files(commit):
+    """Python files changed since ``commit``, committed or not, plus untracked ones."""
+    changed = (_git("diff", "--name-only", "--diff-filter=ACMR", commit) or "").splitlines()
+    untracked = (_git("ls-files", "--others", "--exclude-standard") or "").splitlines()
+    return sorted(
+        path for path in set(changed + untracked)
+        if path.endswith((".py", ".pyi")) and os.path.isfile(os.path.join(cwd, path))
+    )
+
+
+def _run_steps(name, commands):
+    """Run commands one after another, stopping at the first failure; output is captured."""
+    start = time.perf_counter()
+    output = []
+    returncode = 0
+    for command in commands:
+        result = subprocess.run(command, cwd=cwd, capture_output=True, text=True)
+        output.append(f"$ {' '.join(command)}\n{result.stdout}{result.stderr}")
+        returncode = result.returncode
+        if returncode != 0:
+            break
+    return name, returncode, time.perf_counter() - start, "".join(output)
+
+
 @angreal.command(name="lint", about="run linting, formatting, and type checking")
-def lint():
-    """Run Ruff for linting and formatting, then mypy for type checking."""
+@angreal.argument(name="fast", long="fast", short='f',
+                  takes_value=False,
+                  help="Only ruff files changed against the base ref and type check with the mypy daemon")
+@angreal.argument(name="base", long="base",
+                  takes_value=True,
+                  help="Git ref to compare against with --fast (default: upstream branch, then main/master)")
+def lint(fast=False, base=None):
+    """Run Ruff for linting and formatting, then mypy for type checking.
+
+    mypy starts only after Ruff has finished rewriting files, so it never
+    reads a half-written file. With ``fast``, Ruff only sees Python files
+    changed since the merge base with ``base`` (including uncommitted and
+    untracked files), and mypy runs through ``dmypy``, which stays running
+    between calls and only re-checks modules affected by a change. Stop it
+    with ``dmypy stop``.
+    """
     venv_path = os.path.join(cwd, '.venv')
-    
+
     with VirtualEnv(path=venv_path, now=True) as venv:
-        print("Running Ruff linter with auto-fix...")
-        result1 = subprocess.run('ruff check --fix .', shell=True, cwd=cwd)
-        
-        print("Running Ruff formatter...")
-        result2 = subprocess.run('ruff format .', shell=True, cwd=cwd)
-        
-        print("Running mypy type checker...")
-        result3 = subprocess.run('mypy src/{{ package_name }}', shell=True, cwd=cwd)
-        
+        steps = {}
+        if fast:
+            ref, commit = _merge_base(base)
+            if commit is None:
+                print(f"Could not find a base ref ({base or ', '.join(BASE_CANDIDATES)}); linting everything.")
+                files = ["."]
+            else:
+                files = _changed_python_files(commit)
+                print(f"{len(files)} Python files changed since {ref} ({commit[:12]}).")
+            if files:
+                steps["ruff"] = [
+                    ["ruff", "check", "--fix", "--force-exclude", *files],
+                    ["ruff", "format", "--force-exclude", *files],
+                ]
+            steps["mypy"] = [["dmypy", "run", "--", "src/{{ package_name }}"]]
+        else:
+            steps["ruff"] = [["ruff", "check", "--fix", "."], ["ruff", "format", "."]]
+            steps["mypy"] = [["mypy", "src/{{ package_name }}"]]
+
+        print(f"Running {' then '.join(steps)}...")
+        start = time.perf_counter()
+        # In order: ruff check --fix and ruff format edit the files mypy reads.
+        results = [_run_steps(name, commands) for name, commands in steps.items()]
+        elapsed = time.perf_counter() - start
+
+        for name, returncode, seconds, output in results:
+            print(f"\n=== {name} ===")
+            print(output.rstrip())
+
+        print("\nSummary:")
+        for name, returncode, seconds, _ in results:
+            status = "passed" if returncode == 0 else f"failed ({returncode})"
+            print(f"  {name:<6} {status:<12} {seconds:>6.1f}s")
+        print(f"  total  {elapsed:.1f}s wall")
+
         # Return non-zero exit code if any command failed
-        if result1.returncode != 0 or result2.returncode != 0 or result3.returncode != 0:
+        if any(returncode != 0 for _, returncode, _, _ in results):
             return 1
-        
+
         print("All linting, formatting, and type checking completed successfully!")
-        return 0
\ No newline at end of file
+        return 0
@@ -5,15 +5,74 @@ import json
 from datetime import datetime
 from pathlib import Path
 import shutil
+import subprocess
+import sys
+
+sys.path.insert(0, angreal.get_root())
+from _catalog import Catalog
 
 new = angreal.command_group(name='new', about='Create new project components')
 
+
+def _commit_hash(project_root):
+    """HEAD's commit, marked dirty if tracked files have local changes."""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=project_root,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=project_root,
+                               capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "(not a git repository)"
+    return f"{commit} (with uncommitted changes)" if dirty else commit
+
+
+def _link_file():
+    """link_file from the project's artifacts module, imported from src/ (angreal runs outside the venv)."""
+    src = os.path.join(os.path.dirname(angreal.get_root()), "src")
+    if src not in sys.path:
+        sys.path.insert(0, src)
+    from {{ package_name }}.utils.artifacts import link_file
+    return link_file
+
+
+def _carry_artifacts(previous_dir, new_dir):
+    """Link a previous epoch's artifacts and manifest into a new epoch.
+
+    Files are linked with {{ package_name }}.utils.artifacts.link_file, the
+    same way the store links them: a reflink or hardlink to the shared copy,
+    so nothing is copied unless the filesystem allows neither.
+    """
+    manifest_path = os.path.join(previous_dir, "artifacts.json")
+    if not os.path.exists(manifest_path):
+        return 0
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+    link_file = _link_file()
+    carried = {}
+    for name, record in manifest.items():
+        source = os.path.join(previous_dir, "artifacts", name)
+        if not os.path.isfile(source):
+            continue
+        link_file(source, os.path.join(new_dir, "artifacts", name))
+        carried[name] = record
+    with open(os.path.join(new_dir, "artifacts.json"), "w") as f:
+        json.dump(carried, f, indent=2, sort_keys=True)
+    return len(carried)
+
+
 @new()
 @angreal.command(name='epoch', about='Start a new epoch of exploration')
 @angreal.argument(name='description', long='description', short='d',
                  help='Short description of the epoch', required=False)
-def new_epoch(description=""):
-    """Create a new epoch directory with incrementing number."""
+@angreal.argument(name='carry_artifacts', long='carry-artifacts', takes_value=False,
+                 help="Link the previous epoch's data artifacts into the new epoch")
+def new_epoch(description="", carry_artifacts=False):
+    """Create a new epoch directory with incrementing number.
+
+    The README records the current commit. With ``carry_artifacts``, the
+    previous epoch's artifacts (see {{ package_name }}.utils.artifacts) are
+    linked in rather than recomputed or copied.
+    """
 
     # Get the notebooks directory
     # angreal.get_root() returns the .angreal directory, so we go up one level for project root
@@ -24,17 +83,10 @@ def new_epoch(description=""):
     # Create notebooks directory if it doesn't exist
     os.makedirs(notebooks_dir, exist_ok=True)
     
-    # Find the highest epoch number
-    epoch_pattern = re.compile(r"epoch_(\d+)")
-    highest_epoch = 0
-    
-    if os.path.exists(notebooks_dir):
-        for item in os.listdir(notebooks_dir):
-            if os.path.isdir(os.path.join(notebooks_dir, item)):
-                match = epoch_pattern.match(os.path.basename(item))
-                if match:
-                    epoch_num = int(match.group(1))
-                    highest_epoch = max(highest_epoch, epoch_num)
+    # Find the highest epoch number from the catalog
+    with Catalog(project_root) as catalog:
+        catalog.refresh()
+        highest_epoch = catalog.latest_epoch()
     
     # Create the new epoch directory
     new_epoch_num = highest_epoch + 1
@@ -48,7 +100,8 @@ def new_epoch(description=""):
     # Create context for template rendering
     context = {
         "epoch_number": f"{new_epoch_num:03d}",
-        "epoch_description": description or f"Epoch {new_epoch_num:03d} exploration"
+        "epoch_description": description or f"Epoch {new_epoch_num:03d} exploration",
+        "commit_hash": _commit_hash(project_root),
     }
     
     # Check if template exists
@@ -65,6 +118,14 @@ def new_epoch(description=""):
     with open(os.path.join(new_epoch_dir, "README.md"), 'w') as f:
         f.write(rendered_content)
     
+    if carry_artifacts and highest_epoch > 0:
+        previous_dir = os.path.join(notebooks_dir, f"epoch_{highest_epoch:03d}")
+        carried = _carry_artifacts(previous_dir, new_epoch_dir)
+        print(f"Linked {carried} artifacts from epoch_{highest_epoch:03d}")
+
+    with Catalog(project_root) as catalog:
+        catalog.refresh()
+
     print(f"Created new epoch directory: {new_epoch_dir}")
     print(f"Current working epoch is now: epoch_{new_epoch_num:03d}")
 
@@ -92,17 +153,9 @@ def new_notebook(title, author=None, epoch=None):
     
     # Find the current epoch if not specified
     if epoch is None:
-        epoch_pattern = re.compile(r"epoch_(\d+)")
-        highest_epoch = 0
-        
-        for item in os.listdir(notebooks_dir):
-            if os.path.isdir(os.path.join(notebooks_dir, item)):
-                match = epoch_pattern.match(item)
-                if match:
-                    epoch_num = int(match.group(1))
-                    highest_epoch = max(highest_epoch, epoch_num)
-        
-        epoch = f"{highest_epoch:03d}"
+        with Catalog(project_root) as catalog:
+            catalog.refresh()
+            epoch = f"{catalog.latest_epoch():03d}"
     
     # Ensure epoch directory exists
     epoch_dir = os.path.join(notebooks_dir, f"epoch_{epoch}")
@@ -161,6 +214,9 @@ def new_notebook(title, author=None, epoch=None):
         with open(notebook_path, 'w') as f:
             f.write(rendered_content)
         
+        with Catalog(project_root) as catalog:
+            catalog.refresh()
+
         print(f"Created new notebook: {notebook_path}")
         
     except Exception as e:
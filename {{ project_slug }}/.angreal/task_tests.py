@@ -1,11 +1,35 @@
 import angreal
 from angreal.integrations.venv import VirtualEnv
 
+import hashlib
+import json
 import os
 import subprocess
+import tempfile
+import time
+import sys
 import webbrowser
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+sys.path.insert(0, angreal.get_root())
+from _install import ensure_installed
 
 cwd = os.path.join(angreal.get_root(),'..')
+
+# Defaults for `angreal test notebook`; both can be overridden on the command line.
+NOTEBOOK_TIMEOUT = 600
+NOTEBOOK_REPORT = "notebook_report.json"
+# Fingerprints and results of previous notebook runs, relative to the project root.
+NOTEBOOK_CACHE = os.path.join(".cache", "notebook_tests.json")
+# Seconds between memory samples of a running notebook (needs psutil).
+RSS_SAMPLE_SECONDS = 0.5
+
 test = angreal.command_group(name="test", about="commands for testing the application and library")
 
 
@@ -19,8 +43,7 @@ def unit_tests(open=False):
     
     with VirtualEnv(path=venv_path, now=True) as venv:
         # Install test dependencies
-        print("Installing test dependencies...")
-        venv.install(["pytest", "pytest-cov"])
+        ensure_installed(venv, ["pytest", "pytest-cov"], cwd)
         
         # Run unit tests using venv's python
         print("Running unit tests...")
@@ -44,8 +67,7 @@ def integration_tests(open=False):
     
     with VirtualEnv(path=venv_path, now=True) as venv:
         # Install test dependencies
-        print("Installing test dependencies...")
-        venv.install(["pytest", "pytest-cov"])
+        ensure_installed(venv, ["pytest", "pytest-cov"], cwd)
         
         # Run integration tests using venv's python
         print("Running integration tests...")
@@ -58,41 +80,356 @@ def integration_tests(open=False):
         if open:
             webbrowser.open_new('file://{}'.format(output_file))
 
+def _find_notebooks(root):
+    """Every notebook under root, skipping Jupyter checkpoint copies."""
+    return sorted(
+        path for path in Path(root).rglob("*.ipynb")
+        if ".ipynb_checkpoints" not in path.parts
+    )
+
+
+def _nbval_command(python, notebook):
+    return [python, '-m', 'pytest', '--nbval-lax', '-q', '-p', 'no:cacheprovider', str(notebook)]
+
+
+def _tree_rss(process):
+    """Summed RSS in bytes of a psutil process and its live descendants (the kernel)."""
+    try:
+        processes = [process] + process.children(recursive=True)
+    except psutil.Error:
+        return 0
+    total = 0
+    for member in processes:
+        try:
+            total += member.memory_info().rss
+        except psutil.Error:
+            pass
+    return total
+
+
+def _kill(proc, process):
+    """Kill the pytest run and, with psutil, the kernel and anything else it started.
+
+    jupyter_client starts the kernel in its own session, so it is outside
+    pytest's process group; psutil finds it as a child of pytest instead.
+    Without psutil only pytest is killed and the kernel exits on its own once
+    it notices its parent is gone.
+    """
+    children = []
+    if process is not None:
+        try:
+            # Stopped first so it cannot start another process while its children are collected.
+            process.suspend()
+            children = process.children(recursive=True)
+        except psutil.Error:
+            pass
+    proc.kill()
+    for child in children:
+        try:
+            child.kill()
+        except psutil.Error:
+            pass
+
+
+def _run_notebook(python, notebook, timeout):
+    """Execute one notebook under nbval in its own process.
+
+    With psutil installed, the memory of pytest and the kernel it started is
+    sampled every RSS_SAMPLE_SECONDS and the largest total is reported as
+    peak_rss_mb (None without psutil). Short spikes between samples are missed.
+    """
+    start = time.perf_counter()
+    deadline = start + timeout
+    proc = subprocess.Popen(
+        _nbval_command(python, notebook), cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+    )
+    process = None
+    if psutil is not None:
+        try:
+            process = psutil.Process(proc.pid)
+        except psutil.Error:
+            pass
+    peak = 0
+    timed_out = False
+    while True:
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            timed_out = True
+            _kill(proc, process)
+            try:
+                output, _ = proc.communicate(timeout=5)
+            except subprocess.TimeoutExpired:
+                # Something that outlived the kill still holds the output pipe open.
+                output = b""
+                proc.wait()
+            break
+        try:
+            output, _ = proc.communicate(
+                timeout=remaining if process is None else min(remaining, RSS_SAMPLE_SECONDS)
+            )
+            break
+        except subprocess.TimeoutExpired:
+            if process is not None:
+                peak = max(peak, _tree_rss(process))
+
+    if timed_out:
+        result = "timeout"
+    else:
+        result = "passed" if proc.returncode == 0 else "failed"
+    return {
+        "notebook": os.path.relpath(notebook, cwd),
+        "result": result,
+        "seconds": round(time.perf_counter() - start, 3),
+        "peak_rss_mb": round(peak / 2**20, 1) if process is not None else None,
+        "output": output.decode(errors="replace") if result != "passed" else "",
+    }
+
+
+def _package_fingerprint(python):
+    """Hash of everything outside a notebook that can change its behaviour.
+
+    Covers the package source, pyproject.toml (dependencies) and the
+    interpreter the notebooks run under.
+    """
+    hasher = hashlib.sha256(python.encode())
+    root = Path(cwd)
+    for path in sorted(root.joinpath("src").rglob("*.py")) + [root / "pyproject.toml"]:
+        if path.is_file():
+            hasher.update(str(path.relative_to(root)).encode())
+            hasher.update(path.read_bytes())
+    return hasher.hexdigest()
+
+
+def _notebook_fingerprint(notebook, package):
+    """Hash of a notebook's code cells combined with the package fingerprint.
+
+    Outputs, metadata and markdown are ignored, so re-saving or documenting a
+    notebook does not trigger a re-run. Returns None if it cannot be parsed.
+    """
+    try:
+        with open(notebook) as f:
+            cells = json.load(f).get("cells", [])
+    except (OSError, ValueError):
+        return None
+    hasher = hashlib.sha256(package.encode())
+    for cell in cells:
+        if cell.get("cell_type") == "code":
+            source = cell.get("source", "")
+            hasher.update(("".join(source) if isinstance(source, list) else source).encode())
+            hasher.update(b"\0")
+    return hasher.hexdigest()
+
+
+def _load_notebook_cache(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_notebook_cache(path, cache):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    with os.fdopen(fd, "w") as f:
+        json.dump(cache, f, indent=2)
+    os.replace(tmp, path)
+
+
+def _print_result(entry):
+    status = "cached" if entry.get("cached") else entry["result"]
+    rss = entry.get("peak_rss_mb")
+    rss = f"{rss:>8.1f}" if rss is not None else f"{'-':>8}"
+    print(f"  {status:<8} {entry['seconds']:>8.1f}s {rss} MB  {entry['notebook']}")
+
+
+def _run_warm(python, notebooks, workers, timeout, on_result):
+    """Run notebooks in forks of one pre-warmed IPython process.
+
+    See _warm_kernels.py. Each finished notebook is passed to ``on_result``
+    as it completes. Returns the runner's summary, with an estimate (not a
+    measurement) of the kernel startup time saved compared to a cold start
+    per notebook.
+    """
+    cmd = [python, os.path.join(angreal.get_root(), "_warm_kernels.py"),
+           "--workers", str(workers), "--timeout", str(timeout),
+           "--preload", "{{ package_name }}", "--preload", "{{ package_name }}.utils.notebook"]
+    proc = subprocess.Popen(cmd + [str(nb) for nb in notebooks], cwd=cwd, stdout=subprocess.PIPE, text=True)
+    summary = None
+    reported = set()
+    for line in proc.stdout:
+        data = json.loads(line)
+        if "summary" in data:
+            summary = data["summary"]
+            continue
+        data["notebook"] = os.path.relpath(data["notebook"], cwd)
+        reported.add(data["notebook"])
+        on_result(data)
+    proc.wait()
+
+    # If the warm-up itself failed, nothing ran; report every notebook as failed.
+    for notebook in notebooks:
+        name = os.path.relpath(notebook, cwd)
+        if name not in reported:
+            on_result({
+                "notebook": name, "result": "failed", "seconds": 0.0, "peak_rss_mb": 0.0,
+                "output": f"warm kernel runner exited with code {proc.returncode} before running it",
+            })
+    if summary is None:
+        return None
+    # No cold kernels are started, so this assumes every cold run would pay the warm-up again
+    # (a lower bound: a real kernel also starts an interpreter and its channels). The warm
+    # runs paid it once plus a fork each.
+    cold = summary["warmup_seconds"] * len(reported)
+    warm = summary["warmup_seconds"] + summary["fork_startup_seconds"]
+    summary["estimated_saved_seconds"] = round(max(0.0, cold - warm), 3)
+    summary["estimate_basis"] = "warmup_seconds x notebooks - (warmup_seconds + fork_startup_seconds)"
+    return summary
+
+
+def _run_notebooks(python, notebooks, workers, timeout, report, force=False, warm=False):
+    """Run changed notebooks concurrently and write a timing/memory report.
+
+    A notebook is skipped, and its previous result reused, when its code
+    cells and the package source are unchanged since its last run. Timed-out
+    runs are never cached. ``force`` re-executes the given notebooks; cached
+    results of other notebooks (e.g. other epochs) are kept. ``warm`` runs
+    notebooks in forks of a pre-warmed kernel instead of cold nbval runs.
+
+    Returns:
+        True if every notebook passed.
+    """
+    cache_path = os.path.join(cwd, NOTEBOOK_CACHE)
+    cache = _load_notebook_cache(cache_path)
+    package = _package_fingerprint(python)
+
+    results = []
+    to_run = []
+    fingerprints = {}
+    for notebook in notebooks:
+        name = os.path.relpath(notebook, cwd)
+        fingerprints[name] = _notebook_fingerprint(notebook, package)
+        previous = None if force else cache.get(name)
+        if previous and fingerprints[name] is not None and previous["fingerprint"] == fingerprints[name]:
+            entry = {key: value for key, value in previous.items() if key != "fingerprint"}
+            entry.update(notebook=name, cached=True)
+            results.append(entry)
+            _print_result(entry)
+        else:
+            to_run.append(notebook)
+
+    def record(entry):
+        results.append(entry)
+        _print_result(entry)
+        name = entry["notebook"]
+        if entry["result"] == "timeout" or fingerprints[name] is None:
+            cache.pop(name, None)
+        else:
+            cache[name] = dict(entry, fingerprint=fingerprints[name])
+
+    if results:
+        print(f"Skipped {len(results)} unchanged notebooks (use --force to re-run them).")
+    startup = None
+    if to_run:
+        workers = max(1, min(workers, len(to_run)))
+        mode = "warm kernel forks" if warm else "workers"
+        print(f"Running {len(to_run)} notebooks on {workers} {mode} ({timeout}s timeout each)...")
+        if warm:
+            startup = _run_warm(python, to_run, workers, timeout, record)
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(_run_notebook, python, nb, timeout) for nb in to_run]
+                for future in futures:
+                    record(future.result())
+        _save_notebook_cache(cache_path, cache)
+    if startup:
+        print(f"Kernel warm-up took {startup['warmup_seconds']:.1f}s once instead of per notebook: "
+              f"an estimated {startup['estimated_saved_seconds']:.1f}s of startup saved "
+              f"(warm-up x notebooks, not a measured cold run).")
+
+    # Slowest first, so the notebooks worth splitting or caching stand out.
+    results.sort(key=lambda entry: entry["seconds"], reverse=True)
+    report_path = os.path.join(cwd, report)
+    with open(report_path, "w") as f:
+        json.dump({
+            "workers": workers, "timeout": timeout, "mode": "warm" if warm else "cold",
+            "kernel_startup": startup, "notebooks": results,
+        }, f, indent=2)
+    print(f"Wrote notebook report to {report_path}")
+
+    failed = [entry for entry in results if entry["result"] != "passed"]
+    for entry in failed:
+        print(f"\n--- {entry['notebook']} ({entry['result']}) ---")
+        print(entry["output"].strip())
+    return not failed
+
+
 @test()
 @angreal.command(name="notebook", about="run notebook execution tests")
 @angreal.argument(name="epoch", long="epoch", short='e',
                  takes_value=True,
                  help='Specific epoch to test (e.g., "001")')
-def run_notebook_tests(epoch=None):
+@angreal.argument(name="workers", long="workers", short='j',
+                 takes_value=True,
+                 help="Number of notebooks to execute at once (default: CPU count)")
+@angreal.argument(name="timeout", long="timeout", short='t',
+                 takes_value=True,
+                 help=f"Seconds before a notebook is killed (default: {NOTEBOOK_TIMEOUT})")
+@angreal.argument(name="report", long="report",
+                 takes_value=True,
+                 help=f"Where to write the JSON timing report (default: {NOTEBOOK_REPORT})")
+@angreal.argument(name="force", long="force", short='f',
+                 takes_value=False,
+                 help="Re-execute notebooks even if they are unchanged since their last run")
+@angreal.argument(name="warm", long="warm", short='w',
+                 takes_value=False,
+                 help="Fork each notebook from a pre-warmed, pre-imported kernel instead of starting a cold one")
+def run_notebook_tests(epoch=None, workers=None, timeout=None, report=None, force=False, warm=False):
     """Run notebook execution tests.
     
     This only tests that notebooks execute without errors and does not
-    compare outputs (for security reasons).
+    compare outputs (for security reasons). Each notebook runs in its own
+    process, several at a time, and is killed if it exceeds the timeout
+    (its kernel too when psutil is installed).
+    Notebooks whose code cells and the package source are unchanged since
+    their last run are skipped unless ``force`` is set.
+
+    With ``warm``, one process imports IPython, the package and the
+    notebooks' imports once and forks a child per notebook, so each notebook
+    starts with a fresh namespace in its own memory but without paying
+    kernel startup. Needs os.fork; falls back to cold runs elsewhere.
     """
     venv_path = os.path.join(cwd, '.venv')
     
     with VirtualEnv(path=venv_path, now=True) as venv:
         # Install notebook test dependencies
-        print("Installing notebook test dependencies...")
-        venv.install(["pytest", "nbval"])
+        if warm and not hasattr(os, "fork"):
+            print("Warm kernels need os.fork; running cold notebooks instead.")
+            warm = False
+        ensure_installed(venv, ["ipython"] if warm else ["pytest", "nbval"], cwd)
         
         # Determine which notebooks to test
-        cmd = [venv.python_executable, '-m', 'pytest', '--nbval-lax']  # Only check execution, not outputs
-        
         if epoch:
             notebook_path = f"notebooks/epoch_{epoch}"
             if not os.path.exists(os.path.join(cwd, notebook_path)):
                 print(f"Error: Epoch {epoch} not found.")
                 return False
-            cmd.append(notebook_path)
         else:
-            cmd.append("notebooks")
-        
-        # Run the notebook tests
-        print(f"\nRunning notebook tests: {' '.join(cmd)}")
-        result = subprocess.run(cmd, cwd=cwd)
+            notebook_path = "notebooks"
+
+        notebooks = _find_notebooks(os.path.join(cwd, notebook_path))
+        if not notebooks:
+            print(f"No notebooks found in {notebook_path}.")
+            return True
+
+        workers = int(workers) if workers else (os.cpu_count() or 1)
+        timeout = int(timeout) if timeout else NOTEBOOK_TIMEOUT
+        passed = _run_notebooks(
+            str(venv.python_executable), notebooks, workers, timeout,
+            report or NOTEBOOK_REPORT, force=force, warm=warm,
+        )
         
-        if result.returncode != 0:
+        if not passed:
             print("\nSome notebooks failed execution.")
             print("This is expected for older notebooks that might use outdated APIs.")
             print("Consider updating them or marking them as legacy.")
@@ -112,8 +449,7 @@ def all_tests(open=False):
     
     with VirtualEnv(path=venv_path, now=True) as venv:
         # Install test dependencies
-        print("Installing test dependencies...")
-        venv.install(["pytest", "pytest-cov", "nbval"])
+        ensure_installed(venv, ["pytest", "pytest-cov", "nbval"], cwd)
         
         # Run unit and integration tests with coverage
         print("Running unit and integration tests...")
@@ -134,6 +470,37 @@ def all_tests(open=False):
     
     return success
 
+@test()
+@angreal.command(name="bench", about="run benchmarks and compare them with the stored baseline")
+@angreal.argument(name="threshold", long="threshold",
+                 takes_value=True,
+                 help="Fail when a benchmark is this fraction slower than the baseline (default: 0.20)")
+@angreal.argument(name="baseline", long="baseline",
+                 takes_value=True,
+                 help="Git ref to compare against (default: the latest passing run of another commit)")
+@angreal.argument(name="filter", long="filter", short='k',
+                 takes_value=True,
+                 help="Only run benchmarks whose id contains this text")
+def bench_tests(threshold=None, baseline=None, filter=None):
+    """Run tests/benchmarks and gate on regressions.
+
+    Results are stored per git commit in .benchmarks/results.json.
+    """
+    venv_path = os.path.join(cwd, '.venv')
+
+    with VirtualEnv(path=venv_path, now=True) as venv:
+        cmd = [str(venv.python_executable), os.path.join('tests', 'benchmarks', 'runner.py')]
+        if threshold:
+            cmd += ['--threshold', str(threshold)]
+        if baseline:
+            cmd += ['--baseline', baseline]
+        if filter:
+            cmd += ['--filter', filter]
+
+        print("Running benchmarks...")
+        result = subprocess.run(cmd, cwd=cwd)
+        return result.returncode == 0
+
 @test()
 @angreal.command(name='static', about="run our static analysis")
 @angreal.argument(name="open", long="open", short='o',
@@ -143,8 +510,7 @@ def setup_env(open):
     
     with VirtualEnv(path=venv_path, now=True) as venv:
         # Install static analysis dependencies
-        print("Installing static analysis dependencies...")
-        venv.install(["mypy"])
+        ensure_installed(venv, ["mypy"], cwd)
         
         # Run mypy using venv's python
         print("Running static analysis...")
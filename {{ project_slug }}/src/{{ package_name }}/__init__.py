@@ -1,4 +1,48 @@
 """{{ package_name }}
 
+Subpackages and the most used helpers are imported lazily on first attribute
+access, so ``import {{ package_name }}`` stays cheap in notebook kernels and the
+console script.
 """
-__version__ = "0.0.0a"
\ No newline at end of file
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+__version__ = '0.0.0a'
+
+if TYPE_CHECKING:
+    # Explicit ``as`` re-exports: ``__all__`` is built from ``_LAZY`` at runtime.
+    from . import core as core
+    from . import io as io
+    from . import mapreduce as mapreduce
+    from . import pipeline as pipeline
+    from . import utils as utils
+    from .core.settings import get_settings as get_settings
+    from .utils.notebook import setup_notebook as setup_notebook
+
+# Public name -> (module, attribute); attribute None means the module itself.
+_LAZY = {
+    'core': ('.core', None),
+    'io': ('.io', None),
+    'mapreduce': ('.mapreduce', None),
+    'pipeline': ('.pipeline', None),
+    'utils': ('.utils', None),
+    'get_settings': ('.core.settings', 'get_settings'),
+    'setup_notebook': ('.utils.notebook', 'setup_notebook'),
+}
+
+__all__ = ['__version__', *_LAZY]
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _LAZY:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    module_name, attribute = _LAZY[name]
+    module = importlib.import_module(module_name, __name__)
+    value = module if attribute is None else getattr(module, attribute)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(__all__)
@@ -1,6 +1,125 @@
 """{{ package_name }}'s registered entry point.
 
+Runs pipelines of stages declared with ``{{ package_name }}.pipeline.stage``:
+
+    {{ project_slug }} run my_project.stages            # bring every stage up to date
+    {{ project_slug }} run my_project.stages -t train   # one stage and its upstream stages
+    {{ project_slug }} list my_project.stages           # show stages in execution order
+
+and manages large notebook outputs (see ``{{ package_name }}.utils.nbstore``):
+
+    {{ project_slug }} outputs strip notebooks/         # move large outputs into .nbstore/
+    {{ project_slug }} outputs restore notebooks/       # put them back
+    {{ project_slug }} outputs report                   # output bytes per epoch
 """
 
-def main() -> None:
-    pass
\ No newline at end of file
+import argparse
+import importlib
+import logging
+import sys
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from .pipeline import Pipeline
+
+
+def _load_pipeline(target: str) -> 'Pipeline':
+    """Import ``module`` or ``module:attribute`` and return the pipeline it declares."""
+    from .pipeline import Pipeline, pipeline
+
+    module_name, _, attribute = target.partition(':')
+    module = importlib.import_module(module_name)
+    if not attribute:
+        return pipeline
+    found = getattr(module, attribute)
+    if not isinstance(found, Pipeline):
+        raise TypeError(f'{target} is not a Pipeline')
+    return found
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='{{ project_slug }}', description='Run {{ package_name }} pipelines and manage notebook outputs.'
+    )
+    parser.add_argument('-v', '--verbose', action='store_true', help='log each stage as it runs')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run', help='run out-of-date stages')
+    run.add_argument('pipeline', help='module declaring the stages, or module:attribute of a Pipeline')
+    run.add_argument('-t', '--target', action='append', help='stage to bring up to date (repeatable)')
+    run.add_argument('-j', '--jobs', type=int, help='stages to run at once (default: max_workers setting)')
+    run.add_argument('--processes', action='store_true', help='run stages in the shared process pool')
+    run.add_argument('-f', '--force', action='store_true', help='run stages even if they are up to date')
+    run.add_argument('-n', '--dry-run', action='store_true', help='only show which stages would run')
+
+    show = commands.add_parser('list', help='list stages in execution order')
+    show.add_argument('pipeline', help='module declaring the stages, or module:attribute of a Pipeline')
+
+    outputs = commands.add_parser('outputs', help='move large notebook outputs to and from the blob store')
+    outputs.add_argument('action', choices=['strip', 'restore', 'report'])
+    outputs.add_argument('paths', nargs='*', default=['notebooks'], help='notebooks or directories')
+    outputs.add_argument('--store', default='.nbstore', help='blob store directory (default: .nbstore)')
+    outputs.add_argument(
+        '--threshold', type=int, default=100 * 1024, help='externalize outputs larger than this many bytes'
+    )
+    return parser
+
+
+def _outputs(args: argparse.Namespace) -> int:
+    from .utils import nbstore
+
+    store = nbstore.OutputStore(args.store)
+    notebooks = nbstore.find_notebooks(args.paths)
+    if args.action == 'restore':
+        restored = sum(nbstore.restore_notebook(path, store) for path in notebooks)
+        print(f'Restored {restored} outputs in {len(notebooks)} notebooks')
+        return 0
+
+    if args.action == 'strip':
+        sizes = [nbstore.strip_notebook(path, store, args.threshold) for path in notebooks]
+        print(nbstore.summarize_by_epoch(sizes))
+        print(
+            f'Moved {sum(s.outputs_moved for s in sizes)} outputs, {sum(s.moved_bytes for s in sizes):,} bytes saved'
+        )
+        return 0
+
+    sizes = [nbstore.measure_notebook(path, args.threshold) for path in notebooks]
+    print(nbstore.summarize_by_epoch(sizes, moved_label='strippable'))
+    return 0
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = _parser().parse_args(argv)
+    from .core.log import configure_logging
+
+    configure_logging(level=logging.INFO if args.verbose else logging.WARNING, text_format='%(message)s')
+
+    if args.command == 'outputs':
+        return _outputs(args)
+
+    from .pipeline import format_report
+
+    pipeline = _load_pipeline(args.pipeline)
+    if args.command == 'list':
+        deps = pipeline.dependencies()
+        for name in pipeline.order():
+            after = f'  (after {", ".join(sorted(deps[name]))})' if deps[name] else ''
+            print(f'{name}{after}')
+        return 0
+
+    results = pipeline.run(
+        targets=args.target,
+        max_workers=args.jobs,
+        processes=args.processes,
+        force=args.force,
+        dry_run=args.dry_run,
+    )
+    print(format_report(results, wall_seconds=pipeline.last_run_seconds))
+    for result in results:
+        if result.error is not None:
+            print(f'\n{result.name} failed: {result.error!r}', file=sys.stderr)
+    return 1 if any(r.status in ('failed', 'blocked') for r in results) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
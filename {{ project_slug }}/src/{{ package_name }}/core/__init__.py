@@ -1 +1,60 @@
-"""Core module for {{ package_name }}."""
\ No newline at end of file
+"""Core module for {{ package_name }}.
+
+Public names are imported lazily on first access so that importing the package
+does not pull in pydantic and dotenv until settings are actually used.
+"""
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .config import AppSettings as AppSettings
+    from .config import LogFormat as LogFormat
+    from .config import LogLevel as LogLevel
+    from .loader import SettingsLoader as SettingsLoader
+    from .loader import SettingsWatcher as SettingsWatcher
+    from .log import configure_logging as configure_logging
+    from .resources import get_process_pool as get_process_pool
+    from .resources import get_thread_pool as get_thread_pool
+    from .resources import shutdown_pools as shutdown_pools
+    from .resources import worker_count as worker_count
+    from .settings import Settings as Settings
+    from .settings import SettingsSnapshot as SettingsSnapshot
+    from .settings import get_settings as get_settings
+    from .settings import get_settings_snapshot as get_settings_snapshot
+    from .settings import settings_initializer as settings_initializer
+    from .settings import watch_settings as watch_settings
+
+# Public name -> submodule that defines it.
+_LAZY = {
+    'AppSettings': '.config',
+    'LogFormat': '.config',
+    'LogLevel': '.config',
+    'SettingsLoader': '.loader',
+    'SettingsWatcher': '.loader',
+    'configure_logging': '.log',
+    'get_process_pool': '.resources',
+    'get_thread_pool': '.resources',
+    'shutdown_pools': '.resources',
+    'worker_count': '.resources',
+    'Settings': '.settings',
+    'SettingsSnapshot': '.settings',
+    'get_settings': '.settings',
+    'get_settings_snapshot': '.settings',
+    'settings_initializer': '.settings',
+    'watch_settings': '.settings',
+}
+
+__all__ = list(_LAZY)
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _LAZY:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    value = getattr(importlib.import_module(_LAZY[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(__all__)
@@ -4,8 +4,11 @@ This module defines all available configuration options and their defaults.
 Add new settings by adding new fields with type hints and Field definitions.
 """
 
-from pydantic import BaseModel, Field
 from enum import Enum
+from pathlib import Path
+from typing import Optional
+
+from pydantic import BaseModel, Field
 
 
 class LogLevel(str, Enum):
@@ -18,6 +21,13 @@ class LogLevel(str, Enum):
     CRITICAL = 'CRITICAL'
 
 
+class LogFormat(str, Enum):
+    """Valid log output formats."""
+
+    TEXT = 'text'
+    JSON = 'json'
+
+
 class AppSettings(BaseModel):
     """Application configuration structure.
 
@@ -26,4 +36,53 @@ class AppSettings(BaseModel):
     """
 
     # Application settings
-    log_level: LogLevel = Field(default=LogLevel.INFO, description='Application logging level')
\ No newline at end of file
+    log_level: LogLevel = Field(default=LogLevel.INFO, description='Application logging level')
+    log_format: LogFormat = Field(
+        default=LogFormat.TEXT, description='Log output format: text or one JSON object per line'
+    )
+    log_file: Optional[Path] = Field(
+        default=None, description='Also write logs to this file (default: stderr only)'
+    )
+    log_rate_limit: Optional[float] = Field(
+        default=None,
+        gt=0,
+        description='Records per second allowed from each logging call site; excess records are dropped and counted',
+    )
+
+    # Compute resources
+    max_workers: Optional[int] = Field(
+        default=None,
+        ge=1,
+        description='Worker count for thread and process pools (default: usable CPUs / threads_per_worker)',
+    )
+    threads_per_worker: int = Field(
+        default=1,
+        ge=1,
+        description='BLAS/OpenMP thread cap applied inside each pool worker',
+    )
+    memory_budget_mb: Optional[int] = Field(
+        default=None,
+        ge=1,
+        description='Total memory budget for pool workers in MB; caps the worker count when set',
+    )
+    worker_memory_mb: int = Field(
+        default=1024,
+        ge=1,
+        description='Expected peak memory of one pool worker in MB, used with memory_budget_mb',
+    )
+    chunk_size: int = Field(
+        default=1_000_000,
+        ge=1,
+        description='Target rows per chunk for out-of-core map-reduce',
+    )
+
+    # Disk cache
+    cache_dir: Optional[Path] = Field(
+        default=None,
+        description='Directory for memoized results (default: $XDG_CACHE_HOME/{{ package_name }} or ~/.cache/{{ package_name }})',
+    )
+    cache_max_mb: int = Field(
+        default=4096,
+        ge=1,
+        description='Size limit of the disk cache in MB; least recently used entries are evicted beyond it',
+    )
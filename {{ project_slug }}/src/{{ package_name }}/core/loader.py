@@ -0,0 +1,234 @@
+"""Cached, change-aware loading of settings sources.
+
+Settings are assembled from three layers: the ``.env`` file, prefixed
+environment variables and direct overrides. ``SettingsLoader`` keeps the parsed
+result of each layer and only rebuilds a layer when its source changes:
+
+- the ``.env`` layer is keyed on the file's resolved path, mtime and size, and
+  parsed ``.env`` files are shared between loaders through a module-level cache
+- the environment layer is keyed on the prefixed variables it contains
+
+``SettingsWatcher`` polls a loader in a daemon thread so long-running batch
+processes and kernels pick up changes without a restart.
+"""
+
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, Optional, Union
+
+from dotenv import dotenv_values
+
+from .config import AppSettings, LogLevel
+
+logger = logging.getLogger(__name__)
+
+FileKey = tuple[str, int, int]
+EnvironKey = tuple[tuple[str, str], ...]
+
+_dotenv_cache: dict[str, tuple[FileKey, dict[str, Any]]] = {}
+_dotenv_cache_lock = threading.Lock()
+
+
+def _file_key(path: Path) -> Optional[FileKey]:
+    """Return the (path, mtime, size) cache key of a file, or None if it is missing."""
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return (str(path.resolve()), stat.st_mtime_ns, stat.st_size)
+
+
+def _parse_items(items: Any, prefix: str) -> dict[str, Any]:
+    """Convert prefixed ``KEY=value`` pairs into ``AppSettings`` keyword arguments."""
+    config: dict[str, Any] = {}
+    for key, value in items:
+        if value is None or not key.startswith(prefix):
+            continue
+        config_key = key[len(prefix) :].lower()
+        if config_key == 'log_level':
+            config[config_key] = LogLevel(value.upper())
+        else:
+            config[config_key] = value
+    return config
+
+
+def parse_dotenv(path: Path, prefix: str) -> tuple[Optional[FileKey], dict[str, Any]]:
+    """Parse a ``.env`` file, reusing the cached result while the file is unchanged.
+
+    Args:
+        path: Location of the ``.env`` file.
+        prefix: Environment prefix that settings keys must start with.
+
+    Returns:
+        The file's cache key (None if the file does not exist) and the parsed values.
+    """
+    key = _file_key(path)
+    if key is None:
+        return None, {}
+
+    cache_key = f'{prefix}:{key[0]}'
+    with _dotenv_cache_lock:
+        cached = _dotenv_cache.get(cache_key)
+    if cached is not None and cached[0] == key:
+        return key, cached[1]
+
+    logger.debug('Parsing .env file %s', path)
+    values = _parse_items(dotenv_values(str(path)).items(), prefix)
+    with _dotenv_cache_lock:
+        _dotenv_cache[cache_key] = (key, values)
+    return key, values
+
+
+def clear_dotenv_cache() -> None:
+    """Drop all cached ``.env`` parse results."""
+    with _dotenv_cache_lock:
+        _dotenv_cache.clear()
+
+
+class SettingsLoader:
+    """Build ``AppSettings`` from cached source layers.
+
+    Precedence, from highest to lowest: direct overrides, environment variables,
+    ``.env`` file values, ``AppSettings`` defaults.
+
+    Example:
+        >>> loader = SettingsLoader('.env', '{{ environment_prefix }}')
+        >>> settings = loader.load()
+        >>> loader.refresh()  # False unless .env or the environment changed
+        False
+    """
+
+    def __init__(
+        self, env_file: Optional[Union[str, Path]] = None, env_prefix: str = '{{ environment_prefix }}'
+    ):
+        self.env_path = Path(env_file) if env_file else Path('.env')
+        self.env_prefix = env_prefix
+        self._overrides: dict[str, Any] = {}
+        self._dotenv_key: Optional[FileKey] = None
+        self._dotenv_layer: dict[str, Any] = {}
+        self._environ_key: Optional[EnvironKey] = None
+        self._environ_layer: dict[str, Any] = {}
+        self._settings: Optional[AppSettings] = None
+        self._lock = threading.Lock()
+
+    @property
+    def settings(self) -> Optional[AppSettings]:
+        """The most recently built settings, or None before the first ``load``."""
+        return self._settings
+
+    def load(self, **overrides: Any) -> AppSettings:
+        """Build settings from all layers, applying ``overrides`` on top.
+
+        Overrides are remembered and re-applied by later ``refresh`` calls.
+        """
+        with self._lock:
+            self._overrides = {k.lower(): v for k, v in overrides.items()}
+            self._refresh_dotenv()
+            self._refresh_environ()
+            self._settings = self._build()
+            return self._settings
+
+    def refresh(self) -> bool:
+        """Rebuild settings if any source layer changed.
+
+        Returns:
+            True if a new ``AppSettings`` instance was built.
+        """
+        with self._lock:
+            dotenv_changed = self._refresh_dotenv()
+            environ_changed = self._refresh_environ()
+            if self._settings is not None and not (dotenv_changed or environ_changed):
+                return False
+            settings = self._build()
+            changed = settings != self._settings
+            self._settings = settings
+            return changed
+
+    def _refresh_dotenv(self) -> bool:
+        key = _file_key(self.env_path)
+        if key == self._dotenv_key:
+            return False
+        self._dotenv_key, self._dotenv_layer = parse_dotenv(self.env_path, self.env_prefix)
+        return True
+
+    def _refresh_environ(self) -> bool:
+        key = tuple(sorted((k, v) for k, v in os.environ.items() if k.startswith(self.env_prefix)))
+        if key == self._environ_key:
+            return False
+        self._environ_key = key
+        self._environ_layer = _parse_items(key, self.env_prefix)
+        return True
+
+    def _build(self) -> AppSettings:
+        config: dict[str, Any] = {}
+        config.update(self._dotenv_layer)
+        config.update(self._environ_layer)
+        config.update(self._overrides)
+        logger.debug('Building AppSettings from %d keys', len(config))
+        return AppSettings(**config)
+
+
+class SettingsWatcher:
+    """Poll a ``SettingsLoader`` in a daemon thread and report changes.
+
+    Args:
+        loader: Loader to refresh on every poll.
+        on_change: Called with the new ``AppSettings`` whenever a refresh builds
+            a different instance.
+        interval: Seconds between polls.
+    """
+
+    def __init__(
+        self,
+        loader: SettingsLoader,
+        on_change: Callable[[AppSettings], None],
+        interval: float = 1.0,
+    ):
+        self.loader = loader
+        self.on_change = on_change
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        """Whether the polling thread is alive."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> 'SettingsWatcher':
+        """Start polling. Calling it on a running watcher has no effect."""
+        if not self.running:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='settings-watcher', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop polling and wait for the thread to exit."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def poll(self) -> bool:
+        """Refresh once, notifying ``on_change`` if the settings changed."""
+        try:
+            changed = self.loader.refresh()
+        except Exception:
+            logger.exception('Failed to reload settings; keeping the previous values')
+            return False
+        if changed and self.loader.settings is not None:
+            self.on_change(self.loader.settings)
+        return changed
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.poll()
+
+    def __enter__(self) -> 'SettingsWatcher':
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
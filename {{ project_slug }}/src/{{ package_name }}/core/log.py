@@ -0,0 +1,290 @@
+"""Non-blocking logging configured from ``AppSettings``.
+
+``configure_logging`` replaces the root logger's handlers with a single
+``QueueHandler``. Threads that log only format the message and put the record
+on a queue; a ``QueueListener`` thread does the console and file I/O, so a
+slow terminal or network filesystem never stalls a worker. Process pool
+workers created by ``core.resources`` send their records to the parent's
+listener over a multiprocessing queue.
+
+Settings used (all with the ``{{ environment_prefix }}`` prefix):
+
+- ``LOG_LEVEL``: root logger level;
+- ``LOG_FORMAT``: ``text`` or ``json`` (one object per line, with any ``extra`` fields);
+- ``LOG_FILE``: optional file written in addition to stderr;
+- ``LOG_RATE_LIMIT``: records per second allowed from each call site. Excess
+  records from hot loops are dropped before they are queued, and the next
+  record let through reports how many were suppressed.
+
+Example:
+    >>> import logging
+    >>> from {{ package_name }}.core.log import configure_logging
+    >>> configure_logging()
+    >>> logging.getLogger(__name__).info('Loaded %d rows', 1000)  # %-style: formatted only if enabled
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Optional, Union
+
+from .config import AppSettings, LogFormat
+
+DEFAULT_TEXT_FORMAT = '%(asctime)s %(levelname)-8s %(name)s: %(message)s'
+
+# Attributes every LogRecord has; anything else was passed with ``extra``.
+_RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {
+    'message',
+    'asctime',
+    'suppressed',
+}
+
+_lock = threading.RLock()
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional[logging.Handler] = None
+_handlers: list[logging.Handler] = []
+# Start method -> (multiprocessing queue, listener draining it) for process pool workers.
+_worker_queues: dict[str, tuple[Any, logging.handlers.QueueListener]] = {}
+
+
+class TextFormatter(logging.Formatter):
+    """Standard formatter that also reports records suppressed by rate limiting."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        text = super().format(record)
+        suppressed = getattr(record, 'suppressed', 0)
+        return f'{text} ({suppressed} similar messages suppressed)' if suppressed else text
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record: time, level, logger, message, exception and extras."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: dict[str, Any] = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'process': record.process,
+            'thread': record.threadName,
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exception'] = record.exc_text
+        if getattr(record, 'suppressed', 0):
+            entry['suppressed'] = record.suppressed  # type: ignore[attr-defined]
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith('_'):
+                entry[key] = value
+        return json.dumps(entry, default=str)
+
+
+class RateLimitFilter(logging.Filter):
+    """Token bucket per call site: at most ``rate`` records per second, bursts up to ``burst``.
+
+    Records over the limit are dropped. The next record from the same call
+    site that passes carries the number dropped in its ``suppressed`` attribute.
+
+    Args:
+        rate: Records per second allowed from each ``(file, line)``.
+        burst: Bucket size. Defaults to ``max(1, rate)``.
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        super().__init__()
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self._buckets: dict[tuple[str, int], list[float]] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        key = (record.pathname, record.lineno)
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                # [tokens, last refill time, records suppressed since the last one let through]
+                bucket = self._buckets[key] = [self.burst, now, 0]
+            bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            if bucket[0] < 1:
+                bucket[2] += 1
+                return False
+            bucket[0] -= 1
+            suppressed, bucket[2] = int(bucket[2]), 0
+        if suppressed:
+            record.suppressed = suppressed
+        return True
+
+
+_EXCEPTION_FORMATTER = logging.Formatter()
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that keeps the exception text separate from the message.
+
+    The message is merged with its arguments in the calling thread (arguments
+    may be mutated afterwards, and must not need pickling for process queues);
+    everything else is formatted by the listener. The record is updated in
+    place: this handler sits on the root logger, so every other handler has
+    already seen it.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = _EXCEPTION_FORMATTER.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def _build_handlers(settings: AppSettings, text_format: str) -> list[logging.Handler]:
+    formatter: logging.Formatter
+    if settings.log_format == LogFormat.JSON:
+        formatter = JsonFormatter()
+    else:
+        formatter = TextFormatter(text_format)
+    handlers: list[logging.Handler] = [logging.StreamHandler()]
+    if settings.log_file is not None:
+        settings.log_file.parent.mkdir(parents=True, exist_ok=True)
+        handlers.append(logging.FileHandler(settings.log_file, encoding='utf-8'))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    return handlers
+
+
+def configure_logging(
+    settings: Optional[AppSettings] = None,
+    level: Optional[Union[int, str]] = None,
+    text_format: str = DEFAULT_TEXT_FORMAT,
+) -> None:
+    """Route all logging through a queue to handlers built from the settings.
+
+    Safe to call again, e.g. after ``Settings.reload()``: the previous
+    listener is flushed and replaced.
+
+    Args:
+        settings: Settings to configure from. Defaults to the settings singleton.
+        level: Root level overriding ``log_level``.
+        text_format: ``logging.Formatter`` format string for the text format.
+    """
+    global _listener, _queue_handler, _handlers
+    if settings is None:
+        from .settings import get_settings
+
+        settings = get_settings().app_settings()
+
+    with _lock:
+        _stop_listeners()
+        handlers = _build_handlers(settings, text_format)
+        records: queue.SimpleQueue[Any] = queue.SimpleQueue()
+        queue_handler = _QueueHandler(records)
+        if settings.log_rate_limit is not None:
+            queue_handler.addFilter(RateLimitFilter(settings.log_rate_limit))
+        listener = logging.handlers.QueueListener(records, *handlers, respect_handler_level=True)
+        listener.start()
+        # Pools created under the previous configuration keep logging to their queues.
+        for start_method, (worker_records, _) in list(_worker_queues.items()):
+            worker_listener = logging.handlers.QueueListener(
+                worker_records, *handlers, respect_handler_level=True
+            )
+            worker_listener.start()
+            _worker_queues[start_method] = (worker_records, worker_listener)
+
+        root = logging.getLogger()
+        for handler in root.handlers[:]:
+            root.removeHandler(handler)
+        root.addHandler(queue_handler)
+        root.setLevel(level if level is not None else settings.log_level.value)
+        _listener, _queue_handler, _handlers = listener, queue_handler, handlers
+
+
+def _stop_listeners() -> None:
+    global _listener, _queue_handler, _handlers
+    for _, worker_listener in _worker_queues.values():
+        worker_listener.stop()
+    if _listener is not None:
+        _listener.stop()
+    if _queue_handler is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+    for handler in _handlers:
+        handler.close()
+    _listener, _queue_handler, _handlers = None, None, []
+
+
+def shutdown_logging() -> None:
+    """Stop the listeners, writing out every queued record, and close the handlers."""
+    with _lock:
+        _stop_listeners()
+        _worker_queues.clear()
+
+
+def worker_log_queue(start_method: str) -> Optional[Any]:
+    """Queue that process pool workers of ``start_method`` should log to.
+
+    None when ``configure_logging`` has not been called, in which case workers
+    keep Python's default logging.
+    """
+    with _lock:
+        if _listener is None:
+            return None
+        entry = _worker_queues.get(start_method)
+        if entry is None:
+            records = multiprocessing.get_context(start_method).Queue()
+            worker_listener = logging.handlers.QueueListener(records, *_handlers, respect_handler_level=True)
+            worker_listener.start()
+            entry = _worker_queues[start_method] = (records, worker_listener)
+        return entry[0]
+
+
+def worker_log_config(start_method: str) -> Optional[tuple[Any, int, Optional[float]]]:
+    """``(queue, level, rate limit)`` for ``configure_worker_logging``, or None if logging is not configured."""
+    with _lock:
+        records = worker_log_queue(start_method)
+        if records is None or _queue_handler is None:
+            return None
+        rate_limit = next((f.rate for f in _queue_handler.filters if isinstance(f, RateLimitFilter)), None)
+        return records, logging.getLogger().level, rate_limit
+
+
+def configure_worker_logging(
+    records: Any, level: Union[int, str], rate_limit: Optional[float] = None
+) -> None:
+    """Pool initializer step: send this worker's records to the parent's listener."""
+    handler = _QueueHandler(records)
+    if rate_limit is not None:
+        handler.addFilter(RateLimitFilter(rate_limit))
+    root = logging.getLogger()
+    for existing in root.handlers[:]:
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(level)
+
+
+def _after_fork_in_child() -> None:
+    """The listener threads do not survive a fork; log synchronously in the child instead."""
+    global _listener, _queue_handler, _lock
+    _lock = threading.RLock()
+    _worker_queues.clear()
+    if _queue_handler is not None:
+        root = logging.getLogger()
+        root.removeHandler(_queue_handler)
+        for handler in _handlers:
+            for log_filter in _queue_handler.filters:
+                handler.addFilter(log_filter)
+            root.addHandler(handler)
+    _listener, _queue_handler = None, None
+
+
+atexit.register(shutdown_logging)
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
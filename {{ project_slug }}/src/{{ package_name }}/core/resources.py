@@ -0,0 +1,191 @@
+"""Shared, correctly sized executor pools.
+
+Pools are sized from ``AppSettings`` so that workers times BLAS/OpenMP threads
+per worker never exceeds the usable CPUs, and so that the expected memory of
+all workers fits in ``memory_budget_mb``. Pools are created on first use,
+reused by every caller and shut down at interpreter exit.
+
+Example:
+    >>> from {{ package_name }}.core.resources import get_process_pool
+    >>> pool = get_process_pool()
+    >>> results = list(pool.map(score_partition, partitions))
+"""
+
+import atexit
+import contextlib
+import logging
+import multiprocessing
+import os
+import threading
+from collections.abc import Iterator
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Optional
+
+from .config import AppSettings
+from .log import configure_worker_logging, worker_log_config
+from .settings import get_settings, init_worker_settings, settings_initializer
+
+logger = logging.getLogger(__name__)
+
+# Environment variables read by the common BLAS/OpenMP runtimes when they load.
+THREAD_LIMIT_VARS = (
+    'OMP_NUM_THREADS',
+    'OPENBLAS_NUM_THREADS',
+    'MKL_NUM_THREADS',
+    'BLIS_NUM_THREADS',
+    'VECLIB_MAXIMUM_THREADS',
+    'NUMEXPR_NUM_THREADS',
+)
+
+_thread_pool: Optional[ThreadPoolExecutor] = None
+_process_pools: dict[str, ProcessPoolExecutor] = {}
+_pools_lock = threading.Lock()
+
+
+def available_cpus() -> int:
+    """Number of CPUs this process may run on, honouring affinity masks."""
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def worker_count(settings: Optional[AppSettings] = None) -> int:
+    """Number of pool workers allowed by the CPU and memory settings.
+
+    Args:
+        settings: Settings to size from. Defaults to the settings singleton.
+    """
+    if settings is None:
+        settings = get_settings().app_settings()
+    workers = settings.max_workers or max(1, available_cpus() // settings.threads_per_worker)
+    if settings.memory_budget_mb is not None:
+        workers = min(workers, max(1, settings.memory_budget_mb // settings.worker_memory_mb))
+    return workers
+
+
+def thread_limit_env(threads: int) -> dict[str, str]:
+    """Environment variables that cap BLAS/OpenMP runtimes at ``threads`` threads."""
+    return dict.fromkeys(THREAD_LIMIT_VARS, str(threads))
+
+
+def limit_threads(threads: int) -> None:
+    """Cap BLAS/OpenMP threads in the current process.
+
+    The environment variables take effect for runtimes loaded afterwards. Runtimes
+    that are already loaded (e.g. NumPy imported before a fork) are limited through
+    ``threadpoolctl`` when it is installed.
+    """
+    os.environ.update(thread_limit_env(threads))
+    _limit_loaded_runtimes(threads)
+
+
+def _limit_loaded_runtimes(threads: int) -> None:
+    try:
+        from threadpoolctl import threadpool_limits
+    except ImportError:
+        return
+    threadpool_limits(limits=threads)
+
+
+@contextlib.contextmanager
+def thread_limits(threads: Optional[int] = None) -> Iterator[None]:
+    """Cap already loaded BLAS/OpenMP runtimes for the duration of a block.
+
+    The caps are process-wide, so this is the way to limit them around work
+    submitted to the thread pool without changing them for the rest of the
+    session. Does nothing when ``threadpoolctl`` is not installed.
+
+    Args:
+        threads: Thread cap. Defaults to the ``threads_per_worker`` setting.
+    """
+    if threads is None:
+        threads = get_settings().app_settings().threads_per_worker
+    try:
+        from threadpoolctl import threadpool_limits
+    except ImportError:
+        yield
+        return
+    with threadpool_limits(limits=threads):
+        yield
+
+
+def _init_process_worker(
+    threads: int,
+    settings_payload: str,
+    log_config: Optional[tuple[Any, int, Optional[float]]] = None,
+) -> None:
+    limit_threads(threads)
+    init_worker_settings(settings_payload)
+    if log_config is not None:
+        configure_worker_logging(*log_config)
+
+
+def get_thread_pool() -> ThreadPoolExecutor:
+    """Return the shared thread pool, creating it on first use.
+
+    BLAS/OpenMP thread caps are process-wide, so creating the thread pool does
+    not change them; wrap the work in ``thread_limits()`` to cap them while it
+    runs.
+    """
+    global _thread_pool
+    with _pools_lock:
+        if _thread_pool is None:
+            workers = worker_count()
+            logger.debug('Creating thread pool with %d workers', workers)
+            _thread_pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='{{ package_name }}')
+        return _thread_pool
+
+
+def get_process_pool(start_method: Optional[str] = None) -> ProcessPoolExecutor:
+    """Return the shared process pool for ``start_method``, creating it on first use.
+
+    Each worker caps its BLAS/OpenMP threads at ``threads_per_worker`` and
+    receives the parent's settings instead of re-reading them. If
+    ``configure_logging`` was called first, workers log through the parent's
+    queue listener.
+
+    Args:
+        start_method: Multiprocessing start method (``'spawn'``, ``'fork'`` or
+            ``'forkserver'``). Defaults to the platform default.
+    """
+    context = multiprocessing.get_context(start_method)
+    key = f'process:{context.get_start_method()}'
+    with _pools_lock:
+        pool = _process_pools.get(key)
+        # A worker that died abruptly breaks the whole executor; replace it.
+        if pool is None or getattr(pool, '_broken', False):
+            settings = get_settings().app_settings()
+            workers = worker_count(settings)
+            _, (payload,) = settings_initializer(settings)
+            logger.debug('Creating %s process pool with %d workers', context.get_start_method(), workers)
+            pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=context,
+                initializer=_init_process_worker,
+                initargs=(
+                    settings.threads_per_worker,
+                    payload,
+                    worker_log_config(context.get_start_method()),
+                ),
+            )
+            _process_pools[key] = pool
+        return pool
+
+
+def shutdown_pools(wait: bool = True, cancel_futures: bool = False) -> None:
+    """Shut down every shared pool. The next ``get_*_pool`` call creates a fresh one.
+
+    Call this after changing the resource settings so new pools pick them up.
+    """
+    global _thread_pool
+    with _pools_lock:
+        pools: list[Executor] = list(_process_pools.values())
+        if _thread_pool is not None:
+            pools.append(_thread_pool)
+        _process_pools.clear()
+        _thread_pool = None
+    for pool in pools:
+        pool.shutdown(wait=wait, cancel_futures=cancel_futures)
+
+
+atexit.register(shutdown_pools)
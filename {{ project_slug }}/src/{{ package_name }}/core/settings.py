@@ -1,52 +1,142 @@
 """Settings management implementation.
 
 This module handles both the loading of settings from various sources and
-providing singleton access to the settings instance.
+providing singleton access to the settings instance. Source parsing and
+change detection live in ``loader``.
 """
 
-from typing import Any, Dict, Optional, Union
-from pathlib import Path
-from dotenv import dotenv_values
-import os
 import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, Optional, Union
 
-from .config import AppSettings, LogLevel
+from .config import AppSettings
+from .loader import SettingsLoader, SettingsWatcher
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
 
+class SettingsSnapshot:
+    """Frozen copy of ``AppSettings`` for hot-loop access.
+
+    Every field of ``AppSettings`` is stored in a slot, so attribute reads are a
+    plain descriptor lookup with no logging, delegation or validation. Use it
+    inside per-row functions where ``Settings.__getattr__`` would dominate.
+    """
+
+    __slots__ = tuple(AppSettings.model_fields)
+
+    def __init__(self, values: dict[str, Any]):
+        for name in self.__slots__:
+            object.__setattr__(self, name, values[name])
+
+    @classmethod
+    def from_app_settings(cls, settings: AppSettings) -> 'SettingsSnapshot':
+        """Build a snapshot from a validated ``AppSettings`` instance."""
+        return cls({name: getattr(settings, name) for name in cls.__slots__})
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the snapshot values as a new dictionary."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"Settings snapshots are immutable. Can't modify '{name}'")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"Settings snapshots are immutable. Can't delete '{name}'")
+
+    def __reduce__(self):
+        return (self.__class__, (self.as_dict(),))
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, SettingsSnapshot):
+            return NotImplemented
+        return self.as_dict() == other.as_dict()
+
+    def __hash__(self) -> int:
+        return hash(tuple(self.as_dict().items()))
+
+    def __repr__(self) -> str:
+        fields = ', '.join(f'{name}={getattr(self, name)!r}' for name in self.__slots__)
+        return f'SettingsSnapshot({fields})'
+
+
 class Settings:
     """Settings singleton with configuration loading capabilities."""
 
     _instance: Optional['Settings'] = None
+    _lock = threading.RLock()
 
     def __init__(self):
         logger.debug('Initializing new Settings instance')
         self._settings: Optional[AppSettings] = None
+        self._snapshot: Optional[SettingsSnapshot] = None
         self._env_prefix = '{{ environment_prefix }}'
+        self._loader = SettingsLoader(env_prefix=self._env_prefix)
+        self._watcher: Optional[SettingsWatcher] = None
+        self._swap_lock = threading.Lock()
 
     @classmethod
     def get_instance(cls, env_file: Optional[Union[str, Path]] = None, **kwargs) -> 'Settings':
-        """Get or create settings instance."""
-        logger.debug(f'get_instance called with kwargs: {kwargs}')
-
-        if cls._instance is None:
-            logger.debug('Creating new instance')
-            cls._instance = cls()
-            cls._instance._initialize(env_file=env_file, **kwargs)
-        elif kwargs or env_file:
+        """Get or create settings instance.
+
+        Safe under concurrent first access: the instance is created and fully
+        initialized under a lock before it is published, so other threads never
+        see a partially initialized singleton.
+        """
+        logger.debug('get_instance called with kwargs: %s', kwargs)
+
+        instance = cls._instance
+        if instance is None:
+            with cls._lock:
+                instance = cls._instance
+                if instance is None:
+                    logger.debug('Creating new instance')
+                    instance = cls()
+                    instance._initialize(env_file=env_file, **kwargs)
+                    cls._instance = instance
+                    return instance
+        if kwargs or env_file:
             raise RuntimeError(
                 'Settings already initialized. Cannot modify settings after initialization. '
                 'Use Settings.reset() first if you need to create a new settings instance.'
             )
-        return cls._instance
+        return instance
+
+    @classmethod
+    def install(cls, settings: AppSettings) -> 'Settings':
+        """Make ``settings`` the singleton without reading any configuration sources.
+
+        Used in pool workers so that every worker shares the parent's values
+        instead of re-parsing .env and the environment.
+        """
+        with cls._lock:
+            if cls._instance is not None and cls._instance._watcher is not None:
+                cls._instance._watcher.stop()
+            instance = cls()
+            instance._settings = settings
+            cls._instance = instance
+            return instance
 
     @classmethod
     def reset(cls):
-        """Reset settings instance."""
+        """Reset settings instance, stopping any running watcher."""
         logger.debug('Resetting Settings instance')
-        cls._instance = None
+        with cls._lock:
+            if cls._instance is not None and cls._instance._watcher is not None:
+                cls._instance._watcher.stop()
+            cls._instance = None
+
+    @classmethod
+    def _after_fork_in_child(cls) -> None:
+        """Replace locks that may have been held by another thread at fork time."""
+        cls._lock = threading.RLock()
+        if cls._instance is not None:
+            cls._instance._swap_lock = threading.Lock()
+            # The polling thread does not survive the fork.
+            cls._instance._watcher = None
 
     def _initialize(self, env_file: Optional[Union[str, Path]] = None, **kwargs):
         """Initialize settings from all sources in order of precedence:
@@ -54,60 +144,93 @@ class Settings:
         2. Environment variables
         3. .env file values
         4. Default values (lowest precedence, from AppSettings class)
+
+        Parsed sources are cached by ``SettingsLoader``, so a fresh instance does
+        not re-parse an unchanged .env file.
         """
         logger.debug('Starting _initialize')
 
         if self._settings is not None:
             raise RuntimeError('Settings already initialized')
 
-        # Load settings in order of precedence
-        config: Dict[str, Any] = {}
-
-        # 1. Load .env file values (third precedence)
-        env_path = Path(env_file) if env_file else Path('.env')
-        if env_path.exists():
-            logger.debug(f'Loading .env file from {env_path}')
-            env_values = dotenv_values(str(env_path))
-            for key, value in env_values.items():
-                if key.startswith(self._env_prefix):
-                    config_key = key[len(self._env_prefix) :].lower()
-                    if config_key == 'log_level':
-                        config[config_key] = LogLevel(value.upper())
-                    else:
-                        config[config_key] = value
-                    logger.debug(f'Added from .env: {key} -> {config_key}={config[config_key]}')
-
-        # 2. Load environment variables (second precedence)
-        logger.debug('Loading environment variables')
-        for key, value in os.environ.items():
-            if key.startswith(self._env_prefix):
-                config_key = key[len(self._env_prefix) :].lower()
-                if config_key == 'log_level':
-                    config[config_key] = LogLevel(value.upper())
-                else:
-                    config[config_key] = value
-                logger.debug(f'Added from environ: {key} -> {config_key}={config[config_key]}')
-
-        # 3. Apply direct overrides (highest precedence)
-        logger.debug(f'Applying direct overrides: {kwargs}')
-        config.update({k.lower(): v for k, v in kwargs.items()})
-
-        logger.debug(f'Final config before AppSettings creation: {config}')
-
+        self._loader = SettingsLoader(env_file=env_file, env_prefix=self._env_prefix)
         try:
-            # Create settings instance with collected values
             # Pydantic will automatically use default values from AppSettings
-            # for any fields not present in config
-            self._settings = AppSettings(**config)
-            logger.debug(f'Successfully created AppSettings: {self._settings}')
+            # for any fields not present in the loaded sources
+            self._settings = self._loader.load(**kwargs)
+            logger.debug('Successfully created AppSettings: %s', self._settings)
         except Exception as e:
-            logger.error(f'Failed to create AppSettings: {str(e)}')
+            logger.error('Failed to create AppSettings: %s', e)
             self._settings = None
             raise RuntimeError(f'Failed to initialize settings: {str(e)}') from e
 
+    def reload(self) -> bool:
+        """Re-read the .env file and environment, swapping in new settings if they changed.
+
+        Only sources that changed since the last load are re-parsed. Direct overrides
+        passed at initialization are kept. Readers see either the old or the new
+        ``AppSettings`` instance, never a partially updated one.
+
+        Returns:
+            True if the settings changed.
+        """
+        if self._settings is None:
+            raise RuntimeError('Settings not initialized')
+        if not self._loader.refresh() or self._loader.settings is None:
+            return False
+        self._swap(self._loader.settings)
+        return True
+
+    def watch(self, interval: float = 1.0) -> SettingsWatcher:
+        """Poll the settings sources every ``interval`` seconds and reload on change.
+
+        Returns:
+            The running watcher; call ``stop()`` on it to stop polling.
+        """
+        if self._settings is None:
+            raise RuntimeError('Settings not initialized')
+        if self._watcher is None:
+            self._watcher = SettingsWatcher(self._loader, self._swap, interval=interval)
+        return self._watcher.start()
+
+    def _swap(self, settings: AppSettings) -> None:
+        """Atomically replace the settings and invalidate the snapshot."""
+        with self._swap_lock:
+            logger.info('Settings reloaded')
+            self._settings = settings
+            self._snapshot = None
+
+    def app_settings(self) -> AppSettings:
+        """Return the validated ``AppSettings`` instance currently in use."""
+        settings = self._settings
+        if settings is None:
+            raise RuntimeError('Settings not initialized')
+        return settings
+
+    def snapshot(self) -> 'SettingsSnapshot':
+        """Return a frozen, plain-attribute copy of the current settings.
+
+        The snapshot is built once per settings instance and reused on every call
+        until the settings are reloaded.
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            with self._swap_lock:
+                if self._settings is None:
+                    raise RuntimeError('Settings not initialized')
+                if self._snapshot is None:
+                    self._snapshot = SettingsSnapshot.from_app_settings(self._settings)
+                snapshot = self._snapshot
+        return snapshot
+
+    def __getstate__(self) -> dict[str, Any]:
+        raise TypeError(
+            'Settings cannot be pickled; pass AppSettings to workers with settings_initializer() instead'
+        )
+
     def __getattr__(self, name: str) -> Any:
         """Delegate attribute access to settings instance."""
-        logger.debug(f'Getting attribute: {name}')
+        logger.debug('Getting attribute: %s', name)
         if self._settings is None:
             logger.error('Settings accessed before initialization')
             raise RuntimeError('Settings not initialized')
@@ -123,6 +246,10 @@ class Settings:
             raise AttributeError(f"Settings are immutable. Can't modify '{name}'")
 
 
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=Settings._after_fork_in_child)
+
+
 def get_settings(env_file: Optional[Union[str, Path]] = None, **kwargs) -> Settings:
     """Get settings singleton instance.
 
@@ -142,5 +269,67 @@ def get_settings(env_file: Optional[Union[str, Path]] = None, **kwargs) -> Setti
         >>> print(settings.log_level)
         DEBUG
     """
-    logger.debug(f'get_settings called with kwargs: {kwargs}')
-    return Settings.get_instance(env_file=env_file, **kwargs)
\ No newline at end of file
+    logger.debug('get_settings called with kwargs: %s', kwargs)
+    return Settings.get_instance(env_file=env_file, **kwargs)
+
+
+def get_settings_snapshot(env_file: Optional[Union[str, Path]] = None, **kwargs) -> SettingsSnapshot:
+    """Get a frozen snapshot of the settings singleton.
+
+    Takes the same arguments as ``get_settings``. Reading attributes from the
+    returned object skips the logging and delegation done by ``Settings``, so
+    prefer it for settings read inside tight loops.
+
+    Example:
+        >>> settings = get_settings_snapshot()
+        >>> print(settings.log_level)
+        INFO
+    """
+    return get_settings(env_file=env_file, **kwargs).snapshot()
+
+
+def watch_settings(interval: float = 1.0) -> SettingsWatcher:
+    """Reload the settings singleton whenever its sources change.
+
+    Intended for long-running batch processes and notebook kernels. Code that
+    reads ``get_settings()`` sees the new values after the next poll; existing
+    snapshots keep the values they were built with.
+
+    Example:
+        >>> watcher = watch_settings(interval=5.0)
+        >>> ...  # edit .env; settings.log_level follows
+        >>> watcher.stop()
+    """
+    return get_settings().watch(interval=interval)
+
+
+def init_worker_settings(payload: str) -> None:
+    """Pool initializer that installs serialized ``AppSettings`` as the worker's singleton.
+
+    Args:
+        payload: ``AppSettings`` serialized with ``model_dump_json``.
+    """
+    Settings.install(AppSettings.model_validate_json(payload))
+
+
+def settings_initializer(
+    settings: Optional[AppSettings] = None,
+) -> tuple[Callable[[str], None], tuple[str]]:
+    """Build an ``initializer``/``initargs`` pair that ships settings to pool workers.
+
+    The settings are serialized once in the parent, so every worker gets identical
+    values and none of them re-parses .env or ``os.environ``, whatever the
+    multiprocessing start method.
+
+    Args:
+        settings: Settings to ship. Defaults to the parent's singleton.
+
+    Example:
+        >>> from concurrent.futures import ProcessPoolExecutor
+        >>> initializer, initargs = settings_initializer()
+        >>> with ProcessPoolExecutor(initializer=initializer, initargs=initargs) as pool:
+        ...     pool.submit(work)
+    """
+    if settings is None:
+        settings = get_settings().app_settings()
+    return init_worker_settings, (settings.model_dump_json(),)
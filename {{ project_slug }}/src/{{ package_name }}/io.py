@@ -0,0 +1,330 @@
+"""Memory-mapped, zero-copy loading of columnar datasets.
+
+Parquet, Arrow IPC (Feather v2) and ``.npy`` files are opened through memory
+maps, so only the columns and row groups that are actually touched are paged
+in from disk. This keeps datasets larger than RAM usable on shared analysis
+hosts. ``convert_csv`` turns CSV extracts into these formats once, streaming
+them in blocks so the CSV itself never has to fit in memory; ``iter_csv``
+streams a CSV as tables of a fixed number of rows.
+
+Requires the ``data`` extra (``pip install -e '.[data]'``).
+
+Example:
+    >>> from {{ package_name }} import io
+    >>> io.convert_csv('extracts/orders.csv', 'data/orders.parquet')
+    >>> table = io.load('data/orders.parquet', columns=['customer_id', 'amount'],
+    ...                 filters=[('order_date', '>=', '2024-01-01')])
+    >>> df = table.to_pandas()
+"""
+
+import logging
+from collections.abc import Iterable, Iterator, Sequence
+from pathlib import Path
+from typing import Any, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+PathLike = Union[str, Path]
+
+PARQUET_SUFFIXES = ('.parquet', '.pq')
+ARROW_SUFFIXES = ('.arrow', '.feather', '.ipc')
+NUMPY_SUFFIXES = ('.npy',)
+
+# Default rows per Parquet row group written by ``convert_csv``.
+DEFAULT_ROW_GROUP_SIZE = 128 * 1024
+# Default bytes of CSV parsed per streaming block.
+DEFAULT_BLOCK_SIZE = 16 * 1024 * 1024
+
+
+def _require_pyarrow() -> Any:
+    try:
+        import pyarrow
+    except ImportError as e:
+        raise ImportError(
+            "{{ package_name }}.io requires pyarrow; install it with pip install -e '.[data]'"
+        ) from e
+    return pyarrow
+
+
+def file_format(path: PathLike) -> str:
+    """``'parquet'``, ``'arrow'`` or ``'npy'``, inferred from the suffix of ``path``."""
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix in PARQUET_SUFFIXES:
+        return 'parquet'
+    if suffix in ARROW_SUFFIXES:
+        return 'arrow'
+    if suffix in NUMPY_SUFFIXES:
+        return 'npy'
+    raise ValueError(f'Cannot infer the format of {path}; pass format= explicitly')
+
+
+def _format(path: Path, format: Optional[str]) -> str:
+    return format if format is not None else file_format(path)
+
+
+def load_parquet(
+    path: PathLike,
+    columns: Optional[Sequence[str]] = None,
+    row_groups: Optional[Sequence[int]] = None,
+    filters: Optional[Any] = None,
+) -> Any:
+    """Load a Parquet file through a memory map.
+
+    Args:
+        path: Parquet file.
+        columns: Columns to read. Other column chunks are never read.
+        row_groups: Indices of the row groups to read.
+        filters: Row filters in ``pyarrow.parquet`` form, e.g.
+            ``[('year', '>=', 2023)]``. Row groups whose statistics rule them out
+            are skipped without being read.
+
+    Returns:
+        A ``pyarrow.Table``.
+    """
+    _require_pyarrow()
+    import pyarrow.parquet as pq
+
+    if filters is not None:
+        if row_groups is not None:
+            raise ValueError('Pass either row_groups or filters, not both')
+        return pq.read_table(path, columns=columns, filters=filters, memory_map=True)
+
+    parquet_file = pq.ParquetFile(path, memory_map=True)
+    if row_groups is not None:
+        return parquet_file.read_row_groups(row_groups, columns=columns)
+    return parquet_file.read(columns=columns)
+
+
+def load_arrow(
+    path: PathLike,
+    columns: Optional[Sequence[str]] = None,
+    batches: Optional[Sequence[int]] = None,
+) -> Any:
+    """Load an Arrow IPC file as a zero-copy view over a memory map.
+
+    The returned table's buffers point into the mapped file; nothing is copied
+    or decompressed unless the file was written with compression.
+
+    Args:
+        path: Arrow IPC (Feather v2) file.
+        columns: Columns to keep.
+        batches: Indices of the record batches to keep, the IPC counterpart of
+            Parquet row groups.
+
+    Returns:
+        A ``pyarrow.Table``.
+    """
+    pa = _require_pyarrow()
+    import pyarrow.ipc as ipc
+
+    reader = ipc.open_file(pa.memory_map(str(path), 'r'))
+    if batches is None:
+        table = reader.read_all()
+    else:
+        table = pa.Table.from_batches([reader.get_batch(i) for i in batches], schema=reader.schema)
+    if columns is not None:
+        table = table.select(list(columns))
+    return table
+
+
+def load_npy(path: PathLike, writable: bool = False) -> Any:
+    """Memory-map a ``.npy`` file.
+
+    Args:
+        path: ``.npy`` file.
+        writable: Map copy-on-write instead of read-only.
+
+    Returns:
+        A ``numpy.memmap`` backed by the file.
+    """
+    import numpy as np
+
+    return np.load(path, mmap_mode='c' if writable else 'r', allow_pickle=False)
+
+
+def load(
+    path: PathLike,
+    columns: Optional[Sequence[str]] = None,
+    row_groups: Optional[Sequence[int]] = None,
+    filters: Optional[Any] = None,
+    format: Optional[str] = None,
+) -> Any:
+    """Load a Parquet, Arrow IPC or ``.npy`` file through a memory map.
+
+    The format is inferred from the suffix unless ``format`` is given
+    (``'parquet'``, ``'arrow'`` or ``'npy'``). ``row_groups`` selects record
+    batches for Arrow IPC files; ``filters`` is only supported for Parquet.
+
+    Returns:
+        A ``pyarrow.Table`` for Parquet/Arrow, a ``numpy.memmap`` for ``.npy``.
+    """
+    path = Path(path)
+    fmt = _format(path, format)
+    if fmt == 'parquet':
+        return load_parquet(path, columns=columns, row_groups=row_groups, filters=filters)
+    if filters is not None:
+        raise ValueError('filters are only supported for Parquet files')
+    if fmt == 'arrow':
+        return load_arrow(path, columns=columns, batches=row_groups)
+    if fmt == 'npy':
+        if columns is not None or row_groups is not None:
+            raise ValueError('.npy files do not support column or row group selection; slice the array')
+        return load_npy(path)
+    raise ValueError(f'Unsupported format: {fmt}')
+
+
+def _open_csv(source: PathLike, columns: Optional[Sequence[str]], block_size: int, **csv_options: Any) -> Any:
+    import pyarrow.csv as csv
+
+    return csv.open_csv(
+        source,
+        read_options=csv.ReadOptions(block_size=block_size),
+        convert_options=csv.ConvertOptions(include_columns=list(columns) if columns else None, **csv_options),
+    )
+
+
+def convert_csv(
+    source: PathLike,
+    dest: Optional[PathLike] = None,
+    format: Optional[str] = None,
+    columns: Optional[Sequence[str]] = None,
+    row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    compression: Optional[str] = 'zstd',
+    **csv_options: Any,
+) -> Path:
+    """Convert a CSV file to Parquet, Arrow IPC or ``.npy``.
+
+    The CSV is parsed ``block_size`` bytes at a time, so peak memory is bounded
+    by a few blocks rather than the file size. ``.npy`` output takes a second
+    pass over the CSV to size the file before filling it.
+
+    Args:
+        source: CSV file to convert.
+        dest: Output path. Defaults to ``source`` with the format's suffix.
+        format: ``'parquet'`` (default), ``'arrow'`` or ``'npy'``. Inferred from
+            ``dest`` when it has a known suffix.
+        columns: Columns to keep.
+        row_group_size: Rows per Parquet row group / Arrow record batch.
+        block_size: Bytes of CSV parsed per block.
+        compression: Parquet compression codec. Arrow files are always written
+            uncompressed so they can be mapped zero-copy.
+        **csv_options: Passed to ``pyarrow.csv.ConvertOptions`` (e.g. ``column_types``).
+
+    Returns:
+        The written path.
+    """
+    pa = _require_pyarrow()
+    source = Path(source)
+    if format is None:
+        format = _format(Path(dest), None) if dest is not None else 'parquet'
+    suffix = {'parquet': '.parquet', 'arrow': '.arrow', 'npy': '.npy'}[format]
+    dest = Path(dest) if dest is not None else source.with_suffix(suffix)
+
+    if format == 'npy':
+        _write_npy(source, dest, columns, block_size, csv_options)
+    elif format == 'arrow':
+        import pyarrow.ipc as ipc
+
+        reader = _open_csv(source, columns, block_size, **csv_options)
+        with pa.OSFile(str(dest), 'wb') as sink, ipc.new_file(sink, reader.schema) as writer:
+            for table in _regroup(pa, reader, row_group_size):
+                writer.write_table(table, max_chunksize=row_group_size)
+    else:
+        import pyarrow.parquet as pq
+
+        reader = _open_csv(source, columns, block_size, **csv_options)
+        with pq.ParquetWriter(dest, reader.schema, compression=compression) as writer:
+            for table in _regroup(pa, reader, row_group_size):
+                writer.write_table(table, row_group_size=row_group_size)
+
+    logger.info('Converted %s to %s', source, dest)
+    return dest
+
+
+def iter_csv(
+    source: PathLike,
+    chunk_size: int,
+    columns: Optional[Sequence[str]] = None,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    **csv_options: Any,
+) -> Iterator[Any]:
+    """Stream a CSV file as ``pyarrow.Table`` chunks of exactly ``chunk_size`` rows.
+
+    The last chunk holds the remaining rows. The CSV is parsed ``block_size``
+    bytes at a time, so at most a block and a chunk are in memory at once.
+    Each chunk is copied out of its block, so pickling it (e.g. to send it to
+    a worker process) does not carry the rest of the block along.
+
+    Args:
+        source: CSV file to read.
+        chunk_size: Rows per chunk.
+        columns: Columns to keep.
+        block_size: Bytes of CSV parsed per block.
+        **csv_options: Passed to ``pyarrow.csv.ConvertOptions`` (e.g. ``column_types``).
+    """
+    if chunk_size < 1:
+        raise ValueError(f'chunk_size must be at least 1, got {chunk_size}')
+    pa = _require_pyarrow()
+    reader = _open_csv(source, columns, block_size, **csv_options)
+    for table in _regroup(pa, reader, chunk_size):
+        yield pa.Table.from_arrays(
+            [pa.concat_arrays(column.chunks) for column in table.columns], schema=table.schema
+        )
+
+
+def _regroup(pa: Any, batches: Iterable[Any], rows: int) -> Iterator[Any]:
+    """Re-chunk a stream of record batches into tables of exactly ``rows`` rows, plus a shorter last one.
+
+    Keeps row groups full-sized regardless of how many rows each CSV block held.
+    The tables are zero-copy slices of the parsed blocks.
+    """
+    pending = None
+    for batch in batches:
+        table = pa.Table.from_batches([batch])
+        pending = table if pending is None else pa.concat_tables([pending, table])
+        while pending.num_rows >= rows:
+            yield pending.slice(0, rows)
+            pending = pending.slice(rows)
+    if pending is not None and pending.num_rows:
+        yield pending
+
+
+def _write_npy(
+    source: Path, dest: Path, columns: Optional[Sequence[str]], block_size: int, csv_options: Any
+) -> None:
+    """Write numeric CSV columns into a 2-D ``.npy`` file without loading the CSV.
+
+    Integer and boolean columns have no missing value marker, so when any column
+    has empty cells the whole array is promoted to float64 and they become NaN.
+    """
+    import numpy as np
+
+    # First pass: row count, missing values and result dtype, so the output can be pre-allocated.
+    reader = _open_csv(source, columns, block_size, **csv_options)
+    rows = 0
+    has_nulls = False
+    for batch in reader:
+        rows += batch.num_rows
+        has_nulls = has_nulls or any(column.null_count for column in batch.columns)
+    if not rows:
+        raise ValueError(f'{source} has no rows')
+    dtype = np.result_type(*(field.type.to_pandas_dtype() for field in reader.schema))
+    if not np.issubdtype(dtype, np.number) and dtype != np.bool_:
+        raise ValueError('Only numeric CSV columns can be converted to .npy; pass columns= to select them')
+    if has_nulls and not np.issubdtype(dtype, np.floating):
+        logger.info('%s has missing values; writing float64 with NaN', source)
+        dtype = np.dtype('float64')
+
+    pa = _require_pyarrow()
+    reader = _open_csv(source, columns, block_size, **csv_options)
+    out = np.lib.format.open_memmap(dest, mode='w+', dtype=dtype, shape=(rows, len(reader.schema)))
+    offset = 0
+    for batch in reader:
+        for i, column in enumerate(batch.columns):
+            if column.null_count:
+                column = column.cast(pa.float64())
+            out[offset : offset + batch.num_rows, i] = column.to_numpy(zero_copy_only=False)
+        offset += batch.num_rows
+    out.flush()
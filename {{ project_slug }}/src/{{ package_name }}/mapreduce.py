@@ -0,0 +1,284 @@
+"""Out-of-core map-reduce over columnar files on the shared process pool.
+
+``map_reduce`` splits a file, or a directory of files, into chunks of about
+``chunk_size`` rows, applies a map function to each chunk in the shared
+process pool and folds the partial results together with a reduce function
+in the calling process. Only a bounded number of chunks is in flight at a
+time, so memory stays proportional to the worker count, not the dataset.
+
+Parquet, Arrow IPC and ``.npy`` chunks are described by row ranges and read
+by the workers themselves through memory maps, so no data is pickled across
+processes. CSV files are streamed in the parent and sent to workers chunk by
+chunk; convert them once with ``io.convert_csv`` for repeated runs.
+
+Worker count (``max_workers``) and rows per chunk (``chunk_size``) come from
+``AppSettings``. Requires the ``data`` extra (``pip install -e '.[data]'``).
+
+Example:
+    >>> from {{ package_name }}.mapreduce import map_reduce
+    >>> def daily_totals(df):  # must be importable, i.e. defined in a module
+    ...     return df.groupby('order_date')['amount'].sum()
+    >>> totals, stats = map_reduce('data/orders/', daily_totals, lambda a, b: a.add(b, fill_value=0),
+    ...                            columns=['order_date', 'amount'])
+    >>> stats.rows_per_second
+"""
+
+import logging
+import sys
+import time
+from collections.abc import Iterator, Sequence
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Optional, Union
+
+from . import io
+from .core.resources import get_process_pool, worker_count
+from .core.settings import get_settings
+from .utils.profiling import current_rss
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - Windows
+    resource = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+PathLike = Union[str, Path]
+
+CSV_SUFFIXES = ('.csv',)
+
+_NO_INITIAL = object()
+
+
+@dataclass(frozen=True)
+class Chunk:
+    """A ``[start, stop)`` range of one file.
+
+    The range counts row groups for Parquet, record batches for Arrow IPC and
+    rows for ``.npy``.
+    """
+
+    path: Path
+    format: str
+    start: int
+    stop: int
+
+
+@dataclass
+class MapReduceStats:
+    """Throughput and memory of a ``map_reduce`` run."""
+
+    chunks: int = 0
+    rows: int = 0
+    seconds: float = 0.0
+    # Peak RSS of the calling process, sampled as chunks complete.
+    peak_rss_mb: Optional[float] = None
+    # Highest lifetime peak RSS reported by a pool worker.
+    peak_worker_rss_mb: Optional[float] = None
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+def _files(source: Path) -> list[Path]:
+    if not source.is_dir():
+        return [source]
+    suffixes = io.PARQUET_SUFFIXES + io.ARROW_SUFFIXES + io.NUMPY_SUFFIXES + CSV_SUFFIXES
+    return sorted(p for p in source.iterdir() if p.is_file() and p.suffix.lower() in suffixes)
+
+
+def _group(path: Path, fmt: str, sizes: Sequence[int], chunk_size: int) -> Iterator[Chunk]:
+    """Group consecutive row groups/batches into chunks of at least ``chunk_size`` rows."""
+    start = rows = 0
+    for i, size in enumerate(sizes):
+        rows += size
+        if rows >= chunk_size:
+            yield Chunk(path, fmt, start, i + 1)
+            start, rows = i + 1, 0
+    if start < len(sizes):
+        yield Chunk(path, fmt, start, len(sizes))
+
+
+def _plan(source: PathLike, chunk_size: int, columns: Optional[Sequence[str]]) -> Iterator[Any]:
+    """Yield a ``Chunk`` per row range, or a ``pyarrow.Table`` of ``chunk_size`` rows per CSV chunk."""
+    for path in _files(Path(source)):
+        if path.suffix.lower() in CSV_SUFFIXES:
+            yield from io.iter_csv(path, chunk_size, columns)
+            continue
+        fmt = io.file_format(path)
+        if fmt == 'parquet':
+            import pyarrow.parquet as pq
+
+            metadata = pq.ParquetFile(path, memory_map=True).metadata
+            sizes = [metadata.row_group(i).num_rows for i in range(metadata.num_row_groups)]
+            yield from _group(path, fmt, sizes, chunk_size)
+        elif fmt == 'arrow':
+            import pyarrow as pa
+            import pyarrow.ipc as ipc
+
+            reader = ipc.open_file(pa.memory_map(str(path), 'r'))
+            sizes = [reader.get_batch(i).num_rows for i in range(reader.num_record_batches)]
+            yield from _group(path, fmt, sizes, chunk_size)
+        else:
+            rows = len(io.load_npy(path))
+            for start in range(0, rows, chunk_size):
+                yield Chunk(path, fmt, start, min(start + chunk_size, rows))
+
+
+def load_chunk(chunk: Any, columns: Optional[Sequence[str]] = None, as_pandas: bool = True) -> Any:
+    """Materialize a planned chunk: a DataFrame (or ``pyarrow.Table``), or an array for ``.npy``."""
+    if isinstance(chunk, Chunk):
+        if chunk.format == 'parquet':
+            data = io.load_parquet(chunk.path, columns=columns, row_groups=range(chunk.start, chunk.stop))
+        elif chunk.format == 'arrow':
+            data = io.load_arrow(chunk.path, columns=columns, batches=range(chunk.start, chunk.stop))
+        else:
+            return io.load_npy(chunk.path)[chunk.start : chunk.stop]
+    else:
+        data = chunk
+    return data.to_pandas() if as_pandas else data
+
+
+def iter_chunks(
+    source: PathLike,
+    columns: Optional[Sequence[str]] = None,
+    chunk_size: Optional[int] = None,
+    as_pandas: bool = True,
+) -> Iterator[Any]:
+    """Iterate over the chunks ``map_reduce`` would hand to the map function.
+
+    Useful for developing a map function on the first chunk in a notebook.
+    """
+    chunk_size = chunk_size or get_settings().app_settings().chunk_size
+    for chunk in _plan(source, chunk_size, columns):
+        yield load_chunk(chunk, columns, as_pandas)
+
+
+def _peak_rss_kb() -> Optional[int]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and KiB elsewhere.
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def _map_chunk(
+    map_func: Callable[[Any], Any],
+    chunk: Any,
+    columns: Optional[Sequence[str]],
+    as_pandas: bool,
+) -> tuple[Any, int, Optional[int]]:
+    """Worker entry point: load a chunk, map it and report rows and peak RSS."""
+    data = load_chunk(chunk, columns, as_pandas)
+    rows = len(data)
+    partial = map_func(data)
+    del data
+    return partial, rows, _peak_rss_kb()
+
+
+def map_reduce(
+    source: PathLike,
+    map_func: Callable[[Any], Any],
+    reduce_func: Callable[[Any, Any], Any],
+    initial: Any = _NO_INITIAL,
+    columns: Optional[Sequence[str]] = None,
+    chunk_size: Optional[int] = None,
+    max_in_flight: Optional[int] = None,
+    ordered: bool = False,
+    as_pandas: bool = True,
+    executor: Optional[Executor] = None,
+) -> tuple[Any, MapReduceStats]:
+    """Map ``map_func`` over the chunks of ``source`` and fold the results.
+
+    Args:
+        source: A Parquet, Arrow IPC, ``.npy`` or CSV file, or a directory of them.
+        map_func: Called with each chunk, as a DataFrame (or ``pyarrow.Table``
+            without ``as_pandas``) or a NumPy array for ``.npy``. Must be
+            picklable, i.e. a module-level function.
+        reduce_func: Combines the running result with one partial result.
+            Must be associative; also commutative unless ``ordered``.
+        initial: Starting value of the fold. Defaults to the first partial.
+        columns: Columns to read from Parquet, Arrow and CSV files.
+        chunk_size: Target rows per chunk. Defaults to the ``chunk_size`` setting.
+            CSV and ``.npy`` chunks hold exactly this many rows (the last one
+            fewer); Parquet/Arrow chunks are whole row groups/batches, so they
+            may be larger.
+        max_in_flight: Chunks submitted but not yet reduced. Bounds memory.
+            Defaults to twice the worker count.
+        ordered: Reduce partials in file order instead of completion order.
+        as_pandas: Convert Arrow tables to pandas before calling ``map_func``.
+        executor: Pool to run on. Defaults to the shared process pool.
+
+    Returns:
+        ``(result, stats)``.
+
+    Raises:
+        ValueError: If ``source`` has no chunks and no ``initial`` was given.
+    """
+    chunk_size = chunk_size or get_settings().app_settings().chunk_size
+    executor = executor or get_process_pool()
+    window = max_in_flight or 2 * worker_count()
+
+    stats = MapReduceStats()
+    start = time.perf_counter()
+    result = initial
+    planned = enumerate(_plan(source, chunk_size, columns))
+    running: dict[Future, int] = {}
+    finished: dict[int, Any] = {}
+    next_index = 0
+    exhausted = False
+
+    def fold(partial: Any) -> None:
+        nonlocal result
+        result = partial if result is _NO_INITIAL else reduce_func(result, partial)
+
+    try:
+        while True:
+            # Backpressure: only plan (and, for CSV, read) more when the window has room.
+            while not exhausted and len(running) + len(finished) < window:
+                try:
+                    index, chunk = next(planned)
+                except StopIteration:
+                    exhausted = True
+                    break
+                running[executor.submit(_map_chunk, map_func, chunk, columns, as_pandas)] = index
+            if not running:
+                break
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = running.pop(future)
+                partial, rows, worker_peak_kb = future.result()
+                stats.chunks += 1
+                stats.rows += rows
+                if worker_peak_kb is not None:
+                    stats.peak_worker_rss_mb = max(stats.peak_worker_rss_mb or 0.0, worker_peak_kb / 1024)
+                if ordered:
+                    finished[index] = partial
+                else:
+                    fold(partial)
+            while next_index in finished:
+                fold(finished.pop(next_index))
+                next_index += 1
+
+            rss = current_rss()
+            if rss is not None:
+                stats.peak_rss_mb = max(stats.peak_rss_mb or 0.0, rss / 2**20)
+    except BaseException:
+        for future in running:
+            future.cancel()
+        raise
+
+    stats.seconds = time.perf_counter() - start
+    logger.info(
+        'Reduced %d chunks (%d rows) in %.2fs, %.0f rows/s',
+        stats.chunks,
+        stats.rows,
+        stats.seconds,
+        stats.rows_per_second,
+    )
+    if result is _NO_INITIAL:
+        raise ValueError(f'{source} has no rows to reduce and no initial value was given')
+    return result, stats
@@ -0,0 +1,407 @@
+"""Incremental pipeline of Python stages with declared file inputs and outputs.
+
+Stages are plain functions registered with explicit input and output paths.
+The runner orders them into a DAG (a stage depends on whichever stage produces
+one of its inputs), runs independent stages in parallel and skips any stage
+whose code and input contents are unchanged since its last successful run.
+
+A stage's code is its function's own bytecode. Helpers it calls are not
+followed: list them (functions or whole modules) in ``code=`` so that editing
+them also makes the stage stale.
+
+Example:
+    >>> from {{ package_name }}.pipeline import stage
+    >>> @stage(inputs={'orders': 'data/orders.parquet'}, outputs={'features': 'data/features.parquet'})
+    ... def build_features(orders, features):
+    ...     ...
+    >>> @stage(inputs={'features': 'data/features.parquet'}, outputs={'model': 'models/model.pkl'},
+    ...        code=[make_estimator])
+    ... def train(features, model):
+    ...     ...
+
+Run it headless with ``{{ project_slug }} run my_project.stages``.
+"""
+
+import contextlib
+import json
+import logging
+import os
+import tempfile
+import time
+import types
+from collections.abc import Iterable, Mapping, Sequence
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Optional, Union
+
+from .utils.hashing import hash_file, hash_function, hash_value
+
+logger = logging.getLogger(__name__)
+
+PathLike = Union[str, Path]
+# A function, or a module whose source file is hashed.
+CodeDependency = Union[Callable[..., Any], types.ModuleType]
+
+DEFAULT_STATE_FILE = Path('.pipeline') / 'state.json'
+
+
+@dataclass(frozen=True)
+class Stage:
+    """A pipeline step: ``func(**inputs, **outputs)`` called with file paths.
+
+    ``code`` lists the helpers whose changes also invalidate the stage.
+    """
+
+    name: str
+    func: Callable[..., Any]
+    inputs: Mapping[str, Path]
+    outputs: Mapping[str, Path]
+    code: tuple[CodeDependency, ...] = ()
+
+
+@dataclass
+class StageResult:
+    """Outcome of one stage in a run."""
+
+    name: str
+    status: str  # 'ran', 'skipped', 'failed' or 'blocked'
+    seconds: float = 0.0
+    error: Optional[BaseException] = field(default=None, repr=False)
+
+
+class Pipeline:
+    """A set of stages plus the state file recording their last successful runs.
+
+    Args:
+        state_file: Where fingerprints of successful runs are stored.
+    """
+
+    def __init__(self, state_file: PathLike = DEFAULT_STATE_FILE):
+        self.state_file = Path(state_file)
+        self.stages: dict[str, Stage] = {}
+        # Wall time of the last ``run``, in seconds.
+        self.last_run_seconds: Optional[float] = None
+
+    def stage(
+        self,
+        inputs: Optional[Mapping[str, PathLike]] = None,
+        outputs: Optional[Mapping[str, PathLike]] = None,
+        name: Optional[str] = None,
+        code: Sequence[CodeDependency] = (),
+    ) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+        """Decorator registering a function as a stage.
+
+        The function is called with one keyword argument per input and output,
+        each a ``Path``. It is returned unchanged, so it stays importable (and
+        picklable for process execution) under its own name.
+
+        Only the function's own bytecode is fingerprinted. Pass the helper
+        functions or modules it calls as ``code`` to rerun the stage when they
+        change too.
+        """
+
+        def register(func: Callable[..., Any]) -> Callable[..., Any]:
+            self.add(func, inputs=inputs, outputs=outputs, name=name, code=code)
+            return func
+
+        return register
+
+    def add(
+        self,
+        func: Callable[..., Any],
+        inputs: Optional[Mapping[str, PathLike]] = None,
+        outputs: Optional[Mapping[str, PathLike]] = None,
+        name: Optional[str] = None,
+        code: Sequence[CodeDependency] = (),
+    ) -> Stage:
+        """Register ``func`` as a stage. See ``stage``."""
+        stage = Stage(
+            name=name or func.__name__,
+            func=func,
+            inputs={k: Path(v) for k, v in (inputs or {}).items()},
+            outputs={k: Path(v) for k, v in (outputs or {}).items()},
+            code=tuple(code),
+        )
+        if stage.name in self.stages:
+            raise ValueError(f'Stage {stage.name!r} is already registered')
+        overlap = set(stage.inputs) & set(stage.outputs)
+        if overlap:
+            raise ValueError(f'Stage {stage.name!r} uses {sorted(overlap)} as both input and output')
+        self.stages[stage.name] = stage
+        return stage
+
+    def dependencies(self) -> dict[str, set[str]]:
+        """Map each stage to the stages producing its inputs."""
+        producers: dict[Path, str] = {}
+        for stage in self.stages.values():
+            for path in stage.outputs.values():
+                key = path.resolve()
+                if key in producers:
+                    raise ValueError(f'{path} is produced by both {producers[key]!r} and {stage.name!r}')
+                producers[key] = stage.name
+        return {
+            stage.name: {producers[p.resolve()] for p in stage.inputs.values() if p.resolve() in producers}
+            for stage in self.stages.values()
+        }
+
+    def order(self, targets: Optional[Iterable[str]] = None) -> list[str]:
+        """Topologically sorted stage names, limited to ``targets`` and their upstream stages."""
+        deps = self.dependencies()
+        selected = set(self.stages) if targets is None else self._upstream(deps, targets)
+        ordered: list[str] = []
+        done: set[str] = set()
+        remaining = {name: deps[name] & selected for name in selected}
+        while remaining:
+            ready = sorted(name for name, upstream in remaining.items() if upstream <= done)
+            if not ready:
+                raise ValueError(f'Stages form a cycle: {sorted(remaining)}')
+            for name in ready:
+                ordered.append(name)
+                done.add(name)
+                del remaining[name]
+        return ordered
+
+    def run(
+        self,
+        targets: Optional[Iterable[str]] = None,
+        max_workers: Optional[int] = None,
+        processes: bool = False,
+        force: bool = False,
+        dry_run: bool = False,
+    ) -> list[StageResult]:
+        """Run out-of-date stages, independent ones in parallel.
+
+        Args:
+            targets: Stages to bring up to date, with their upstream stages.
+                Defaults to every stage.
+            max_workers: Stages running at once. Defaults to the ``max_workers`` setting.
+            processes: Run stages in the shared process pool of ``core.resources``
+                (BLAS/OpenMP threads capped per worker) instead of threads.
+            force: Run every selected stage even if it is up to date.
+            dry_run: Only report which stages would run.
+
+        Returns:
+            One result per selected stage, in execution order. The wall time of
+            the run is stored in ``last_run_seconds``.
+        """
+        start = time.perf_counter()
+        try:
+            return self._run(targets, max_workers, processes, force, dry_run)
+        finally:
+            self.last_run_seconds = time.perf_counter() - start
+
+    def _run(
+        self,
+        targets: Optional[Iterable[str]],
+        max_workers: Optional[int],
+        processes: bool,
+        force: bool,
+        dry_run: bool,
+    ) -> list[StageResult]:
+        deps = self.dependencies()
+        names = self.order(targets)
+        state = self._load_state()
+        results: dict[str, StageResult] = {}
+
+        if dry_run:
+            for name in names:
+                stale = force or any(results[d].status == 'ran' for d in deps[name] if d in results)
+                stale = stale or self._fingerprint(self.stages[name], state) != state.get(name)
+                results[name] = StageResult(name, 'ran' if stale else 'skipped')
+            return [results[name] for name in names]
+
+        from .core.resources import get_process_pool, worker_count
+
+        if max_workers is None:
+            max_workers = worker_count()
+        pending = list(names)
+        running: dict[Future, str] = {}
+        fingerprints: dict[str, dict[str, Any]] = {}
+        executor: Executor
+        # The shared process pool outlives the run; only a private thread pool is shut down.
+        owned: Any
+        if processes:
+            executor, owned = get_process_pool(), contextlib.nullcontext()
+        else:
+            executor = owned = ThreadPoolExecutor(max_workers=max_workers)
+        with owned:
+            while pending or running:
+                for name in list(pending):
+                    upstream = [results[d].status for d in deps[name] if d in results]
+                    if 'failed' in upstream or 'blocked' in upstream:
+                        results[name] = StageResult(name, 'blocked')
+                        pending.remove(name)
+                        continue
+                    if len(upstream) < len(deps[name] & set(names)):
+                        continue
+                    # The shared pool may be larger than max_workers; throttle submissions.
+                    if len(running) >= max_workers:
+                        break
+                    pending.remove(name)
+                    stage = self.stages[name]
+                    fingerprint = self._fingerprint(stage, state)
+                    if not force and fingerprint == state.get(name):
+                        logger.info('Skipping up-to-date stage %s', name)
+                        results[name] = StageResult(name, 'skipped')
+                        continue
+                    logger.info('Running stage %s', name)
+                    fingerprints[name] = fingerprint
+                    future = executor.submit(_timed_call, stage.func, {**stage.inputs, **stage.outputs})
+                    running[future] = name
+
+                if not running:
+                    continue
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    # The executor itself can fail (e.g. a crashed worker); then there is no timing.
+                    error: Optional[BaseException] = future.exception()
+                    seconds = 0.0
+                    if error is None:
+                        error, seconds = future.result()
+                    if error is not None:
+                        logger.error('Stage %s failed: %s', name, error)
+                        results[name] = StageResult(name, 'failed', seconds, error)
+                        continue
+                    missing = [str(p) for p in self.stages[name].outputs.values() if not p.exists()]
+                    if missing:
+                        error = FileNotFoundError(f'Stage {name!r} did not write {", ".join(missing)}')
+                        results[name] = StageResult(name, 'failed', seconds, error)
+                        continue
+                    # Record outputs so downstream stages and later runs see their current contents.
+                    outputs = self.stages[name].outputs.values()
+                    fingerprints[name]['outputs'] = self._hash_paths(outputs, state)
+                    state[name] = fingerprints[name]
+                    self._save_state(state)
+                    results[name] = StageResult(name, 'ran', seconds)
+
+        return [results[name] for name in names]
+
+    def _fingerprint(self, stage: Stage, state: dict[str, Any]) -> dict[str, Any]:
+        code = hash_function(stage.func)
+        if stage.code:
+            code = hash_value([code, *(_hash_code(dependency) for dependency in stage.code)])
+        fingerprint: dict[str, Any] = {
+            'code': code,
+            'inputs': self._hash_paths(stage.inputs.values(), state),
+        }
+        previous = state.get(stage.name)
+        if previous is not None and 'outputs' in previous:
+            # Outputs that were deleted or edited since the last run make the stage stale.
+            current = self._hash_paths(stage.outputs.values(), state)
+            fingerprint['outputs'] = current if current != previous['outputs'] else previous['outputs']
+        return fingerprint
+
+    def _hash_paths(self, paths: Iterable[Path], state: dict[str, Any]) -> dict[str, Optional[str]]:
+        """Content hashes of files (or directory trees), reusing hashes whose size and mtime match."""
+        known = state.setdefault('__files__', {})
+        hashes: dict[str, Optional[str]] = {}
+        for path in paths:
+            files = sorted(p for p in path.rglob('*') if p.is_file()) if path.is_dir() else [path]
+            digests: list[Optional[str]] = []
+            for file in files:
+                try:
+                    stat = file.stat()
+                except FileNotFoundError:
+                    digests.append(None)
+                    continue
+                key = str(file.resolve())
+                cached = known.get(key)
+                if cached is not None and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+                    digests.append(cached[2])
+                    continue
+                digest = hash_file(file)
+                known[key] = [stat.st_size, stat.st_mtime_ns, digest]
+                digests.append(digest)
+            hashes[str(path)] = None if None in digests else ','.join(str(d) for d in digests)
+        return hashes
+
+    def _load_state(self) -> dict[str, Any]:
+        try:
+            with open(self.state_file) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except ValueError:
+            logger.warning('Ignoring unreadable pipeline state %s', self.state_file)
+            return {}
+
+    def _save_state(self, state: dict[str, Any]) -> None:
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=self.state_file.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(state, f, indent=1, sort_keys=True)
+            os.replace(tmp_name, self.state_file)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp_name)
+            raise
+
+    @staticmethod
+    def _upstream(deps: dict[str, set[str]], targets: Iterable[str]) -> set[str]:
+        selected: set[str] = set()
+        stack = list(targets)
+        while stack:
+            name = stack.pop()
+            if name not in deps:
+                raise KeyError(f'Unknown stage {name!r}')
+            if name not in selected:
+                selected.add(name)
+                stack.extend(deps[name])
+        return selected
+
+
+def _hash_code(dependency: CodeDependency) -> str:
+    """Hash of a declared code dependency: a module's source file, or a function's bytecode."""
+    if isinstance(dependency, types.ModuleType):
+        source = getattr(dependency, '__file__', None)
+        if source is None:
+            raise ValueError(f'Cannot fingerprint module {dependency.__name__!r}: it has no source file')
+        return hash_file(source)
+    return hash_function(dependency)
+
+
+def _timed_call(func: Callable[..., Any], kwargs: dict[str, Path]) -> tuple[Optional[Exception], float]:
+    """Call a stage function and return its error (if any) and wall time, measured where it runs.
+
+    The error is returned rather than raised so its timing survives the trip
+    back from a process pool, where exception attributes are lost in pickling.
+    """
+    start = time.perf_counter()
+    try:
+        func(**kwargs)
+    except Exception as e:
+        return e, time.perf_counter() - start
+    return None, time.perf_counter() - start
+
+
+def format_report(results: Iterable[StageResult], wall_seconds: Optional[float] = None) -> str:
+    """Per-stage timing table for a run.
+
+    Args:
+        results: Results returned by ``Pipeline.run``.
+        wall_seconds: Wall time of the run (``Pipeline.last_run_seconds``). Stages
+            run in parallel, so this is usually less than the sum of stage times.
+    """
+    results = list(results)
+    width = max([len('stages')] + [len(r.name) for r in results])
+    lines = [f'{"stage":<{width}}  {"status":<8}  {"seconds":>9}', f'{"-" * width}  {"-" * 8}  {"-" * 9}']
+    for result in results:
+        seconds = f'{result.seconds:9.2f}' if result.status in ('ran', 'failed') else f'{"-":>9}'
+        lines.append(f'{result.name:<{width}}  {result.status:<8}  {seconds}')
+    stage_total = sum(r.seconds for r in results)
+    statuses = ('ran', 'skipped', 'failed', 'blocked')
+    counts = {status: sum(r.status == status for r in results) for status in statuses}
+    lines.append(f'{"-" * width}  {"-" * 8}  {"-" * 9}')
+    lines.append(f'{"stages":<{width}}  {"(sum)":<8}  {stage_total:9.2f}')
+    if wall_seconds is not None:
+        lines.append(f'{"total":<{width}}  {"(wall)":<8}  {wall_seconds:9.2f}')
+    lines.append(', '.join(f'{count} {status}' for status, count in counts.items()))
+    return '\n'.join(lines)
+
+
+# Default pipeline used by the module-level ``stage`` decorator and the console script.
+pipeline = Pipeline()
+stage = pipeline.stage
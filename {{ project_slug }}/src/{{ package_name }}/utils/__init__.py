@@ -1 +1,42 @@
-"""Utilities module for {{ package_name }}."""
\ No newline at end of file
+"""Utilities module for {{ package_name }}.
+
+Public names are imported lazily on first access, so the notebook template's
+``from {{ package_name }}.utils.notebook import setup_notebook`` stays cheap.
+"""
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .cache import DiskCache as DiskCache
+    from .cache import get_cache as get_cache
+    from .cache import memoize as memoize
+    from .hashing import hash_file as hash_file
+    from .hashing import hash_function as hash_function
+    from .hashing import hash_value as hash_value
+    from .notebook import setup_notebook as setup_notebook
+
+# Public name -> submodule that defines it.
+_LAZY = {
+    'DiskCache': '.cache',
+    'get_cache': '.cache',
+    'memoize': '.cache',
+    'hash_file': '.hashing',
+    'hash_function': '.hashing',
+    'hash_value': '.hashing',
+    'setup_notebook': '.notebook',
+}
+
+__all__ = list(_LAZY)
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _LAZY:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    value = getattr(importlib.import_module(_LAZY[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(__all__)
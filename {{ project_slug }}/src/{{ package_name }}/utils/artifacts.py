@@ -0,0 +1,339 @@
+"""Reproducible data artifacts shared across epochs.
+
+``produce`` runs a function that writes one file, records the hash of the
+function's code, its input files and its parameters, and stores the file
+under ``.artifacts/`` in the project root, keyed by its content. Called again
+with the same name, code, inputs and parameters, from any epoch, it returns
+the stored artifact without recomputing.
+
+Each epoch gets the artifacts it used in ``notebooks/epoch_NNN/artifacts/``,
+linked to the single stored copy: a reflink where the filesystem supports
+it, otherwise a hardlink (stored files are read-only, so a hardlinked copy
+cannot be modified by accident). The epoch's ``artifacts.json`` manifest
+records where each artifact came from and can be committed alongside the
+epoch's README; ``angreal new epoch --carry-artifacts`` links the previous
+epoch's artifacts into the new one.
+
+Example:
+    >>> from {{ package_name }} import io
+    >>> from {{ package_name }}.utils.artifacts import produce
+    >>> def build_features(output, orders, window):
+    ...     compute(io.load(orders).to_pandas(), window).to_parquet(output)
+    >>> path = produce('features.parquet', build_features,
+    ...                inputs={'orders': '../../data/orders.parquet'}, params={'window': 7})
+"""
+
+import contextlib
+import json
+import logging
+import os
+import shutil
+import stat
+import tempfile
+import threading
+import time
+from collections.abc import Mapping
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Optional, Union
+
+from .hashing import hash_file, hash_function, hash_value
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+PathLike = Union[str, Path]
+
+DEFAULT_STORE_DIR = '.artifacts'
+EPOCH_ARTIFACTS_DIR = 'artifacts'
+MANIFEST_NAME = 'artifacts.json'
+
+# ioctl request that clones a file's extents (Linux btrfs/XFS; FICLONE in linux/fs.h).
+_FICLONE = 0x40049409
+_READ_ONLY = stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH
+
+
+@dataclass
+class ArtifactRecord:
+    """Provenance of a stored artifact."""
+
+    name: str
+    sha256: str
+    code_hash: str
+    inputs: dict[str, str] = field(default_factory=dict)
+    params_hash: str = ''
+    created: str = ''
+    seconds: float = 0.0
+
+
+def find_project_root(start: Optional[PathLike] = None) -> Path:
+    """Nearest directory at or above ``start`` (default: cwd) holding ``pyproject.toml``.
+
+    Falls back to ``start`` itself, so the store still works outside a project.
+    """
+    here = Path(start or Path.cwd()).resolve()
+    for directory in (here, *here.parents):
+        if (directory / 'pyproject.toml').is_file():
+            return directory
+    return here
+
+
+def find_epoch_dir(start: Optional[PathLike] = None) -> Optional[Path]:
+    """The ``epoch_NNN`` directory containing ``start`` (default: cwd), if any."""
+    here = Path(start or Path.cwd()).resolve()
+    return next((d for d in (here, *here.parents) if d.name.startswith('epoch_')), None)
+
+
+def link_file(source: PathLike, target: PathLike) -> str:
+    """Make ``target`` a copy of ``source`` that shares its storage where possible.
+
+    Tries a reflink (copy-on-write clone), then a hardlink, then a plain copy.
+    ``target`` is replaced atomically.
+
+    Returns:
+        ``'reflink'``, ``'hardlink'`` or ``'copy'``.
+    """
+    source, target = Path(source), Path(target)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_name(f'.{target.name}.{os.getpid()}.{threading.get_ident()}.tmp')
+    with contextlib.suppress(FileNotFoundError):
+        tmp.unlink()
+    try:
+        mode = _clone(source, tmp)
+        os.replace(tmp, target)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            tmp.unlink()
+        raise
+    return mode
+
+
+def _clone(source: Path, target: Path) -> str:
+    if fcntl is not None:
+        try:
+            with open(source, 'rb') as src, open(target, 'wb') as dst:
+                fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+            return 'reflink'
+        except OSError:
+            with contextlib.suppress(FileNotFoundError):
+                target.unlink()
+    try:
+        os.link(source, target)
+        return 'hardlink'
+    except OSError:
+        shutil.copyfile(source, target)
+        return 'copy'
+
+
+class ArtifactStore:
+    """Content-addressed artifact store with provenance records.
+
+    Args:
+        root: Store directory. Defaults to ``.artifacts`` in the project root.
+        epoch_dir: Epoch that artifacts are linked into and recorded in the
+            manifest of. Defaults to the ``epoch_NNN`` directory containing the
+            working directory, which is where notebooks run. Without an epoch,
+            ``produce`` returns the stored (read-only) file itself.
+    """
+
+    def __init__(self, root: Optional[PathLike] = None, epoch_dir: Optional[PathLike] = None):
+        self.root = Path(root) if root is not None else find_project_root() / DEFAULT_STORE_DIR
+        self.epoch_dir = Path(epoch_dir) if epoch_dir is not None else find_epoch_dir()
+        self._hash_memo: Optional[dict[str, Any]] = None
+
+    def hash_inputs(self, inputs: Mapping[str, PathLike]) -> dict[str, str]:
+        """Content hash of each input file or directory.
+
+        Hashes are memoized by path, size and mtime in the store, so unchanged
+        large inputs are not re-read on every call.
+        """
+        memo = self._load_hash_memo()
+        hashes = {name: self._hash_path(Path(path), memo) for name, path in inputs.items()}
+        self._save_hash_memo()
+        return hashes
+
+    def lookup(self, key: str) -> Optional[ArtifactRecord]:
+        """The record stored under ``key``, if its file is still present."""
+        try:
+            with open(self._record_path(key)) as f:
+                record = ArtifactRecord(**json.load(f))
+        except (OSError, ValueError, TypeError):
+            return None
+        return record if self.object_path(record).is_file() else None
+
+    def object_path(self, record: ArtifactRecord) -> Path:
+        """Where the single stored copy of ``record``'s file lives."""
+        return self.root / 'objects' / record.sha256[:2] / f'{record.sha256}{Path(record.name).suffix}'
+
+    def produce(
+        self,
+        name: str,
+        func: Callable[..., Any],
+        inputs: Optional[Mapping[str, PathLike]] = None,
+        params: Optional[Mapping[str, Any]] = None,
+        force: bool = False,
+    ) -> Path:
+        """Return artifact ``name``, computing it only if nothing matching is stored.
+
+        Args:
+            name: File name of the artifact in the epoch, e.g. ``'features.parquet'``.
+            func: Called as ``func(output, **inputs, **params)`` and must write
+                the artifact to the ``output`` path.
+            inputs: Input files or directories by parameter name.
+            params: Other arguments to ``func``; they are part of the key.
+            force: Recompute even if a matching artifact is stored.
+
+        Returns:
+            The artifact's path in the epoch, or in the store without an epoch.
+        """
+        paths = {key: Path(path) for key, path in (inputs or {}).items()}
+        arguments = dict(params or {})
+        code_hash = hash_function(func)
+        input_hashes = self.hash_inputs(paths)
+        params_hash = hash_value(arguments)
+        # The name is part of the key: func sees the output path and may write
+        # different content for a different name or suffix (e.g. CSV vs JSON).
+        key = hash_value((name, code_hash, input_hashes, params_hash))
+
+        record = None if force else self.lookup(key)
+        if record is not None:
+            logger.info('Reusing artifact %s (%s)', name, record.sha256[:12])
+        else:
+            record = self._compute(name, func, paths, arguments, code_hash, input_hashes, params_hash)
+            self._write_json(self._record_path(key), asdict(record))
+        return self._materialize(name, record)
+
+    def _compute(
+        self,
+        name: str,
+        func: Callable[..., Any],
+        inputs: Mapping[str, Path],
+        params: Mapping[str, Any],
+        code_hash: str,
+        input_hashes: dict[str, str],
+        params_hash: str,
+    ) -> ArtifactRecord:
+        staging = self.root / 'tmp'
+        staging.mkdir(parents=True, exist_ok=True)
+        with tempfile.TemporaryDirectory(dir=staging) as tmp:
+            output = Path(tmp) / name
+            start = time.perf_counter()
+            func(output, **inputs, **params)
+            seconds = time.perf_counter() - start
+            if not output.is_file():
+                raise FileNotFoundError(f'{getattr(func, "__name__", func)} did not write {name}')
+            record = ArtifactRecord(
+                name=name,
+                sha256=hash_file(output),
+                code_hash=code_hash,
+                inputs=input_hashes,
+                params_hash=params_hash,
+                created=datetime.now(timezone.utc).isoformat(timespec='seconds'),
+                seconds=round(seconds, 3),
+            )
+            target = self.object_path(record)
+            if target.exists():
+                # Different code or inputs produced identical bytes; keep the one copy.
+                logger.info('Computed artifact %s in %.2fs; identical content already stored', name, seconds)
+            else:
+                target.parent.mkdir(parents=True, exist_ok=True)
+                os.chmod(output, _READ_ONLY)
+                os.replace(output, target)
+                logger.info('Computed artifact %s in %.2fs', name, seconds)
+        return record
+
+    def _materialize(self, name: str, record: ArtifactRecord) -> Path:
+        source = self.object_path(record)
+        if self.epoch_dir is None:
+            return source
+        target = self.epoch_dir / EPOCH_ARTIFACTS_DIR / name
+        manifest = self.manifest()
+        current = manifest.get(name)
+        if not (target.is_file() and current is not None and current['sha256'] == record.sha256):
+            mode = link_file(source, target)
+            logger.debug('Linked %s into %s (%s)', name, self.epoch_dir, mode)
+        manifest[name] = asdict(record)
+        self._write_json(self.epoch_dir / MANIFEST_NAME, manifest)
+        return target
+
+    def manifest(self) -> dict[str, dict[str, Any]]:
+        """The epoch's artifact records by name (empty without an epoch)."""
+        if self.epoch_dir is None:
+            return {}
+        try:
+            with open(self.epoch_dir / MANIFEST_NAME) as f:
+                manifest: dict[str, dict[str, Any]] = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return manifest
+
+    def _record_path(self, key: str) -> Path:
+        return self.root / 'records' / key[:2] / f'{key}.json'
+
+    def _hash_path(self, path: Path, memo: dict[str, Any]) -> str:
+        if path.is_dir():
+            files = sorted(p for p in path.rglob('*') if p.is_file())
+            return hash_value([(str(p.relative_to(path)), self._hash_path(p, memo)) for p in files])
+        info = path.stat()
+        memo_key = str(path.resolve())
+        signature = [info.st_size, info.st_mtime_ns]
+        cached = memo.get(memo_key)
+        if cached is not None and cached[:2] == signature:
+            return str(cached[2])
+        digest = hash_file(path)
+        memo[memo_key] = [*signature, digest]
+        return digest
+
+    def _load_hash_memo(self) -> dict[str, Any]:
+        if self._hash_memo is None:
+            try:
+                with open(self.root / 'hashes.json') as f:
+                    self._hash_memo = json.load(f)
+            except (OSError, ValueError):
+                self._hash_memo = {}
+        assert self._hash_memo is not None
+        return self._hash_memo
+
+    def _save_hash_memo(self) -> None:
+        if self._hash_memo is not None:
+            self._write_json(self.root / 'hashes.json', self._hash_memo)
+
+    def _write_json(self, path: Path, data: Any) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(data, f, indent=2, sort_keys=True)
+            os.replace(tmp_name, path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp_name)
+            raise
+
+
+_default_store: Optional[ArtifactStore] = None
+
+
+def get_store() -> ArtifactStore:
+    """The store for the project and epoch of the current working directory."""
+    global _default_store
+    epoch_dir = find_epoch_dir()
+    if _default_store is None or _default_store.epoch_dir != epoch_dir:
+        _default_store = ArtifactStore(epoch_dir=epoch_dir)
+    return _default_store
+
+
+def produce(
+    name: str,
+    func: Callable[..., Any],
+    inputs: Optional[Mapping[str, PathLike]] = None,
+    params: Optional[Mapping[str, Any]] = None,
+    force: bool = False,
+) -> Path:
+    """``ArtifactStore.produce`` on the default store. See ``ArtifactStore.produce``."""
+    return get_store().produce(name, func, inputs=inputs, params=params, force=force)
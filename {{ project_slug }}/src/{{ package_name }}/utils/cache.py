@@ -0,0 +1,343 @@
+"""Content-addressed disk memoization for expensive functions and notebook steps.
+
+Results are stored under the cache directory configured by ``AppSettings``
+(``cache_dir``/``cache_max_mb``) and keyed by a hash of the function's bytecode
+and its arguments, so they survive kernel restarts and are invalidated when the
+function body or an argument changes. ``pathlib.Path`` arguments are keyed by
+the size and modification time of the file (or directory tree) they name, so
+rewriting an input file invalidates the result; a plain string path is only
+compared as text. Helpers the function calls are not part of the key: editing
+one does not invalidate results.
+
+NumPy arrays are stored as ``.npy`` files; everything else (including pandas
+objects) is pickled with the highest protocol. Writes go through a temporary
+file and an atomic rename, and eviction is serialized with a lock file, so
+several processes can share one cache directory.
+
+Example:
+    >>> from pathlib import Path
+    >>> from {{ package_name }}.utils.cache import memoize
+    >>> @memoize
+    ... def build_features(path, window=7):
+    ...     ...
+    >>> orders = Path('data/orders.parquet')
+    >>> features = build_features(orders)  # computed
+    >>> features = build_features(orders)  # loaded from disk, until orders.parquet changes
+    >>> build_features.cache_stats()
+    CacheStats(hits=1, misses=1, writes=1, evictions=0, bytes_written=...)
+"""
+
+import contextlib
+import functools
+import inspect
+import logging
+import os
+import pickle
+import sys
+import tempfile
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Optional, Union
+
+from .hashing import hash_function, hash_value
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+_ENTRY_SUFFIXES = ('.pkl', '.npy')
+# Evict down to this fraction of the limit so every write does not trigger eviction.
+_EVICT_TARGET = 0.9
+# Temporary files older than this are left over from crashed writers.
+_STALE_TMP_SECONDS = 3600
+
+
+@dataclass
+class CacheStats:
+    """Hit/miss counters for a ``DiskCache`` in the current process."""
+
+    hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    evictions: int = 0
+    bytes_written: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from disk."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class DiskCache:
+    """Size-bounded, content-addressed cache directory.
+
+    Args:
+        directory: Where entries are stored. Created if missing.
+        max_bytes: Size limit. Least recently used entries are evicted once the
+            cache grows past it. None disables eviction.
+    """
+
+    def __init__(self, directory: Union[str, Path], max_bytes: Optional[int] = None):
+        self.directory = Path(directory).expanduser()
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+        self._stats_lock = threading.Lock()
+        self._size_estimate: Optional[int] = None
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def key_for(
+        self,
+        func: Callable[..., Any],
+        args: tuple[Any, ...] = (),
+        kwargs: Optional[dict[str, Any]] = None,
+        ignore: Iterable[str] = (),
+    ) -> str:
+        """Cache key of calling ``func(*args, **kwargs)``.
+
+        Arguments are bound to the function's signature with defaults applied, so
+        ``f(1)`` and ``f(x=1)`` share a key. Parameters named in ``ignore`` do not
+        contribute to the key.
+        """
+        kwargs = kwargs or {}
+        ignored = set(ignore)
+        try:
+            bound = inspect.signature(func).bind(*args, **kwargs)
+            bound.apply_defaults()
+            arguments: Any = {k: v for k, v in bound.arguments.items() if k not in ignored}
+        except (TypeError, ValueError):
+            arguments = (args, kwargs)
+        return hash_value((hash_function(func), arguments))
+
+    def lookup(self, key: str) -> tuple[bool, Any]:
+        """Load an entry.
+
+        Returns:
+            ``(True, value)`` on a hit, ``(False, None)`` on a miss.
+        """
+        for suffix in _ENTRY_SUFFIXES:
+            path = self._path(key, suffix)
+            try:
+                value = self._read(path)
+            except FileNotFoundError:
+                continue
+            except Exception:
+                logger.warning('Discarding unreadable cache entry %s', path, exc_info=True)
+                with contextlib.suppress(OSError):
+                    path.unlink()
+                continue
+            # Bump the mtime: eviction treats it as the last access time.
+            with contextlib.suppress(OSError):
+                os.utime(path)
+            self._count(hits=1)
+            return True, value
+        self._count(misses=1)
+        return False, None
+
+    def store(self, key: str, value: Any) -> None:
+        """Write an entry atomically, then evict if the cache is over its limit."""
+        np: Any = sys.modules.get('numpy')
+        # Exact type: subclasses such as masked arrays cannot round-trip through .npy.
+        is_array = np is not None and type(value) is np.ndarray and value.dtype != object
+        path = self._path(key, '.npy' if is_array else '.pkl')
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                if is_array:
+                    np.save(f, value, allow_pickle=False)
+                else:
+                    pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            size = os.path.getsize(tmp_name)
+            os.replace(tmp_name, path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp_name)
+            raise
+
+        self._count(writes=1, bytes_written=size)
+        if self.max_bytes is not None:
+            if self._size_estimate is not None:
+                self._size_estimate += size
+            if self._size_estimate is None or self._size_estimate > self.max_bytes:
+                self.evict()
+
+    def evict(self, max_bytes: Optional[int] = None) -> int:
+        """Delete least recently used entries until the cache fits ``max_bytes``.
+
+        Only one process evicts at a time; if another process holds the lock this
+        call returns immediately.
+
+        Returns:
+            Number of entries removed.
+        """
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        removed = 0
+        with self._lock() as acquired:
+            if not acquired:
+                return 0
+            entries = sorted(self._entries(), key=lambda entry: entry[1])
+            total = sum(size for _, _, size in entries)
+            if limit is not None and total > limit:
+                target = int(limit * _EVICT_TARGET)
+                for path, _, size in entries:
+                    if total <= target:
+                        break
+                    with contextlib.suppress(FileNotFoundError):
+                        path.unlink()
+                        removed += 1
+                    total -= size
+            self._size_estimate = total
+        if removed:
+            logger.debug('Evicted %d cache entries from %s', removed, self.directory)
+            self._count(evictions=removed)
+        return removed
+
+    def clear(self) -> None:
+        """Delete every entry."""
+        with self._lock(blocking=True):
+            for path, _, _ in self._entries():
+                with contextlib.suppress(FileNotFoundError):
+                    path.unlink()
+            self._size_estimate = 0
+
+    def size(self) -> int:
+        """Total bytes currently stored."""
+        return sum(size for _, _, size in self._entries())
+
+    def memoize(self, func: Optional[Callable[..., Any]] = None, *, ignore: Iterable[str] = ()) -> Any:
+        """Decorator that caches ``func``'s results in this cache. See ``memoize``."""
+        return memoize(func, cache=self, ignore=ignore)
+
+    def _path(self, key: str, suffix: str) -> Path:
+        return self.directory / key[:2] / f'{key}{suffix}'
+
+    def _read(self, path: Path) -> Any:
+        if path.suffix == '.npy':
+            np: Any = sys.modules.get('numpy')
+            if np is None:
+                import numpy as np
+            return np.load(path, allow_pickle=False)
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+
+    def _entries(self) -> list[tuple[Path, float, int]]:
+        entries = []
+        now = time.time()
+        for shard in self.directory.iterdir():
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                if entry.name.endswith('.tmp'):
+                    if now - stat.st_mtime > _STALE_TMP_SECONDS:
+                        with contextlib.suppress(OSError):
+                            os.unlink(entry.path)
+                    continue
+                if entry.name.endswith(_ENTRY_SUFFIXES):
+                    entries.append((Path(entry.path), stat.st_mtime, stat.st_size))
+        return entries
+
+    @contextlib.contextmanager
+    def _lock(self, blocking: bool = False) -> Iterator[bool]:
+        if fcntl is None:
+            yield True
+            return
+        with open(self.directory / '.lock', 'a') as f:
+            try:
+                fcntl.flock(f, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _count(self, **increments: int) -> None:
+        with self._stats_lock:
+            for name, amount in increments.items():
+                setattr(self.stats, name, getattr(self.stats, name) + amount)
+
+
+_default_cache: Optional[DiskCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def default_cache_dir() -> Path:
+    """``$XDG_CACHE_HOME/{{ package_name }}``, falling back to ``~/.cache/{{ package_name }}``."""
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join('~', '.cache')
+    return Path(base).expanduser() / '{{ package_name }}'
+
+
+def get_cache() -> DiskCache:
+    """Return the shared cache configured by ``cache_dir`` and ``cache_max_mb``."""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            from ..core.settings import get_settings
+
+            settings = get_settings().app_settings()
+            _default_cache = DiskCache(
+                settings.cache_dir or default_cache_dir(),
+                max_bytes=settings.cache_max_mb * 1024 * 1024,
+            )
+        return _default_cache
+
+
+def memoize(
+    func: Optional[Callable[..., Any]] = None,
+    *,
+    cache: Optional[DiskCache] = None,
+    ignore: Iterable[str] = (),
+) -> Any:
+    """Cache a function's results on disk, keyed by its bytecode and arguments.
+
+    Pass input files as ``pathlib.Path`` so that rewriting them invalidates the
+    result (strings are keyed by their text only). Functions called by ``func``
+    are not part of the key, so ``clear()`` the cache after changing one.
+
+    Can be used bare (``@memoize``) or with options (``@memoize(ignore=['verbose'])``).
+    The wrapped function gets ``cache_key(*args, **kwargs)`` and ``cache_stats()``
+    helpers for inspecting the cache it uses.
+
+    Args:
+        func: Function to wrap.
+        cache: Cache to use. Defaults to ``get_cache()``.
+        ignore: Names of parameters that do not affect the result, e.g. logging flags.
+    """
+    ignored = frozenset(ignore)
+
+    def decorate(f: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(f)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            store = cache or get_cache()
+            key = store.key_for(f, args, kwargs, ignore=ignored)
+            found, value = store.lookup(key)
+            if found:
+                return value
+            value = f(*args, **kwargs)
+            store.store(key, value)
+            return value
+
+        def cache_key(*args: Any, **kwargs: Any) -> str:
+            return (cache or get_cache()).key_for(f, args, kwargs, ignore=ignored)
+
+        # Resolved lazily so decorating at import time does not read the settings.
+        wrapper.cache_key = cache_key  # type: ignore[attr-defined]
+        wrapper.cache_stats = lambda: (cache or get_cache()).stats  # type: ignore[attr-defined]
+        return wrapper
+
+    if func is not None:
+        return decorate(func)
+    return decorate
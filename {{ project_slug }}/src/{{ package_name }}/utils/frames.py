@@ -0,0 +1,189 @@
+"""Shrink the memory footprint of pandas DataFrames.
+
+Warehouse extracts load as int64, float64 and object columns that usually
+need a fraction of that. ``compact`` applies conversions that never change a
+value:
+
+- integers are downcast to the smallest signed or unsigned type holding their range;
+- floats are downcast to float32 only when every value round-trips exactly;
+- string columns with few distinct values become categoricals;
+- numeric columns dominated by one value become sparse, when that is smaller.
+
+Nullable ``Int64``/``Float64`` columns are downcast within their family
+(``Int8``, ``Float32``...) so missing values stay ``pd.NA``; other numeric
+extension dtypes, such as pyarrow-backed ones, are left as they are.
+
+It returns the converted frame and a per-column report of bytes before and
+after. ``inplace=True`` converts one column at a time inside the original
+frame, so peak memory stays near the size of the frame plus one column.
+
+Requires the ``data`` extra (``pip install -e '.[data]'``).
+
+Example:
+    >>> from {{ package_name }}.utils.frames import compact
+    >>> df, report = compact(df)
+    >>> report.sort_values('saved', ascending=False).head()
+"""
+
+import logging
+from typing import Any, Optional
+
+try:
+    import numpy as np
+    import pandas as pd
+except ImportError as e:
+    raise ImportError(
+        "{{ package_name }}.utils.frames requires pandas; install it with pip install -e '.[data]'"
+    ) from e
+
+logger = logging.getLogger(__name__)
+
+# Strings become categorical when distinct values are at most this fraction of rows.
+DEFAULT_CATEGORICAL_THRESHOLD = 0.5
+# Numeric columns become sparse when their most common value fills at least this fraction of rows.
+DEFAULT_SPARSE_THRESHOLD = 0.9
+
+_REPORT_COLUMNS = ['column', 'dtype_before', 'dtype_after', 'bytes_before', 'bytes_after', 'saved']
+
+
+def _nbytes(series: 'pd.Series') -> int:
+    return int(series.memory_usage(index=False, deep=True))
+
+
+def _report_row(name: Any, series: 'pd.Series', converted: 'pd.Series') -> tuple[Any, ...]:
+    before = _nbytes(series)
+    after = before if converted is series else _nbytes(converted)
+    return (name, str(series.dtype), str(converted.dtype), before, after, before - after)
+
+
+def _report(rows: list[tuple[Any, ...]]) -> 'pd.DataFrame':
+    return pd.DataFrame(rows, columns=_REPORT_COLUMNS).set_index('column')
+
+
+def _downcast_numeric(series: 'pd.Series') -> 'pd.Series':
+    kind = series.dtype.kind
+    nullable = isinstance(series.array, (pd.arrays.IntegerArray, pd.arrays.FloatingArray))
+    if kind not in 'iuf' or not (nullable or isinstance(series.dtype, np.dtype)):
+        return series
+    if kind in 'iu':
+        if not series.count():
+            return series
+        downcast = 'unsigned' if series.min() >= 0 else 'integer'
+        # Nullable integers stay nullable (Int64 -> Int8, UInt16...).
+        return pd.to_numeric(series, downcast=downcast)
+    if series.dtype.itemsize > 4:
+        missing = series.isna().to_numpy()
+        values = series.to_numpy(dtype=np.float64, na_value=np.nan)[~missing]
+        narrow = values.astype(np.float32)
+        # Only when lossless: same values (NaN where NaN), no overflow to inf.
+        if np.array_equal(narrow.astype(values.dtype), values, equal_nan=True):
+            return series.astype('Float32' if nullable else np.float32)
+    return series
+
+
+def _to_categorical(series: 'pd.Series', threshold: float) -> 'pd.Series':
+    if series.dtype != object and not pd.api.types.is_string_dtype(series.dtype):
+        return series
+    if pd.api.types.infer_dtype(series, skipna=True) not in ('string', 'empty'):
+        return series
+    if len(series) and series.nunique(dropna=True) <= threshold * len(series):
+        return series.astype('category')
+    return series
+
+
+def _to_sparse(series: 'pd.Series', threshold: float) -> 'pd.Series':
+    # SparseDtype only takes numpy subtypes, so nullable columns stay dense.
+    if not isinstance(series.dtype, np.dtype) or series.dtype.kind not in 'iufb' or series.empty:
+        return series
+    counts = series.value_counts(dropna=False)
+    fill_value = counts.index[0]
+    if counts.iloc[0] < threshold * len(series):
+        return series
+    sparse = series.astype(pd.SparseDtype(series.dtype, fill_value))
+    return sparse if _nbytes(sparse) < _nbytes(series) else series
+
+
+def compact_series(
+    series: 'pd.Series',
+    categorical_threshold: float = DEFAULT_CATEGORICAL_THRESHOLD,
+    sparse_threshold: Optional[float] = DEFAULT_SPARSE_THRESHOLD,
+) -> 'pd.Series':
+    """Apply every safe conversion to one column. See ``compact``."""
+    if isinstance(series.dtype, (pd.CategoricalDtype, pd.SparseDtype)):
+        return series
+    converted = _to_categorical(series, categorical_threshold)
+    if converted is series:
+        converted = _downcast_numeric(series)
+        if sparse_threshold is not None:
+            converted = _to_sparse(converted, sparse_threshold)
+    return converted
+
+
+def compact(
+    df: 'pd.DataFrame',
+    inplace: bool = False,
+    categorical_threshold: float = DEFAULT_CATEGORICAL_THRESHOLD,
+    sparse_threshold: Optional[float] = DEFAULT_SPARSE_THRESHOLD,
+) -> tuple['pd.DataFrame', 'pd.DataFrame']:
+    """Convert columns to the smallest dtypes that hold the same values.
+
+    Args:
+        df: Frame to compact.
+        inplace: Replace columns of ``df`` one at a time instead of building a
+            new frame. Peak memory is then the frame plus one converted
+            column, rather than two frames.
+        categorical_threshold: Convert string columns whose distinct values
+            are at most this fraction of the rows.
+        sparse_threshold: Make numeric columns sparse when their most common
+            value fills at least this fraction of rows and the sparse form is
+            smaller. None disables sparse conversion.
+
+    Returns:
+        ``(frame, report)``, where ``frame`` is ``df`` itself when ``inplace``
+        and ``report`` has one row per column with ``dtype_before``,
+        ``dtype_after``, ``bytes_before``, ``bytes_after`` and ``saved``.
+    """
+    columns: dict[int, pd.Series] = {}
+    rows = []
+    for i, name in enumerate(df.columns):
+        series = df.iloc[:, i]
+        converted = compact_series(series, categorical_threshold, sparse_threshold)
+        rows.append(_report_row(name, series, converted))
+        if not inplace:
+            columns[i] = converted
+        elif converted is not series:
+            df.isetitem(i, converted)
+        del series, converted
+
+    report = _report(rows)
+    logger.info(
+        'Compacted %d columns from %d to %d bytes',
+        len(rows),
+        report['bytes_before'].sum(),
+        report['bytes_after'].sum(),
+    )
+    if inplace:
+        return df, report
+    result: Any = pd.concat(columns, axis=1) if columns else df.iloc[:, :0].copy()
+    result.columns = df.columns
+    result.index = df.index
+    return result, report
+
+
+def analyze(
+    df: 'pd.DataFrame',
+    categorical_threshold: float = DEFAULT_CATEGORICAL_THRESHOLD,
+    sparse_threshold: Optional[float] = DEFAULT_SPARSE_THRESHOLD,
+) -> 'pd.DataFrame':
+    """Report what ``compact`` would save without keeping any converted data.
+
+    Columns are converted and measured one at a time, so this needs little
+    more memory than the largest column.
+    """
+    rows = []
+    for i, name in enumerate(df.columns):
+        series = df.iloc[:, i]
+        rows.append(
+            _report_row(name, series, compact_series(series, categorical_threshold, sparse_threshold))
+        )
+    return _report(rows)
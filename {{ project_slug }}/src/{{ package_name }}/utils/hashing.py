@@ -0,0 +1,125 @@
+"""Stable content hashes for functions, values and files.
+
+These hashes key on-disk caches, so they only depend on content: the same
+function body or argument values hash the same way across kernel restarts.
+``Path`` values also carry the size and modification time of the files they
+name, so rewriting an input file changes the hash of the arguments naming it.
+"""
+
+import hashlib
+import pickle
+import sys
+import types
+from pathlib import Path
+from typing import Any, Callable, Union
+
+_CHUNK_SIZE = 1 << 20
+
+
+def hash_function(func: Callable[..., Any]) -> str:
+    """Hash a function by its qualified name and bytecode.
+
+    Nested functions, lambdas and comprehensions are included, so any change to
+    the function body changes the hash. Line-number-only changes (e.g. editing
+    code above the function) do not. Only the function's own code is covered:
+    helpers it calls are referenced by name, so editing a helper does not
+    change the hash.
+    """
+    func = getattr(func, '__wrapped__', func)
+    hasher = hashlib.sha256()
+    hasher.update(f'{sys.version_info[0]}.{sys.version_info[1]}'.encode())
+    hasher.update(f'{getattr(func, "__module__", "")}.{getattr(func, "__qualname__", "")}'.encode())
+    code = getattr(func, '__code__', None)
+    if code is None:
+        hasher.update(repr(func).encode())
+    else:
+        _update_code(hasher, code)
+    return hasher.hexdigest()
+
+
+def _update_code(hasher: Any, code: types.CodeType) -> None:
+    hasher.update(code.co_code)
+    hasher.update(repr(code.co_names).encode())
+    hasher.update(repr(code.co_varnames).encode())
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            _update_code(hasher, const)
+        else:
+            hasher.update(repr(const).encode())
+
+
+def hash_value(value: Any) -> str:
+    """Hash an arbitrary value by content.
+
+    NumPy arrays and pandas objects are hashed from their data buffers without
+    pickling; containers are hashed element by element; anything else falls
+    back to its pickle. A ``Path`` is hashed by its text and, when it exists,
+    the size and ``st_mtime_ns`` of the file (or of every file under the
+    directory). Strings are hashed as text even when they name a file.
+    """
+    hasher = hashlib.sha256()
+    _update_value(hasher, value)
+    return hasher.hexdigest()
+
+
+def _update_value(hasher: Any, value: Any) -> None:
+    np = sys.modules.get('numpy')
+    pd = sys.modules.get('pandas')
+
+    if value is None or isinstance(value, (bool, int, float, complex, str, bytes)):
+        hasher.update(f'{type(value).__name__}:{value!r}'.encode())
+    elif isinstance(value, Path):
+        hasher.update(f'path:{value}'.encode())
+        _update_path_state(hasher, value)
+    elif isinstance(value, (list, tuple)):
+        hasher.update(f'{type(value).__name__}[{len(value)}]'.encode())
+        for item in value:
+            _update_value(hasher, item)
+    elif isinstance(value, dict):
+        hasher.update(f'dict[{len(value)}]'.encode())
+        for key in sorted(value, key=repr):
+            _update_value(hasher, key)
+            _update_value(hasher, value[key])
+    elif isinstance(value, (set, frozenset)):
+        hasher.update(f'set[{len(value)}]'.encode())
+        for item in sorted(value, key=repr):
+            _update_value(hasher, item)
+    elif np is not None and isinstance(value, np.ndarray) and value.dtype != object:
+        hasher.update(f'ndarray:{value.dtype.str}:{value.shape}'.encode())
+        # Raw bytes via a uint8 view: the buffer protocol rejects datetime64/timedelta64.
+        hasher.update(np.ascontiguousarray(value).reshape(-1).view(np.uint8))
+    elif pd is not None and isinstance(value, (pd.DataFrame, pd.Series, pd.Index)):
+        hasher.update(f'{type(value).__name__}:{value.shape}'.encode())
+        if isinstance(value, pd.DataFrame):
+            hasher.update(repr(list(value.columns)).encode())
+            hasher.update(repr(list(value.dtypes.astype(str))).encode())
+        hasher.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+    else:
+        hasher.update(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def _update_path_state(hasher: Any, path: Path) -> None:
+    """Fold in size and mtime of ``path`` (a file, or each file under a directory), if it exists."""
+    if path.is_dir():
+        files = sorted(p for p in path.rglob('*') if p.is_file())
+    elif path.is_file():
+        files = [path]
+    else:
+        return
+    for file in files:
+        try:
+            info = file.stat()
+        except OSError:
+            continue
+        hasher.update(
+            f'{file.relative_to(path) if file != path else ""}:{info.st_size}:{info.st_mtime_ns}'.encode()
+        )
+
+
+def hash_file(path: Union[str, Path]) -> str:
+    """SHA-256 of a file's contents, read in 1 MiB chunks."""
+    hasher = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(_CHUNK_SIZE), b''):
+            hasher.update(chunk)
+    return hasher.hexdigest()
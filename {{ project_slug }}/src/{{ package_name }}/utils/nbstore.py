@@ -0,0 +1,259 @@
+"""Content-addressed store for large notebook outputs.
+
+Plots and HTML tables make notebooks megabytes large, which slows Jupyter,
+notebook tests, diffs and clones. ``strip_notebook`` moves every output above
+a size threshold into a blob store keyed by the SHA-256 of the output, so
+identical outputs are stored once, and leaves a small placeholder output in
+the notebook. ``restore_notebook`` puts the original outputs back.
+
+Blobs are gzip-compressed JSON under ``.nbstore/`` in the project root by
+default. The store is local: keep it out of git and restore before sharing a
+notebook with someone who does not have it.
+
+From the command line (also usable as a pre-commit hook)::
+
+    {{ project_slug }} outputs strip notebooks/epoch_003/*.ipynb
+    {{ project_slug }} outputs restore notebooks/epoch_003/2024-05-01_ab_eda.ipynb
+    {{ project_slug }} outputs report
+"""
+
+import contextlib
+import gzip
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from collections import defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+PathLike = Union[str, Path]
+
+# Outputs whose JSON is larger than this are externalized by default.
+DEFAULT_THRESHOLD = 100 * 1024
+DEFAULT_STORE_DIR = '.nbstore'
+
+# Key in a placeholder output's metadata that points at the stored blob.
+_REF_KEY = '{{ package_name }}.nbstore'
+
+
+@dataclass
+class NotebookSizes:
+    """Bytes of a notebook's outputs held inline and in the store.
+
+    ``moved_bytes`` and ``outputs_moved`` count what a strip moved (or, from
+    ``measure_notebook``, would move).
+    """
+
+    path: Path
+    inline_bytes: int = 0
+    stored_bytes: int = 0
+    moved_bytes: int = 0
+    outputs_moved: int = 0
+
+
+def _output_size(output: dict[str, Any]) -> int:
+    return len(json.dumps(output, separators=(',', ':')).encode())
+
+
+def _reference(output: dict[str, Any]) -> Optional[dict[str, Any]]:
+    ref = output.get('metadata', {}).get(_REF_KEY)
+    return ref if isinstance(ref, dict) else None
+
+
+class OutputStore:
+    """Deduplicated blob store for notebook outputs.
+
+    Args:
+        directory: Store location. Created on first write.
+    """
+
+    def __init__(self, directory: PathLike = DEFAULT_STORE_DIR):
+        self.directory = Path(directory)
+
+    def _path(self, digest: str) -> Path:
+        return self.directory / digest[:2] / f'{digest}.json.gz'
+
+    def put(self, output: dict[str, Any]) -> str:
+        """Store an output and return its digest. Existing blobs are not rewritten."""
+        data = json.dumps(output, sort_keys=True, separators=(',', ':')).encode()
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._path(digest)
+        if path.exists():
+            return digest
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(gzip.compress(data))
+            os.replace(tmp_name, path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp_name)
+            raise
+        return digest
+
+    def get(self, digest: str) -> dict[str, Any]:
+        """Load a stored output.
+
+        Raises:
+            KeyError: If the blob is not in this store.
+        """
+        try:
+            data = self._path(digest).read_bytes()
+        except FileNotFoundError:
+            raise KeyError(digest) from None
+        output: dict[str, Any] = json.loads(gzip.decompress(data))
+        return output
+
+
+def _load(path: Path) -> dict[str, Any]:
+    with open(path, encoding='utf-8') as f:
+        notebook: dict[str, Any] = json.load(f)
+    return notebook
+
+
+def _save(path: Path, notebook: dict[str, Any]) -> None:
+    # Same layout as Jupyter/nbformat so saving from Jupyter afterwards gives a small diff. Written to a
+    # temporary file and swapped in, so an interrupted save never leaves a half-written notebook whose
+    # outputs are already in the store.
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(notebook, f, indent=1, ensure_ascii=False, sort_keys=True)
+            f.write('\n')
+        if path.exists():
+            os.chmod(tmp_name, path.stat().st_mode & 0o7777)
+        os.replace(tmp_name, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp_name)
+        raise
+
+
+def _code_cells(notebook: dict[str, Any]) -> Iterable[dict[str, Any]]:
+    return (cell for cell in notebook.get('cells', []) if cell.get('cell_type') == 'code')
+
+
+def strip_notebook(
+    path: PathLike,
+    store: Optional[OutputStore] = None,
+    threshold: int = DEFAULT_THRESHOLD,
+) -> NotebookSizes:
+    """Move outputs larger than ``threshold`` bytes into ``store``.
+
+    The notebook is rewritten only if at least one output was moved.
+
+    Returns:
+        Inline and stored output bytes after stripping.
+    """
+    path = Path(path)
+    store = store or OutputStore()
+    notebook = _load(path)
+    sizes = NotebookSizes(path)
+    for cell in _code_cells(notebook):
+        outputs = cell.get('outputs', [])
+        for i, output in enumerate(outputs):
+            ref = _reference(output)
+            if ref is not None:
+                sizes.stored_bytes += ref['bytes']
+                continue
+            size = _output_size(output)
+            if size <= threshold:
+                sizes.inline_bytes += size
+                continue
+            digest = store.put(output)
+            outputs[i] = {
+                'output_type': 'display_data',
+                'data': {
+                    'text/plain': f'[{output.get("output_type")} output, {size:,} bytes, in {store.directory}]'
+                },
+                'metadata': {_REF_KEY: {'sha256': digest, 'bytes': size}},
+            }
+            sizes.stored_bytes += size
+            sizes.moved_bytes += size
+            sizes.outputs_moved += 1
+    if sizes.outputs_moved:
+        _save(path, notebook)
+        logger.info('Moved %d outputs out of %s', sizes.outputs_moved, path)
+    return sizes
+
+
+def restore_notebook(path: PathLike, store: Optional[OutputStore] = None) -> int:
+    """Replace placeholder outputs with the originals from ``store``.
+
+    Placeholders whose blob is missing are left in place with a warning.
+
+    Returns:
+        Number of outputs restored.
+    """
+    path = Path(path)
+    store = store or OutputStore()
+    notebook = _load(path)
+    restored = 0
+    for cell in _code_cells(notebook):
+        outputs = cell.get('outputs', [])
+        for i, output in enumerate(outputs):
+            ref = _reference(output)
+            if ref is None:
+                continue
+            try:
+                outputs[i] = store.get(ref['sha256'])
+            except KeyError:
+                logger.warning('Output %s of %s is not in %s', ref['sha256'][:12], path, store.directory)
+                continue
+            restored += 1
+    if restored:
+        _save(path, notebook)
+    return restored
+
+
+def measure_notebook(path: PathLike, threshold: int = DEFAULT_THRESHOLD) -> NotebookSizes:
+    """Like ``strip_notebook`` but only counts what would move; nothing is written."""
+    path = Path(path)
+    sizes = NotebookSizes(path)
+    for cell in _code_cells(_load(path)):
+        for output in cell.get('outputs', []):
+            ref = _reference(output)
+            if ref is not None:
+                sizes.stored_bytes += ref['bytes']
+                continue
+            size = _output_size(output)
+            sizes.inline_bytes += size
+            if size > threshold:
+                sizes.moved_bytes += size
+                sizes.outputs_moved += 1
+    return sizes
+
+
+def find_notebooks(paths: Iterable[PathLike]) -> list[Path]:
+    """Expand directories into the notebooks under them, skipping checkpoints."""
+    found: list[Path] = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            found.extend(p for p in sorted(path.rglob('*.ipynb')) if '.ipynb_checkpoints' not in p.parts)
+        elif path.suffix == '.ipynb':
+            found.append(path)
+    return found
+
+
+def summarize_by_epoch(sizes: Iterable[NotebookSizes], moved_label: str = 'saved') -> str:
+    """Table of inline, stored and moved output bytes per epoch directory."""
+    totals: dict[str, list[int]] = defaultdict(lambda: [0, 0, 0, 0])
+    for entry in sizes:
+        epoch = next((part for part in reversed(entry.path.parts[:-1]) if part.startswith('epoch_')), '-')
+        row = totals[epoch]
+        row[0] += entry.inline_bytes
+        row[1] += entry.stored_bytes
+        row[2] += entry.moved_bytes
+        row[3] += entry.outputs_moved
+    lines = [f'{"epoch":<12} {"inline":>12} {"in store":>12} {moved_label:>12} {"outputs":>8}']
+    for epoch in sorted(totals):
+        inline, stored, moved, count = totals[epoch]
+        lines.append(f'{epoch:<12} {inline:>12,} {stored:>12,} {moved:>12,} {count:>8}')
+    return '\n'.join(lines)
@@ -3,6 +3,7 @@
 import logging
 import sys
 from pathlib import Path
+from typing import Union
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -12,6 +13,8 @@ def setup_notebook(
     autoreload: bool = True,
     autoreload_mode: int = 2,
     add_project_root: bool = True,
+    profile: Union[bool, str, Path] = False,
+    trace_memory: bool = False,
 ) -> None:
     """Set up a Jupyter notebook with common configurations for the project.
 
@@ -20,6 +23,7 @@ def setup_notebook(
 
     1. IPython autoreload configuration for development
     2. Project root path setup for imports
+    3. Optional per-cell timing and memory profiling
 
     Args:
         autoreload: Whether to enable IPython autoreload. When enabled, modules
@@ -36,6 +40,13 @@ def setup_notebook(
             This ensures that imports from the package work correctly.
             Defaults to True.
 
+        profile: Record wall time, CPU time and RSS change of every cell. True
+            logs to ``.profiles/<notebook>.jsonl``; a path logs there instead.
+            See ``{{ package_name }}.utils.profiling``. Defaults to False.
+
+        trace_memory: With ``profile``, also record each cell's largest new
+            allocations using tracemalloc. Slows execution. Defaults to False.
+
     Examples:
         Basic usage with all defaults:
         >>> from {{ package_name }}.utils.notebook import setup_notebook
@@ -48,6 +59,12 @@ def setup_notebook(
         ...     add_project_root=True,
         ... )
 
+        Find the slowest cells:
+        >>> setup_notebook(profile=True)
+        >>> # ... run the notebook, then:
+        >>> from {{ package_name }}.utils.profiling import format_cells, hottest_cells
+        >>> print(format_cells(hottest_cells(n=5)))
+
     Notes:
         - The function includes error handling for missing dependencies
         - Warning messages are printed if features can't be enabled
@@ -72,4 +89,19 @@ def setup_notebook(
         current_file = Path(__file__)
         project_root = current_file.parent.parent.parent.parent
         if str(project_root) not in sys.path:
-            sys.path.append(str(project_root))
\ No newline at end of file
+            sys.path.append(str(project_root))
+
+    # Profile every cell if requested
+    if profile:
+        try:
+            from IPython import get_ipython
+
+            ipython = get_ipython()
+        except ImportError:
+            ipython = None
+        if ipython is None:
+            logger.warning('Not running under IPython, cell profiling not enabled')
+        else:
+            from .profiling import start_profiling
+
+            start_profiling(ipython, log_path=None if profile is True else profile, trace_memory=trace_memory)
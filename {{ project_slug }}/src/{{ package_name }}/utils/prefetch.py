@@ -0,0 +1,263 @@
+"""Overlap reading the next batch with computing on the current one.
+
+A loop such as ``for batch in load_batches(): model.partial_fit(batch)``
+leaves the CPU idle while each batch is read. ``prefetch`` wraps the
+iterable so that a background thread keeps up to ``depth`` items ready in a
+bounded queue while the loop body runs. With ``func``, the source yields
+cheap descriptions (paths, chunk ids) and ``func`` loads each one on a pool
+of ``workers`` threads; items still come out in source order.
+
+Exceptions raised by the source or by ``func`` are re-raised in the loop at
+the position they occurred, after which iteration stops. Leaving a ``with``
+block or calling ``close`` cancels the background work: no further items are
+read and queued loads that have not started are dropped.
+
+``stats`` tells whether the loop is I/O bound: ``stall_seconds`` is time the
+loop waited for an item that was not ready, and ``mean_depth`` is how many
+items were ready on average when one was requested. A high stall fraction
+with a mean depth near zero means reads are the bottleneck (raise ``workers``
+if they can run in parallel); a full queue means compute is.
+
+Example:
+    >>> from {{ package_name }} import io
+    >>> from {{ package_name }}.utils.prefetch import prefetch
+    >>> with prefetch(paths, depth=4, func=io.load, workers=2) as tables:
+    ...     for table in tables:
+    ...         score(table)
+    >>> tables.stats.stall_fraction
+    0.03
+"""
+
+import logging
+import queue
+import threading
+import time
+from collections.abc import Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Generic, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+DEFAULT_DEPTH = 2
+# How often a producer blocked on a full queue checks for cancellation.
+_POLL_SECONDS = 0.1
+# Stall fraction above which ``PrefetchStats.io_bound`` reports the loop as waiting on I/O.
+IO_BOUND_STALL_FRACTION = 0.2
+
+_END = object()
+
+
+@dataclass
+class PrefetchStats:
+    """Counters of a ``Prefetcher``; read ``Prefetcher.stats`` for a snapshot."""
+
+    items: int = 0
+    # Time the consumer spent waiting for an item that was not ready yet.
+    stall_seconds: float = 0.0
+    # Number of requests that had to wait.
+    stalls: int = 0
+    # Time the consumer spent between requests, i.e. in the loop body.
+    busy_seconds: float = 0.0
+    # Items queued (loaded or loading) when the consumer asked for the next one.
+    total_depth: int = 0
+    max_depth: int = 0
+
+    @property
+    def mean_depth(self) -> float:
+        return self.total_depth / self.items if self.items else 0.0
+
+    @property
+    def stall_fraction(self) -> float:
+        total = self.stall_seconds + self.busy_seconds
+        return self.stall_seconds / total if total else 0.0
+
+    @property
+    def io_bound(self) -> bool:
+        return self.stall_fraction > IO_BOUND_STALL_FRACTION
+
+
+class Prefetcher(Generic[T]):
+    """Iterator over ``source`` (mapped through ``func``) with up to ``depth`` items read ahead.
+
+    Args:
+        source: Items, or inputs for ``func``. Iterated on a background thread.
+        depth: Maximum number of items read ahead (queue size).
+        func: Optional loader applied to every source item on the worker threads.
+        workers: Threads running ``func`` concurrently. Ignored without ``func``.
+    """
+
+    def __init__(
+        self,
+        source: Iterable[Any],
+        depth: int = DEFAULT_DEPTH,
+        func: Optional[Callable[[Any], T]] = None,
+        workers: int = 1,
+    ):
+        if depth < 1:
+            raise ValueError(f'depth must be at least 1, got {depth}')
+        self._queue: queue.Queue[Any] = queue.Queue(maxsize=depth)
+        self._cancelled = threading.Event()
+        self._closed = False
+        self._stats = PrefetchStats()
+        self._last_yield: Optional[float] = None
+        self._executor = (
+            ThreadPoolExecutor(max_workers=workers, thread_name_prefix='{{ package_name }}-prefetch')
+            if func is not None
+            else None
+        )
+        # The thread holds no reference to the prefetcher, so an abandoned one is still collected.
+        self._thread = threading.Thread(
+            target=_produce,
+            args=(source, func, self._executor, self._queue, self._cancelled),
+            name='{{ package_name }}-prefetch',
+            daemon=True,
+        )
+        self._thread.start()
+
+    @property
+    def stats(self) -> PrefetchStats:
+        """Snapshot of the counters."""
+        return PrefetchStats(**vars(self._stats))
+
+    def __iter__(self) -> 'Prefetcher[T]':
+        return self
+
+    def __next__(self) -> T:
+        if self._closed:
+            raise StopIteration
+        start = time.perf_counter()
+        if self._last_yield is not None:
+            self._stats.busy_seconds += start - self._last_yield
+        depth = self._queue.qsize()
+        try:
+            entry = self._queue.get_nowait()
+            stalled = False
+        except queue.Empty:
+            entry = self._queue.get()
+            stalled = True
+        if entry is _END:
+            self.close()
+            raise StopIteration
+        assert isinstance(entry, Future)
+        stalled = stalled or not entry.done()
+        try:
+            value = entry.result()
+        except BaseException:
+            self.close()
+            raise
+        finally:
+            now = time.perf_counter()
+            if stalled:
+                self._stats.stalls += 1
+                self._stats.stall_seconds += now - start
+            self._last_yield = now
+        self._stats.items += 1
+        self._stats.total_depth += depth
+        self._stats.max_depth = max(self._stats.max_depth, depth)
+        return value
+
+    def close(self) -> None:
+        """Stop reading ahead and release the background threads. Safe to call twice."""
+        if self._closed:
+            return
+        self._closed = True
+        self._cancelled.set()
+        # Unblock the producer if it is waiting for space, and drop what it queued.
+        while True:
+            try:
+                entry = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(entry, Future):
+                entry.cancel()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        stats = self._stats
+        logger.debug(
+            'Prefetcher closed after %d items: %.2fs stalled in %d waits, mean depth %.1f',
+            stats.items,
+            stats.stall_seconds,
+            stats.stalls,
+            stats.mean_depth,
+        )
+
+    def __enter__(self) -> 'Prefetcher[T]':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def __del__(self) -> None:
+        if not getattr(self, '_closed', True):
+            self.close()
+
+
+def _put(records: queue.Queue[Any], entry: Any, cancelled: threading.Event) -> bool:
+    while not cancelled.is_set():
+        try:
+            records.put(entry, timeout=_POLL_SECONDS)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _produce(
+    source: Iterable[Any],
+    func: Optional[Callable[[Any], Any]],
+    executor: Optional[ThreadPoolExecutor],
+    records: queue.Queue[Any],
+    cancelled: threading.Event,
+) -> None:
+    """Background thread: queue a future per source item until the source ends or work is cancelled."""
+    iterator = iter(source)
+    try:
+        while not cancelled.is_set():
+            future: Future[Any]
+            try:
+                item = next(iterator)
+            except StopIteration:
+                break
+            except BaseException as e:
+                future = Future()
+                future.set_exception(e)
+                _put(records, future, cancelled)
+                return
+            if executor is not None and func is not None:
+                future = executor.submit(func, item)
+            else:
+                future = Future()
+                future.set_result(item)
+            if not _put(records, future, cancelled):
+                future.cancel()
+                return
+        _put(records, _END, cancelled)
+    finally:
+        close = getattr(iterator, 'close', None)
+        if close is not None:
+            close()
+
+
+def prefetch(
+    source: Iterable[Any],
+    depth: int = DEFAULT_DEPTH,
+    func: Optional[Callable[[Any], T]] = None,
+    workers: int = 1,
+) -> Prefetcher[T]:
+    """Iterate over ``source`` while a background thread reads up to ``depth`` items ahead.
+
+    Args:
+        source: Items to iterate over (e.g. a batch generator), or inputs for ``func``.
+        depth: Maximum number of items read ahead.
+        func: Loader applied to each source item on ``workers`` threads, in
+            source order (e.g. ``io.load`` over a list of paths).
+        workers: Threads running ``func`` concurrently.
+
+    Returns:
+        A ``Prefetcher``; use it as a context manager to cancel read-ahead when
+        the loop exits early.
+    """
+    return Prefetcher(source, depth=depth, func=func, workers=workers)
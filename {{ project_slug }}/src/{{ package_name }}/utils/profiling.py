@@ -0,0 +1,263 @@
+"""Per-cell timing and memory profiling for notebooks.
+
+``setup_notebook(profile=True)`` registers a ``CellProfiler`` on IPython's
+``pre_run_cell``/``post_run_cell`` events. Each executed cell appends one JSON
+line to ``.profiles/<notebook>.jsonl`` with its wall time, CPU time and change
+in resident memory, plus the largest new allocations when ``trace_memory`` is
+on. ``hottest_cells`` ranks the recorded cells, which shows what is worth
+optimizing before notebook code is moved into the package.
+
+Example:
+    >>> from {{ package_name }}.utils.notebook import setup_notebook
+    >>> setup_notebook(profile=True, trace_memory=True)
+    >>> # ... run the notebook ...
+    >>> from {{ package_name }}.utils.profiling import hottest_cells, format_cells
+    >>> print(format_cells(hottest_cells(n=5)))
+"""
+
+import hashlib
+import importlib
+import json
+import logging
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+PathLike = Union[str, Path]
+
+DEFAULT_PROFILE_DIR = Path('.profiles')
+# Frames kept per traced allocation; more gives better locations but slows every allocation.
+_TRACE_FRAMES = 1
+
+_active: Optional['CellProfiler'] = None
+_fallback_name: Optional[str] = None
+
+
+def current_rss() -> Optional[int]:
+    """Resident set size of this process in bytes, or None if it cannot be read."""
+    psutil: Any = sys.modules.get('psutil')
+    if psutil is None:
+        try:
+            psutil = importlib.import_module('psutil')
+        except ImportError:
+            pass
+    if psutil is not None:
+        return int(psutil.Process().memory_info().rss)
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def notebook_name() -> str:
+    """Best guess at the running notebook's file name, without the suffix.
+
+    When the front end does not say, the name is unique to this kernel (its id,
+    or start time and pid) so unrelated sessions do not share a profile log.
+    """
+    global _fallback_name
+    for variable in ('JPY_SESSION_NAME', '__vsc_ipynb_file__'):
+        value = os.environ.get(variable)
+        if value:
+            return Path(value).stem
+    main = sys.modules.get('__main__')
+    vsc_file = getattr(main, '__vsc_ipynb_file__', None)
+    if vsc_file:
+        return Path(vsc_file).stem
+    if _fallback_name is None:
+        _fallback_name = _kernel_name() or f'session-{datetime.now():%Y%m%d-%H%M%S}-{os.getpid()}'
+    return _fallback_name
+
+
+def _kernel_name() -> Optional[str]:
+    """``kernel-<id>`` from the running Jupyter kernel's connection file, if there is one."""
+    ipykernel: Any = sys.modules.get('ipykernel')
+    if ipykernel is None:
+        return None
+    try:
+        return Path(ipykernel.get_connection_file()).stem
+    except Exception:
+        return None
+
+
+class CellProfiler:
+    """Records wall time, CPU time and memory per executed cell.
+
+    Args:
+        log_path: JSON-lines file records are appended to.
+        trace_memory: Also record the top new allocations per cell with
+            ``tracemalloc``. Slows execution noticeably; enable when hunting
+            memory, not by default.
+        top: Number of allocation sites kept per cell.
+    """
+
+    def __init__(self, log_path: PathLike, trace_memory: bool = False, top: int = 5):
+        self.log_path = Path(log_path)
+        self.trace_memory = trace_memory
+        self.top = top
+        self._start: Optional[dict[str, Any]] = None
+        self._snapshot: Optional[tracemalloc.Snapshot] = None
+        self._ipython: Any = None
+        # Whether ``register`` started tracemalloc (and ``unregister`` should stop it).
+        self._started_tracing = False
+
+    def register(self, ipython: Any) -> None:
+        """Attach to an IPython shell's cell execution events."""
+        self.log_path.parent.mkdir(parents=True, exist_ok=True)
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start(_TRACE_FRAMES)
+            self._started_tracing = True
+        ipython.events.register('pre_run_cell', self.pre_run_cell)
+        ipython.events.register('post_run_cell', self.post_run_cell)
+        self._ipython = ipython
+
+    def unregister(self) -> None:
+        """Detach from the shell. Tracing is stopped only if ``register`` started it."""
+        if self._ipython is None:
+            return
+        self._ipython.events.unregister('pre_run_cell', self.pre_run_cell)
+        self._ipython.events.unregister('post_run_cell', self.post_run_cell)
+        self._ipython = None
+        if self._started_tracing and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self._started_tracing = False
+
+    def pre_run_cell(self, info: Any = None) -> None:
+        if self.trace_memory and tracemalloc.is_tracing():
+            self._snapshot = tracemalloc.take_snapshot()
+        self._start = {
+            'source': getattr(info, 'raw_cell', None),
+            'rss': current_rss(),
+            'cpu': time.process_time(),
+            'wall': time.perf_counter(),
+        }
+
+    def post_run_cell(self, result: Any = None) -> None:
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        start, self._start = self._start, None
+        if start is None:
+            return
+        rss = current_rss()
+        source = start['source'] or getattr(getattr(result, 'info', None), 'raw_cell', None) or ''
+        record: dict[str, Any] = {
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'execution_count': getattr(result, 'execution_count', None),
+            'first_line': next((line for line in source.splitlines() if line.strip()), ''),
+            'source_hash': hashlib.sha256(source.encode()).hexdigest()[:16],
+            'success': getattr(result, 'success', True),
+            'wall_s': round(wall - start['wall'], 6),
+            'cpu_s': round(cpu - start['cpu'], 6),
+            'rss_mb': None if rss is None else round(rss / 2**20, 1),
+            'rss_delta_mb': None
+            if rss is None or start['rss'] is None
+            else round((rss - start['rss']) / 2**20, 1),
+        }
+        if self._snapshot is not None and tracemalloc.is_tracing():
+            # Leave out the snapshots' own bookkeeping.
+            own = [tracemalloc.Filter(False, tracemalloc.__file__)]
+            after = tracemalloc.take_snapshot().filter_traces(own)
+            stats = after.compare_to(self._snapshot.filter_traces(own), 'lineno')
+            record['top_allocations'] = [
+                {'location': str(stat.traceback[0]), 'size_delta_kb': round(stat.size_diff / 1024, 1)}
+                for stat in stats[: self.top]
+                if stat.size_diff > 0
+            ]
+            self._snapshot = None
+        try:
+            with open(self.log_path, 'a') as f:
+                f.write(json.dumps(record) + '\n')
+        except OSError:
+            logger.warning('Could not write cell profile to %s', self.log_path, exc_info=True)
+
+
+def start_profiling(
+    ipython: Any,
+    log_path: Optional[PathLike] = None,
+    trace_memory: bool = False,
+    top: int = 5,
+) -> CellProfiler:
+    """Register a ``CellProfiler`` on ``ipython``, replacing any active one.
+
+    Args:
+        ipython: The running shell (``get_ipython()``).
+        log_path: Where records go. Defaults to ``.profiles/<notebook>.jsonl``.
+        trace_memory: Record top allocations per cell with ``tracemalloc``.
+        top: Allocation sites kept per cell.
+    """
+    global _active
+    stop_profiling()
+    if log_path is None:
+        log_path = DEFAULT_PROFILE_DIR / f'{notebook_name()}.jsonl'
+    profiler = CellProfiler(log_path, trace_memory=trace_memory, top=top)
+    profiler.register(ipython)
+    _active = profiler
+    logger.info('Profiling cells into %s', profiler.log_path)
+    return profiler
+
+
+def stop_profiling() -> None:
+    """Detach the active profiler, if any."""
+    global _active
+    if _active is not None:
+        _active.unregister()
+        _active = None
+
+
+def get_profiler() -> Optional[CellProfiler]:
+    """The profiler registered by ``setup_notebook(profile=...)``, if any."""
+    return _active
+
+
+def load_records(log_path: Optional[PathLike] = None) -> list[dict[str, Any]]:
+    """Read a profile log. Defaults to the active profiler's log."""
+    if log_path is None:
+        if _active is None:
+            raise ValueError('No active profiler; pass log_path')
+        log_path = _active.log_path
+    with open(log_path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def hottest_cells(
+    log_path: Optional[PathLike] = None,
+    n: int = 10,
+    key: str = 'wall_s',
+) -> list[dict[str, Any]]:
+    """The ``n`` most expensive cells in a profile log.
+
+    Runs of the same cell source are grouped and the latest run of each is
+    kept. Cells that merely start with the same line stay separate.
+
+    Args:
+        log_path: Profile log. Defaults to the active profiler's log.
+        n: Number of cells to return.
+        key: Record field to rank by, e.g. ``'wall_s'``, ``'cpu_s'`` or
+            ``'rss_delta_mb'``.
+    """
+    latest: dict[str, dict[str, Any]] = {}
+    for record in load_records(log_path):
+        # Logs written before source hashes were recorded fall back to the first line.
+        latest[record.get('source_hash') or record['first_line']] = record
+    ranked = sorted(latest.values(), key=lambda record: record.get(key) or 0, reverse=True)
+    return ranked[:n]
+
+
+def format_cells(records: list[dict[str, Any]]) -> str:
+    """Render profile records as a fixed-width table."""
+    lines = [f'{"cell":>5} {"wall s":>9} {"cpu s":>9} {"rss +MB":>9}  first line']
+    for record in records:
+        count = record.get('execution_count')
+        delta = record.get('rss_delta_mb')
+        lines.append(
+            f'{count if count is not None else "-":>5} {record["wall_s"]:>9.3f} {record["cpu_s"]:>9.3f} '
+            f'{delta if delta is not None else "-":>9}  {record["first_line"][:60]}'
+        )
+    return '\n'.join(lines)
@@ -0,0 +1,419 @@
+"""Hand large arrays and tables to process pool workers without pickling them.
+
+Passing a NumPy array or DataFrame to a process pool pickles it in the parent
+and unpickles a full copy in every worker. ``share_array`` and ``share_table``
+instead copy the data once into a ``multiprocessing.shared_memory`` block and
+return a small, picklable handle. In the worker, ``handle.open()`` maps the
+block and returns views onto it: no copy, and the pages are shared by every
+process.
+
+The process that shares the data owns the blocks, through a ``SharedArena``.
+Blocks are unlinked when the arena is closed (at the end of a ``with`` block,
+or at exit for the default arena). Workers only map blocks, so a worker that
+crashes leaves nothing behind: the kernel drops its mappings, and the owner's
+blocks stay valid for the pool that replaces it. If the owner itself is
+killed, the multiprocessing resource tracker unlinks its blocks.
+
+Views are read-only unless opened with ``writable=True``; concurrent writers
+must partition the data themselves.
+
+Fixed-width columns (numbers, booleans, datetimes) and the codes of
+categorical columns are shared. Other columns, such as strings or nullable
+``Int64`` columns, travel inside the handle as their pandas arrays and are
+pickled as usual, so they keep their dtype.
+
+Requires the ``data`` extra (``pip install -e '.[data]'``).
+
+Example:
+    >>> from {{ package_name }}.core.resources import get_process_pool
+    >>> from {{ package_name }}.utils.shared import SharedArena
+    >>> with SharedArena() as arena:
+    ...     features = arena.share_array(X)
+    ...     results = list(get_process_pool().map(score_rows, [features] * 8, range(8)))
+    >>> def score_rows(features, part):
+    ...     X = features.open()  # zero-copy view in the worker
+"""
+
+import atexit
+import logging
+import os
+import sys
+import threading
+from collections.abc import Mapping
+from dataclasses import dataclass
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Optional, Union
+
+try:
+    import numpy as np
+except ImportError as e:
+    raise ImportError(
+        "{{ package_name }}.utils.shared requires numpy; install it with pip install -e '.[data]'"
+    ) from e
+
+logger = logging.getLogger(__name__)
+
+# Column offsets inside a table's block are aligned to cache lines.
+ALIGNMENT = 64
+# dtype kinds that can be viewed straight from a buffer: bool, integers, floats, complex, timedelta, datetime.
+_FIXED_WIDTH_KINDS = frozenset('biufcmM')
+
+# Blocks this process has attached to, kept open while views onto them exist.
+_attached: dict[str, shared_memory.SharedMemory] = {}
+_attached_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class SharedArray:
+    """Handle to an array in a shared memory block; cheap to pickle.
+
+    Attributes:
+        block: Name of the shared memory block.
+        shape: Array shape.
+        dtype: NumPy dtype string (e.g. ``'<f8'``).
+        offset: Byte offset of the data in the block.
+    """
+
+    block: str
+    shape: tuple[int, ...]
+    dtype: str
+    offset: int = 0
+
+    @property
+    def nbytes(self) -> int:
+        return int(np.prod(self.shape, dtype=np.int64)) * np.dtype(self.dtype).itemsize
+
+    def open(self, writable: bool = False) -> 'np.ndarray':
+        """Map the block and return a view of the array (no copy)."""
+        return _view(_attach(self.block), self, writable)
+
+
+@dataclass(frozen=True)
+class SharedColumn:
+    """One column of a ``SharedTable``.
+
+    Attributes:
+        name: Column label.
+        data: The shared values, or the codes for a categorical column. None
+            when the values are carried in ``values``.
+        categories: Categories of a categorical column.
+        ordered: Whether the categorical is ordered.
+        values: Pandas array of a column that cannot be shared (pickled with the handle).
+        tz: Time zone of a timezone-aware datetime column, shared as UTC.
+    """
+
+    name: Any
+    data: Optional[SharedArray] = None
+    categories: Optional[Any] = None
+    ordered: bool = False
+    values: Optional[Any] = None
+    tz: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class SharedTable:
+    """Handle to a DataFrame, or a mapping of column name to array, in one shared memory block.
+
+    Attributes:
+        block: Name of the shared memory block.
+        columns: The columns, in order.
+        index: Index column for a DataFrame, or None for a default range index.
+        range_index: ``(start, stop, step)`` of a range index.
+        frame: Whether ``open`` returns a DataFrame (True) or a dict of arrays.
+    """
+
+    block: str
+    columns: tuple[SharedColumn, ...]
+    index: Optional[SharedColumn] = None
+    range_index: Optional[tuple[int, int, int]] = None
+    frame: bool = True
+
+    def open(self, writable: bool = False) -> Any:
+        """Map the block and rebuild the table on views of it (no copy of shared columns)."""
+        shm = _attach(self.block)
+        if not self.frame:
+            return {column.name: _view(shm, column.data, writable) for column in self.columns if column.data}
+
+        import pandas as pd
+
+        data = {column.name: _rebuild(shm, column, writable) for column in self.columns}
+        if self.index is not None:
+            index = pd.Index(_rebuild(shm, self.index, writable), name=self.index.name)
+        else:
+            index = pd.RangeIndex(*(self.range_index or (0, 0, 1)))
+        return pd.DataFrame(data, index=index, copy=False)
+
+
+SharedHandle = Union[SharedArray, SharedTable]
+
+
+def _view(shm: shared_memory.SharedMemory, handle: SharedArray, writable: bool) -> 'np.ndarray':
+    dtype = np.dtype(handle.dtype)
+    count = int(np.prod(handle.shape, dtype=np.int64))
+    # frombuffer keeps the buffer exported while the view lives, so ``shm.close()``
+    # raises BufferError instead of unmapping memory the view still points into.
+    buffer = shm.buf
+    assert buffer is not None, f'shared memory block {shm.name} is closed'
+    array = np.frombuffer(buffer, dtype=dtype, count=count, offset=handle.offset).reshape(handle.shape)
+    array.flags.writeable = writable
+    return array
+
+
+def _rebuild(shm: shared_memory.SharedMemory, column: SharedColumn, writable: bool) -> Any:
+    import pandas as pd
+
+    if column.data is None:
+        return column.values
+    values = _view(shm, column.data, writable)
+    if column.categories is not None:
+        return pd.Categorical.from_codes(values, categories=column.categories, ordered=column.ordered)
+    if column.tz is not None:
+        return pd.DatetimeIndex(values, copy=False).tz_localize('UTC').tz_convert(column.tz).array
+    return values
+
+
+def _open_block(name: str) -> shared_memory.SharedMemory:
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    # Before 3.13, attaching also registers the block with this process's
+    # resource tracker, which unlinks it when the process exits: a worker
+    # would delete the owner's data. Only the owner registers its blocks.
+    original = resource_tracker.register
+
+    def register(name: str, rtype: str) -> None:
+        if rtype != 'shared_memory':
+            original(name, rtype)
+
+    resource_tracker.register = register  # type: ignore[assignment]
+    try:
+        return shared_memory.SharedMemory(name=name)
+    finally:
+        resource_tracker.register = original
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    owned = _owned_block(name)
+    if owned is not None:
+        return owned
+    with _attached_lock:
+        shm = _attached.get(name)
+        if shm is None:
+            _release_unused()
+            shm = _attached[name] = _open_block(name)
+        return shm
+
+
+def _release_unused() -> None:
+    """Unmap attached blocks that no view refers to any more.
+
+    Long-lived pool workers see many blocks over their lifetime; ``close``
+    refuses while views are alive, so only blocks no longer in use are dropped.
+    """
+    for name, shm in list(_attached.items()):
+        try:
+            shm.close()
+        except BufferError:
+            continue
+        del _attached[name]
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+class SharedArena:
+    """Owner of shared memory blocks: creates them and unlinks them on ``close``.
+
+    Use as a context manager around the pool calls that read the data.
+    Workers may keep using views after ``close``; the memory is freed once
+    they unmap it.
+    """
+
+    def __init__(self) -> None:
+        self._blocks: dict[str, shared_memory.SharedMemory] = {}
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        _arenas.append(self)
+
+    def __enter__(self) -> 'SharedArena':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    @property
+    def nbytes(self) -> int:
+        """Total size of the blocks this arena owns."""
+        return sum(shm.size for shm in self._blocks.values())
+
+    def _create(self, size: int) -> shared_memory.SharedMemory:
+        # Zero-sized blocks are not allowed.
+        shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        with self._lock:
+            self._blocks[shm.name] = shm
+        logger.debug('Created shared memory block %s (%d bytes)', shm.name, shm.size)
+        return shm
+
+    def share_array(self, array: Any) -> SharedArray:
+        """Copy ``array`` into a new block and return its handle.
+
+        Args:
+            array: Anything ``np.asarray`` accepts with a fixed-width dtype.
+
+        Raises:
+            TypeError: If the dtype is not fixed-width (e.g. object arrays).
+        """
+        array = np.asarray(array)
+        if array.dtype.kind not in _FIXED_WIDTH_KINDS:
+            raise TypeError(
+                f'Cannot share arrays of dtype {array.dtype}; only fixed-width dtypes can be mapped'
+            )
+        shm = self._create(array.nbytes)
+        handle = SharedArray(shm.name, tuple(array.shape), array.dtype.str)
+        _view(shm, handle, writable=True)[...] = array
+        return handle
+
+    def share_table(self, table: Any) -> SharedTable:
+        """Copy a DataFrame, or a mapping of column name to array, into one new block.
+
+        Args:
+            table: A pandas DataFrame, or a mapping of names to equal-length arrays.
+
+        Raises:
+            TypeError: If a mapping holds an array that is not fixed-width.
+        """
+        if isinstance(table, Mapping):
+            arrays = {name: np.asarray(values) for name, values in table.items()}
+            for name, values in arrays.items():
+                if values.dtype.kind not in _FIXED_WIDTH_KINDS:
+                    raise TypeError(f'Cannot share column {name!r} of dtype {values.dtype}')
+            layout: list[tuple[Any, Any, dict[str, Any]]] = [
+                (name, values, {}) for name, values in arrays.items()
+            ]
+            index: Optional[tuple[Any, Any, dict[str, Any]]] = None
+            range_index = None
+        else:
+            import pandas as pd
+
+            layout = [_plan_column(name, table[name]) for name in table.columns]
+            index, range_index = None, None
+            if isinstance(table.index, pd.RangeIndex):
+                range_index = (table.index.start, table.index.stop, table.index.step)
+            else:
+                index = _plan_column(table.index.name, table.index.to_series())
+
+        # One block for the whole table, each shared column at an aligned offset.
+        offsets = []
+        size = 0
+        for _, values, _ in layout + ([index] if index else []):
+            offsets.append(size)
+            if values is not None:
+                size = _aligned(size + values.nbytes)
+        shm = self._create(size)
+
+        def place(plan: tuple[Any, Any, dict[str, Any]], offset: int) -> SharedColumn:
+            name, values, extra = plan
+            if values is None:
+                return SharedColumn(name, **extra)
+            data = SharedArray(shm.name, tuple(values.shape), values.dtype.str, offset)
+            _view(shm, data, writable=True)[...] = values
+            return SharedColumn(name, data, **extra)
+
+        columns = tuple(place(plan, offset) for plan, offset in zip(layout, offsets))
+        return SharedTable(
+            shm.name,
+            columns,
+            index=place(index, offsets[-1]) if index else None,
+            range_index=range_index,
+            frame=not isinstance(table, Mapping),
+        )
+
+    def release(self, handle: SharedHandle) -> None:
+        """Unlink the block behind ``handle`` before the arena is closed."""
+        with self._lock:
+            shm = self._blocks.pop(handle.block, None)
+        if shm is not None:
+            _unlink(shm)
+
+    def close(self) -> None:
+        """Unlink every block this arena owns."""
+        with self._lock:
+            blocks, self._blocks = list(self._blocks.values()), {}
+        # A forked child inherits the arena but does not own the blocks.
+        if os.getpid() != self._pid:
+            return
+        for shm in blocks:
+            _unlink(shm)
+        if self in _arenas:
+            _arenas.remove(self)
+
+
+def _plan_column(name: Any, series: Any) -> tuple[Any, Any, dict[str, Any]]:
+    """``(name, array to share or None, other SharedColumn fields)`` for a pandas column."""
+    import pandas as pd
+
+    dtype = series.dtype
+    if isinstance(dtype, pd.CategoricalDtype):
+        codes = np.asarray(series.cat.codes)
+        return name, codes, {'categories': dtype.categories, 'ordered': bool(dtype.ordered)}
+    if isinstance(dtype, pd.DatetimeTZDtype):
+        values = series.dt.tz_convert('UTC').dt.tz_localize(None).to_numpy()
+        return name, values, {'tz': str(dtype.tz)}
+    if isinstance(dtype, np.dtype) and dtype.kind in _FIXED_WIDTH_KINDS:
+        return name, series.to_numpy(), {}
+    logger.debug('Column %r of dtype %s is pickled with the handle, not shared', name, dtype)
+    # The pandas array keeps extension dtypes (Int64, string, ...) and their missing values;
+    # copied so later changes to the source frame do not show through in this process.
+    return name, None, {'values': series.array.copy()}
+
+
+def _unlink(shm: shared_memory.SharedMemory) -> None:
+    try:
+        shm.close()
+    except BufferError:
+        # Views in this process still use the mapping; it is unmapped once they are gone.
+        with _attached_lock:
+            _attached[shm.name] = shm
+    try:
+        shm.unlink()
+    except FileNotFoundError:
+        pass
+    logger.debug('Unlinked shared memory block %s', shm.name)
+
+
+_arenas: list[SharedArena] = []
+_default_arena: Optional[SharedArena] = None
+
+
+def _owned_block(name: str) -> Optional[shared_memory.SharedMemory]:
+    for arena in _arenas:
+        shm = arena._blocks.get(name)
+        if shm is not None:
+            return shm
+    return None
+
+
+def get_arena() -> SharedArena:
+    """Return the default arena, whose blocks are unlinked at interpreter exit."""
+    global _default_arena
+    if _default_arena is None:
+        _default_arena = SharedArena()
+    return _default_arena
+
+
+def share_array(array: Any) -> SharedArray:
+    """``share_array`` on the default arena."""
+    return get_arena().share_array(array)
+
+
+def share_table(table: Any) -> SharedTable:
+    """``share_table`` on the default arena."""
+    return get_arena().share_table(table)
+
+
+def _close_arenas() -> None:
+    for arena in list(_arenas):
+        arena.close()
+
+
+atexit.register(_close_arenas)
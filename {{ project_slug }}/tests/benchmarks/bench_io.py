@@ -0,0 +1,95 @@
+"""Benchmark memory-mapped dataset loading against naive CSV loading.
+
+Each case runs in a fresh interpreter so peak RSS is measured in isolation.
+Run directly with ``python tests/benchmarks/bench_io.py [rows]``.
+"""
+
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROWS = 2_000_000
+COLUMNS = 12
+
+# Every case loads two of the columns and reduces one of them, touching the data.
+CASES = {
+    'csv (pandas, all columns)': "import pandas as pd; df = pd.read_csv(PATH + '.csv'); total = df['c0'].sum()",
+    'csv (pandas, usecols)': (
+        "import pandas as pd; df = pd.read_csv(PATH + '.csv', usecols=['c0', 'c1']); total = df['c0'].sum()"
+    ),
+    'parquet (mmap, projected)': (
+        'from {{ package_name }} import io; import pyarrow.compute as pc; '
+        "t = io.load(PATH + '.parquet', columns=['c0', 'c1']); total = pc.sum(t['c0']).as_py()"
+    ),
+    'arrow ipc (mmap, zero-copy)': (
+        'from {{ package_name }} import io; import pyarrow.compute as pc; '
+        "t = io.load(PATH + '.arrow', columns=['c0', 'c1']); total = pc.sum(t['c0']).as_py()"
+    ),
+    'npy (mmap)': "from {{ package_name }} import io; a = io.load(PATH + '.npy'); total = a[:, 0].sum()",
+}
+
+RUNNER = """
+import json, resource, sys, time
+
+def peak_rss_mb():
+    # VmHWM is reset by exec; ru_maxrss on Linux carries over the parent's peak.
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+PATH = sys.argv[1]
+base = peak_rss_mb()
+start = time.perf_counter()
+{code}
+elapsed = time.perf_counter() - start
+peak = peak_rss_mb()
+print(json.dumps(dict(seconds=elapsed, peak_rss_mb=peak, delta_rss_mb=peak - base)))
+"""
+
+
+def make_dataset(directory: Path, rows: int = ROWS) -> str:
+    """Write the benchmark dataset as CSV and convert it to every supported format."""
+    import numpy as np
+    import pandas as pd
+
+    from {{ package_name }} import io
+
+    stem = directory / 'data'
+    rng = np.random.default_rng(0)
+    frame = pd.DataFrame({f'c{i}': rng.random(rows) for i in range(COLUMNS)})
+    frame.to_csv(f'{stem}.csv', index=False)
+    del frame
+    for suffix in ('.parquet', '.arrow', '.npy'):
+        io.convert_csv(f'{stem}.csv', f'{stem}{suffix}')
+    return str(stem)
+
+
+def run_case(code: str, stem: str) -> dict[str, float]:
+    script = RUNNER.format(code=code)
+    output = subprocess.run([sys.executable, '-c', script, stem], check=True, capture_output=True, text=True)
+    return json.loads(output.stdout)
+
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else ROWS
+    with tempfile.TemporaryDirectory() as tmp:
+        stem = make_dataset(Path(tmp), rows)
+        size_mb = Path(f'{stem}.csv').stat().st_size / 1e6
+        print(f'{rows:,} rows x {COLUMNS} columns, CSV {size_mb:,.0f} MB')
+        print(f'{"case":<30} {"load s":>8} {"peak RSS MB":>12} {"delta MB":>10}')
+        for name, code in CASES.items():
+            result = run_case(code, stem)
+            print(
+                f'{name:<30} {result["seconds"]:>8.3f} {result["peak_rss_mb"]:>12.1f} {result["delta_rss_mb"]:>10.1f}'
+            )
+
+
+if __name__ == '__main__':
+    main()
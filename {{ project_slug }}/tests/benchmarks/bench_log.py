@@ -0,0 +1,97 @@
+"""Microbenchmarks for the per-call overhead of logging in a tight loop.
+
+Compares a disabled DEBUG call written %-style with the same call written as
+an eager f-string, and an enabled INFO call logged synchronously to a file
+with the same call through the queue handler of ``core.log`` (the calling
+thread only enqueues; the listener writes) and through the per-call-site rate
+limit. Run directly with ``python tests/benchmarks/bench_log.py``.
+"""
+
+import logging
+import logging.handlers
+import os
+import queue
+import tempfile
+import timeit
+
+from {{ package_name }}.core.log import DEFAULT_TEXT_FORMAT, RateLimitFilter, TextFormatter, _QueueHandler
+
+CALLS = 10_000
+
+_log_dir = tempfile.TemporaryDirectory()
+
+
+def _file_handler(name: str) -> logging.Handler:
+    handler = logging.FileHandler(os.path.join(_log_dir.name, f'{name}.log'))
+    handler.setFormatter(TextFormatter(DEFAULT_TEXT_FORMAT))
+    return handler
+
+
+def _logger(name: str, handler: logging.Handler, level: int = logging.INFO) -> logging.Logger:
+    logger = logging.getLogger(f'bench_log.{name}')
+    logger.handlers[:] = [handler]
+    logger.setLevel(level)
+    logger.propagate = False
+    return logger
+
+
+_sync = _logger('sync', _file_handler('sync'))
+
+_records: 'queue.SimpleQueue[logging.LogRecord]' = queue.SimpleQueue()
+_listener = logging.handlers.QueueListener(_records, _file_handler('queued'))
+_listener.start()
+_queued = _logger('queued', _QueueHandler(_records))
+
+_limited_handler = _QueueHandler(_records)
+_limited_handler.addFilter(RateLimitFilter(rate=10))
+_limited = _logger('limited', _limited_handler)
+
+_disabled = _logger('disabled', logging.NullHandler(), level=logging.INFO)
+_row = {'customer_id': 12345, 'amount': 99.5, 'segment': 'enterprise'}
+
+
+def bench_disabled_debug_percent_style() -> None:
+    """DEBUG call below the logger level, arguments passed %-style."""
+    for i in range(CALLS):
+        _disabled.debug('Processed row %d: %s', i, _row)
+
+
+def bench_disabled_debug_fstring() -> None:
+    """The same disabled call, but the message is built eagerly."""
+    for i in range(CALLS):
+        _disabled.debug(f'Processed row {i}: {_row}')
+
+
+def bench_enabled_info_sync_file() -> None:
+    """INFO call written to a file in the calling thread."""
+    for i in range(CALLS):
+        _sync.info('Processed row %d: %s', i, _row)
+
+
+def bench_enabled_info_queued() -> None:
+    """INFO call through the queue handler; a listener thread writes the file."""
+    for i in range(CALLS):
+        _queued.info('Processed row %d: %s', i, _row)
+
+
+def bench_enabled_info_rate_limited() -> None:
+    """INFO call from one call site, limited to 10 records per second."""
+    for i in range(CALLS):
+        _limited.info('Processed row %d: %s', i, _row)
+
+
+def main() -> None:
+    for bench in (
+        bench_disabled_debug_percent_style,
+        bench_disabled_debug_fstring,
+        bench_enabled_info_sync_file,
+        bench_enabled_info_queued,
+        bench_enabled_info_rate_limited,
+    ):
+        best = min(timeit.repeat(bench, number=1, repeat=5))
+        print(f'{bench.__name__:<36} {best / CALLS * 1e9:>10,.0f} ns/call')
+    _listener.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""Microbenchmarks for settings loading and attribute access.
+
+Compares attribute reads through the ``Settings`` proxy with reads from the
+frozen ``SettingsSnapshot``, and measures startup and reload latency of the
+cached ``SettingsLoader``. Run directly with ``python tests/benchmarks/bench_settings.py``.
+"""
+
+import os
+import tempfile
+import timeit
+from pathlib import Path
+
+from {{ package_name }}.core.loader import SettingsLoader, clear_dotenv_cache
+from {{ package_name }}.core.settings import Settings
+
+READS = 10_000
+
+_env_dir = tempfile.TemporaryDirectory()
+ENV_FILE = Path(_env_dir.name) / '.env'
+ENV_FILE.write_text(
+    '{{ environment_prefix }}LOG_LEVEL=INFO\n' + ''.join(f'UNRELATED_{i}=value_{i}\n' for i in range(200))
+)
+
+_loader = SettingsLoader(ENV_FILE)
+_loader.load()
+
+
+def bench_proxy_attribute_read() -> None:
+    """Read ``log_level`` through the ``Settings`` proxy."""
+    settings = Settings.get_instance()
+    for _ in range(READS):
+        _ = settings.log_level
+
+
+def bench_snapshot_attribute_read() -> None:
+    """Read ``log_level`` from a frozen snapshot."""
+    snapshot = Settings.get_instance().snapshot()
+    for _ in range(READS):
+        _ = snapshot.log_level
+
+
+def bench_settings_cold_load() -> None:
+    """Load settings with an empty ``.env`` cache, as on process startup."""
+    clear_dotenv_cache()
+    SettingsLoader(ENV_FILE).load()
+
+
+def bench_settings_warm_load() -> None:
+    """Load settings in a fresh loader while the ``.env`` parse is cached."""
+    SettingsLoader(ENV_FILE).load()
+
+
+def bench_settings_reload_unchanged() -> None:
+    """Poll for changes when no source changed."""
+    _loader.refresh()
+
+
+def bench_settings_reload_changed() -> None:
+    """Reload after the ``.env`` file was touched."""
+    stat = ENV_FILE.stat()
+    os.utime(ENV_FILE, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    _loader.refresh()
+
+
+def main() -> None:
+    Settings.reset()
+    results = {}
+    for bench in (bench_proxy_attribute_read, bench_snapshot_attribute_read):
+        best = min(timeit.repeat(bench, number=10, repeat=5)) / 10
+        results[bench.__name__] = READS / best
+        print(f'{bench.__name__:<32} {READS / best:>14,.0f} reads/s')
+
+    speedup = results['bench_snapshot_attribute_read'] / results['bench_proxy_attribute_read']
+    print(f'snapshot speedup: {speedup:.1f}x')
+
+    for bench in (
+        bench_settings_cold_load,
+        bench_settings_warm_load,
+        bench_settings_reload_unchanged,
+        bench_settings_reload_changed,
+    ):
+        best = min(timeit.repeat(bench, number=100, repeat=5)) / 100
+        print(f'{bench.__name__:<32} {best * 1e6:>14,.1f} us')
+
+
+if __name__ == '__main__':
+    main()
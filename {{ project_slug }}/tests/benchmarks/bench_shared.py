@@ -0,0 +1,125 @@
+"""Benchmark handing large arrays and tables to process pool workers.
+
+Each benchmark maps the same reduction over a warm pool of worker processes,
+once passing the data itself (pickled and copied into every task) and once
+passing a ``utils.shared`` handle (the workers map one shared copy). Run
+directly with ``python tests/benchmarks/bench_shared.py``.
+"""
+
+import atexit
+import multiprocessing
+import pickle
+import timeit
+from concurrent.futures import ProcessPoolExecutor
+from functools import cache
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from {{ package_name }}.utils.shared import SharedArena, SharedArray, SharedTable
+
+ROWS = 4_000_000
+TASKS = 8
+WORKERS = 2
+
+
+@cache
+def _data() -> dict[str, Any]:
+    # Built on first use only: spawned workers import this module too.
+    rng = np.random.default_rng(0)
+    array = rng.random((ROWS, 4))
+    frame = pd.DataFrame(
+        {
+            'amount': rng.random(ROWS),
+            'quantity': rng.integers(0, 100, ROWS),
+            'segment': pd.Categorical(rng.choice(['consumer', 'enterprise', 'public'], ROWS)),
+        }
+    )
+    arena = SharedArena()
+    return {
+        'array': array,
+        'frame': frame,
+        'arena': arena,
+        'array_handle': arena.share_array(array),
+        'frame_handle': arena.share_table(frame),
+    }
+
+
+@cache
+def _pool() -> ProcessPoolExecutor:
+    return ProcessPoolExecutor(max_workers=WORKERS, mp_context=multiprocessing.get_context('spawn'))
+
+
+def _cleanup() -> None:
+    """Shut down the pool and unlink the shared blocks, if they were created."""
+    if _pool.cache_info().currsize:
+        _pool().shutdown()
+        _pool.cache_clear()
+    if _data.cache_info().currsize:
+        _data()['arena'].close()
+        _data.cache_clear()
+
+
+# The runner calls the bench_* functions without main(), so clean up at exit too.
+atexit.register(_cleanup)
+
+
+def _column_total(array: 'np.ndarray', part: int) -> float:
+    return float(array[:, part % array.shape[1]].sum())
+
+
+def _column_total_shared(handle: SharedArray, part: int) -> float:
+    return _column_total(handle.open(), part)
+
+
+def _segment_total(frame: 'pd.DataFrame', part: int) -> float:
+    segment = frame['segment'].cat.categories[part % 3]
+    return float(frame.loc[frame['segment'] == segment, 'amount'].sum())
+
+
+def _segment_total_shared(handle: SharedTable, part: int) -> float:
+    return _segment_total(handle.open(), part)
+
+
+def _map(func: Any, argument: Any) -> list[float]:
+    return list(_pool().map(func, [argument] * TASKS, range(TASKS)))
+
+
+def bench_array_pickled() -> None:
+    """Every task receives a pickled copy of a 128 MB array."""
+    _map(_column_total, _data()['array'])
+
+
+def bench_array_shared() -> None:
+    """Every task receives a handle and views the array in shared memory."""
+    _map(_column_total_shared, _data()['array_handle'])
+
+
+def bench_frame_pickled() -> None:
+    """Every task receives a pickled copy of a DataFrame with numeric and categorical columns."""
+    _map(_segment_total, _data()['frame'])
+
+
+def bench_frame_shared() -> None:
+    """Every task receives a handle and rebuilds the DataFrame on shared memory."""
+    _map(_segment_total_shared, _data()['frame_handle'])
+
+
+def main() -> None:
+    try:
+        data = _data()
+        for name in ('array', 'frame'):
+            pickled = len(pickle.dumps(data[name], protocol=pickle.HIGHEST_PROTOCOL))
+            handle = len(pickle.dumps(data[f'{name}_handle'], protocol=pickle.HIGHEST_PROTOCOL))
+            print(f'{name}: {pickled / 1e6:,.1f} MB pickled vs {handle:,} bytes per handle')
+        _map(_column_total_shared, data['array_handle'])  # start the workers
+        for bench in (bench_array_pickled, bench_array_shared, bench_frame_pickled, bench_frame_shared):
+            best = min(timeit.repeat(bench, number=1, repeat=3))
+            print(f'{bench.__name__:<24} {best * 1e3:>10,.1f} ms for {TASKS} tasks')
+    finally:
+        _cleanup()
+
+
+if __name__ == '__main__':
+    main()
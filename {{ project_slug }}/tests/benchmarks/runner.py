@@ -0,0 +1,218 @@
+"""Benchmark runner with stored baselines and regression gating.
+
+Collects every module-level ``bench_*`` function from the ``bench_*.py``
+files next to this one, times each with warmup and repeated rounds, and
+stores the results in ``.benchmarks/results.json`` keyed by git commit.
+The run fails when a benchmark's median is slower than the baseline's by more
+than the threshold. The baseline is the most recent stored run of another
+commit that passed this gate, or the commit given with ``--baseline``; a run
+that regressed is stored but never becomes the baseline, so a slowdown cannot
+be accepted just by running the benchmarks twice.
+
+Run with ``angreal test bench`` or ``python tests/benchmarks/runner.py``.
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+BENCH_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = BENCH_DIR.parent.parent
+RESULTS_FILE = PROJECT_ROOT / '.benchmarks' / 'results.json'
+
+DEFAULT_THRESHOLD = 0.20
+DEFAULT_WARMUP = 3
+DEFAULT_REPEAT = 7
+# Each timed round runs the benchmark enough times to take at least this long.
+MIN_ROUND_SECONDS = 0.05
+
+
+def _git(*args: str) -> Optional[str]:
+    try:
+        result = subprocess.run(['git', *args], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def current_commit() -> tuple[str, bool]:
+    """HEAD's commit hash (``'unknown'`` outside git) and whether the tree has local changes."""
+    commit = _git('rev-parse', 'HEAD') or 'unknown'
+    dirty = bool(_git('status', '--porcelain', '--untracked-files=no'))
+    return commit, dirty
+
+
+def collect(pattern: Optional[str] = None) -> dict[str, Callable[[], Any]]:
+    """``module.function`` -> benchmark, for every ``bench_*`` function found."""
+    if str(BENCH_DIR) not in sys.path:
+        sys.path.insert(0, str(BENCH_DIR))
+    benchmarks: dict[str, Callable[[], Any]] = {}
+    for path in sorted(BENCH_DIR.glob('bench_*.py')):
+        spec = importlib.util.spec_from_file_location(path.stem, path)
+        assert spec is not None and spec.loader is not None
+        module = importlib.util.module_from_spec(spec)
+        # Registered before running so its functions pickle by reference, e.g. for process pools.
+        sys.modules[spec.name] = module
+        spec.loader.exec_module(module)
+        for name, func in vars(module).items():
+            if name.startswith('bench_') and callable(func) and func.__module__ == module.__name__:
+                bench_id = f'{path.stem}.{name}'
+                if pattern is None or pattern in bench_id:
+                    benchmarks[bench_id] = func
+    return benchmarks
+
+
+def measure(
+    func: Callable[[], Any], warmup: int = DEFAULT_WARMUP, repeat: int = DEFAULT_REPEAT
+) -> dict[str, float]:
+    """Time ``func`` after ``warmup`` calls; returns per-call seconds statistics."""
+    for _ in range(warmup):
+        func()
+    # Calibrate calls per round so timer resolution does not dominate fast benchmarks.
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        if time.perf_counter() - start >= MIN_ROUND_SECONDS or number >= 1 << 20:
+            break
+        number *= 2
+    rounds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        rounds.append((time.perf_counter() - start) / number)
+    return {
+        'min': min(rounds),
+        'median': statistics.median(rounds),
+        'stdev': statistics.stdev(rounds) if len(rounds) > 1 else 0.0,
+        'calls_per_round': number,
+        'rounds': repeat,
+    }
+
+
+def load_results(path: Path = RESULTS_FILE) -> dict[str, Any]:
+    try:
+        with open(path) as f:
+            results: dict[str, Any] = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return results
+
+
+def save_results(results: dict[str, Any], path: Path = RESULTS_FILE) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+    with os.fdopen(fd, 'w') as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+    os.replace(tmp_name, path)
+
+
+def find_baseline(stored: dict[str, Any], commit: str, ref: Optional[str] = None) -> Optional[str]:
+    """Commit to compare against: ``ref`` resolved through git, else the latest other passing run."""
+    if ref is not None:
+        resolved = _git('rev-parse', ref) or ref
+        return resolved if resolved in stored else None
+    # Runs stored before the 'passed' flag existed count as passing.
+    others = [c for c in stored if c != commit and stored[c].get('passed', True)]
+    return max(others, key=lambda c: stored[c]['timestamp']) if others else None
+
+
+def compare(
+    current: dict[str, dict[str, float]],
+    baseline: dict[str, dict[str, float]],
+    threshold: float,
+) -> list[tuple[str, float, float, float, bool]]:
+    """Rows of (benchmark, baseline median, current median, ratio, regressed)."""
+    rows = []
+    for bench_id, stats in current.items():
+        if bench_id not in baseline:
+            continue
+        before = baseline[bench_id]['median']
+        ratio = stats['median'] / before if before else float('inf')
+        rows.append((bench_id, before, stats['median'], ratio, ratio > 1 + threshold))
+    return rows
+
+
+def _format_seconds(seconds: float) -> str:
+    for unit, scale in (('s', 1.0), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale:
+            return f'{seconds / scale:.2f} {unit}'
+    return f'{seconds / 1e-9:.0f} ns'
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('-k', '--filter', help='only run benchmarks whose id contains this text')
+    parser.add_argument(
+        '--threshold',
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help='fail if a median is this fraction slower than the baseline (default: 0.20)',
+    )
+    parser.add_argument(
+        '--baseline', help='git ref to compare against (default: latest passing run of another commit)'
+    )
+    parser.add_argument('--warmup', type=int, default=DEFAULT_WARMUP)
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT)
+    parser.add_argument('--no-save', action='store_true', help='do not record this run')
+    args = parser.parse_args(argv)
+
+    benchmarks = collect(args.filter)
+    if not benchmarks:
+        print('No benchmarks found.')
+        return 0
+
+    commit, dirty = current_commit()
+    results = {}
+    for bench_id, func in benchmarks.items():
+        results[bench_id] = stats = measure(func, warmup=args.warmup, repeat=args.repeat)
+        print(
+            f'{bench_id:<56} {_format_seconds(stats["median"]):>10} (+/- {_format_seconds(stats["stdev"])})'
+        )
+
+    stored = load_results()
+    baseline = find_baseline(stored, commit, args.baseline)
+    regressed = []
+    if baseline is None:
+        print('\nNo baseline to compare against.')
+    else:
+        print(f'\nCompared with {baseline[:12]} (threshold {args.threshold:.0%}):')
+        for bench_id, before, after, ratio, slower in compare(
+            results, stored[baseline]['results'], args.threshold
+        ):
+            flag = 'REGRESSED' if slower else ''
+            print(
+                f'{bench_id:<56} {_format_seconds(before):>10} -> {_format_seconds(after):>10} {ratio:>6.2f}x {flag}'
+            )
+            if slower:
+                regressed.append(bench_id)
+
+    if not args.no_save:
+        stored[commit] = {
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'dirty': dirty,
+            'python': sys.version.split()[0],
+            'passed': not regressed,
+            'results': results,
+        }
+        save_results(stored)
+
+    if regressed:
+        print(f'\n{len(regressed)} benchmarks regressed by more than {args.threshold:.0%}.')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,110 @@
+import os
+
+import pytest
+
+from {{ package_name }}.core import loader as loader_module
+from {{ package_name }}.core.config import LogLevel
+from {{ package_name }}.core.loader import SettingsLoader, SettingsWatcher, clear_dotenv_cache
+
+PREFIX = '{{ environment_prefix }}'
+
+
+@pytest.fixture
+def parses(tmp_path, monkeypatch):
+    """every .env parse, with a clean environment and parse cache"""
+    monkeypatch.chdir(tmp_path)
+    for key in list(os.environ):
+        if key.startswith(PREFIX):
+            monkeypatch.delenv(key)
+    clear_dotenv_cache()
+    calls = []
+    dotenv_values = loader_module.dotenv_values
+
+    def counting(path):
+        calls.append(path)
+        return dotenv_values(path)
+
+    monkeypatch.setattr(loader_module, 'dotenv_values', counting)
+    yield calls
+    clear_dotenv_cache()
+
+
+def _write_env(path, text, mtime_ns):
+    path.write_text(text)
+    # Pin the mtime so an edit within the filesystem's timestamp resolution still counts.
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_unchanged_sources_return_cached_settings(tmp_path, parses):
+    """without a change refresh keeps the same object and does not re-parse .env"""
+    _write_env(tmp_path / '.env', f'{PREFIX}LOG_LEVEL=DEBUG\n', 1_000_000_000)
+    loader = SettingsLoader(tmp_path / '.env', PREFIX)
+    settings = loader.load()
+    assert settings.log_level == LogLevel.DEBUG
+    assert len(parses) == 1
+
+    assert loader.refresh() is False
+    assert loader.settings is settings
+    # Another loader of the same file shares the parsed result.
+    assert SettingsLoader(tmp_path / '.env', PREFIX).load().log_level == LogLevel.DEBUG
+    assert len(parses) == 1
+
+
+def test_edited_dotenv_triggers_reload(tmp_path, parses):
+    """a new mtime or size of .env rebuilds the settings"""
+    env = tmp_path / '.env'
+    _write_env(env, f'{PREFIX}LOG_LEVEL=DEBUG\n', 1_000_000_000)
+    loader = SettingsLoader(env, PREFIX)
+    loader.load()
+
+    _write_env(env, f'{PREFIX}LOG_LEVEL=ERROR\n', 2_000_000_000)
+    assert loader.refresh() is True
+    assert loader.settings.log_level == LogLevel.ERROR
+    assert len(parses) == 2
+
+    env.unlink()
+    assert loader.refresh() is True
+    assert loader.settings.log_level == LogLevel.INFO
+
+
+def test_changed_prefixed_variable_triggers_reload(tmp_path, parses, monkeypatch):
+    """only variables with the prefix are watched, and they override .env"""
+    _write_env(tmp_path / '.env', f'{PREFIX}LOG_LEVEL=DEBUG\n', 1_000_000_000)
+    loader = SettingsLoader(tmp_path / '.env', PREFIX)
+    settings = loader.load()
+
+    monkeypatch.setenv('UNRELATED_SETTING', 'x')
+    assert loader.refresh() is False
+    assert loader.settings is settings
+
+    monkeypatch.setenv(f'{PREFIX}LOG_LEVEL', 'warning')
+    assert loader.refresh() is True
+    assert loader.settings.log_level == LogLevel.WARNING
+    assert len(parses) == 1
+
+
+def test_overrides_survive_refresh(tmp_path, parses, monkeypatch):
+    """load overrides win over the environment on later refreshes"""
+    loader = SettingsLoader(tmp_path / '.env', PREFIX)
+    loader.load(log_level='CRITICAL')
+    monkeypatch.setenv(f'{PREFIX}LOG_LEVEL', 'DEBUG')
+    assert loader.refresh() is False
+    assert loader.settings.log_level == LogLevel.CRITICAL
+
+
+def test_watcher_poll_reports_changes(tmp_path, parses, monkeypatch):
+    """poll notifies on a change and keeps the old settings when the new ones are invalid"""
+    loader = SettingsLoader(tmp_path / '.env', PREFIX)
+    loader.load()
+    seen = []
+    watcher = SettingsWatcher(loader, seen.append)
+
+    assert watcher.poll() is False
+    monkeypatch.setenv(f'{PREFIX}LOG_LEVEL', 'ERROR')
+    assert watcher.poll() is True
+    assert [settings.log_level for settings in seen] == [LogLevel.ERROR]
+
+    monkeypatch.setenv(f'{PREFIX}LOG_LEVEL', 'NOT_A_LEVEL')
+    assert watcher.poll() is False
+    assert loader.settings.log_level == LogLevel.ERROR
+    assert len(seen) == 1
@@ -0,0 +1,113 @@
+import json
+import logging
+import multiprocessing
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from {{ package_name }}.core import log
+from {{ package_name }}.core.config import AppSettings
+from {{ package_name }}.core.log import (
+    JsonFormatter,
+    RateLimitFilter,
+    TextFormatter,
+    configure_logging,
+    configure_worker_logging,
+    shutdown_logging,
+    worker_log_config,
+)
+
+
+@pytest.fixture(autouse=True)
+def restore_root_logger():
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+    yield
+    shutdown_logging()
+    root.handlers[:] = handlers
+    root.setLevel(level)
+
+
+def _record(line=10, msg='tick', exc_info=None, **extra):
+    record = logging.LogRecord('app', logging.INFO, 'app.py', line, msg, None, exc_info)
+    record.__dict__.update(extra)
+    return record
+
+
+def _worker_log(message):
+    logging.getLogger('worker').warning(message)
+
+
+def test_rate_limit_drops_excess_and_reports_count(monkeypatch):
+    """records past the limit are dropped and counted on the next record let through"""
+    now = [100.0]
+    monkeypatch.setattr(log.time, 'monotonic', lambda: now[0])
+    limiter = RateLimitFilter(rate=1, burst=2)
+
+    assert [limiter.filter(_record()) for _ in range(5)] == [True, True, False, False, False]
+    assert limiter.filter(_record(line=20))
+
+    now[0] += 1.0
+    passed = _record()
+    assert limiter.filter(passed)
+    assert passed.suppressed == 3
+    assert 'tick (3 similar messages suppressed)' in TextFormatter('%(message)s').format(passed)
+
+    now[0] += 1.0
+    quiet = _record()
+    assert limiter.filter(quiet)
+    assert not hasattr(quiet, 'suppressed')
+
+
+def test_json_formatter_includes_extra_and_exception():
+    """extra fields and the traceback end up in the JSON object"""
+    try:
+        raise ValueError('bad row')
+    except ValueError:
+        exc_info = sys.exc_info()
+    entry = json.loads(JsonFormatter().format(_record(exc_info=exc_info, rows=3, path=None, suppressed=2)))
+    assert entry['message'] == 'tick'
+    assert (entry['level'], entry['logger']) == ('INFO', 'app')
+    assert (entry['rows'], entry['path'], entry['suppressed']) == (3, None, 2)
+    assert 'ValueError: bad row' in entry['exception']
+
+
+def test_json_log_file_through_queue(tmp_path):
+    """records logged through the queue are written as JSON with extras and exception text"""
+    log_file = tmp_path / 'app.jsonl'
+    configure_logging(AppSettings(log_format='json', log_file=log_file), level=logging.INFO)
+    logger = logging.getLogger('app')
+    items = ['a']
+    try:
+        raise KeyError('missing')
+    except KeyError:
+        logger.exception('Loaded %s', items, extra={'stage': 'load'})
+    items.append('b')
+    shutdown_logging()
+
+    [entry] = [json.loads(line) for line in log_file.read_text().splitlines()]
+    assert entry['message'] == "Loaded ['a']"
+    assert entry['stage'] == 'load'
+    assert "KeyError: 'missing'" in entry['exception']
+
+
+def test_reconfiguring_keeps_worker_queues_drained(tmp_path):
+    """a pool created before configure_logging is called again still gets its records written"""
+    first, second = tmp_path / 'first.log', tmp_path / 'second.log'
+    configure_logging(AppSettings(log_file=first), text_format='%(name)s %(message)s')
+    context = multiprocessing.get_context('spawn')
+    config = worker_log_config('spawn')
+    assert config is not None
+    with ProcessPoolExecutor(
+        1, mp_context=context, initializer=configure_worker_logging, initargs=config
+    ) as pool:
+        pool.submit(_worker_log, 'before').result()
+        configure_logging(AppSettings(log_file=second), text_format='%(name)s %(message)s')
+        pool.submit(_worker_log, 'after').result()
+    shutdown_logging()
+
+    # Worker records reach the parent asynchronously, so 'before' may be written by either listener.
+    written = first.read_text() + second.read_text()
+    assert written.count('worker before') == 1
+    assert 'worker after' in second.read_text()
@@ -0,0 +1,118 @@
+import os
+import sys
+import types
+
+import pytest
+
+from {{ package_name }}.core import resources
+from {{ package_name }}.core.config import AppSettings
+from {{ package_name }}.core.resources import (
+    get_process_pool,
+    get_thread_pool,
+    shutdown_pools,
+    thread_limits,
+    worker_count,
+)
+from {{ package_name }}.core.settings import Settings, get_settings
+
+
+@pytest.fixture(autouse=True)
+def clean_state(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    for variable in resources.THREAD_LIMIT_VARS:
+        monkeypatch.delenv(variable, raising=False)
+    monkeypatch.setattr(resources, 'available_cpus', lambda: 8)
+    shutdown_pools()
+    Settings.reset()
+    yield
+    shutdown_pools()
+    Settings.reset()
+
+
+@pytest.fixture
+def threadpoolctl(monkeypatch):
+    """records the limits threadpoolctl is asked to apply and which are still in force"""
+    module = types.SimpleNamespace(calls=[], active=[])
+
+    class threadpool_limits:
+        def __init__(self, limits):
+            self.limits = limits
+            module.calls.append(limits)
+            module.active.append(limits)
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc_info):
+            module.active.remove(self.limits)
+
+    module.threadpool_limits = threadpool_limits
+    monkeypatch.setitem(sys.modules, 'threadpoolctl', module)
+    return module
+
+
+def _thread_env(_=None):
+    return os.environ.get('OMP_NUM_THREADS')
+
+
+def test_worker_count_from_cpus():
+    """usable CPUs are split between workers by threads_per_worker"""
+    assert worker_count(AppSettings()) == 8
+    assert worker_count(AppSettings(threads_per_worker=3)) == 2
+    assert worker_count(AppSettings(threads_per_worker=16)) == 1
+    assert worker_count(AppSettings(max_workers=5, threads_per_worker=4)) == 5
+
+
+def test_worker_count_clamped_by_memory_budget():
+    """the memory budget caps the worker count but never below one"""
+    assert worker_count(AppSettings(memory_budget_mb=3000, worker_memory_mb=1000)) == 3
+    assert worker_count(AppSettings(memory_budget_mb=100_000, worker_memory_mb=1000)) == 8
+    assert worker_count(AppSettings(max_workers=6, memory_budget_mb=2048)) == 2
+    assert worker_count(AppSettings(memory_budget_mb=100, worker_memory_mb=1000)) == 1
+
+
+def test_thread_pool_sized_and_shared():
+    """the thread pool has worker_count threads and is reused until shut down"""
+    get_settings(max_workers=3)
+    pool = get_thread_pool()
+    assert pool._max_workers == 3
+    assert get_thread_pool() is pool
+    shutdown_pools()
+    assert get_thread_pool() is not pool
+
+
+def test_thread_pool_leaves_caller_thread_limits_alone(threadpoolctl):
+    """creating the thread pool does not cap BLAS/OpenMP in the calling process"""
+    get_settings(threads_per_worker=1)
+    get_thread_pool()
+    assert threadpoolctl.calls == []
+    assert _thread_env() is None
+
+
+def test_thread_limits_are_scoped(threadpoolctl):
+    """thread_limits caps loaded runtimes only inside the block"""
+    get_settings(threads_per_worker=2)
+    with thread_limits():
+        assert threadpoolctl.active == [2]
+    with thread_limits(4):
+        assert threadpoolctl.active == [4]
+    assert threadpoolctl.calls == [2, 4]
+    assert threadpoolctl.active == []
+
+
+def test_thread_limits_without_threadpoolctl(monkeypatch):
+    """without threadpoolctl the block still runs"""
+    monkeypatch.setitem(sys.modules, 'threadpoolctl', None)
+    with thread_limits(2):
+        ran = True
+    assert ran
+
+
+def test_process_pool_caps_threads_in_workers_only():
+    """process workers get the thread cap; the parent keeps its own environment"""
+    get_settings(max_workers=2, threads_per_worker=3)
+    pool = get_process_pool('spawn')
+    assert pool._max_workers == 2
+    assert get_process_pool('spawn') is pool
+    assert set(pool.map(_thread_env, range(2))) == {'3'}
+    assert _thread_env() is None
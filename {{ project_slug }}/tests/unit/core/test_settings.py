@@ -0,0 +1,98 @@
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+
+from {{ package_name }}.core.config import LogLevel
+from {{ package_name }}.core.settings import Settings, get_settings, settings_initializer
+
+
+@pytest.fixture(autouse=True)
+def clean_settings(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv('{{ environment_prefix }}LOG_LEVEL', raising=False)
+    Settings.reset()
+    yield
+    Settings.reset()
+
+
+def _worker_settings(_):
+    instance = Settings.get_instance()
+    # The loader only holds settings if the worker read .env/os.environ itself.
+    return instance.log_level, instance._loader.settings is not None
+
+
+def test_concurrent_first_access_initializes_once(monkeypatch):
+    """concurrent first access creates exactly one initialized singleton"""
+    calls = []
+    original = Settings._initialize
+
+    def slow_initialize(self, *args, **kwargs):
+        calls.append(self)
+        time.sleep(0.05)
+        original(self, *args, **kwargs)
+
+    monkeypatch.setattr(Settings, '_initialize', slow_initialize)
+    barrier = threading.Barrier(16)
+
+    def access(_):
+        barrier.wait()
+        return get_settings()
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        instances = list(pool.map(access, range(16)))
+
+    assert len(calls) == 1
+    assert all(instance is instances[0] for instance in instances)
+    assert instances[0].log_level == LogLevel.INFO
+
+
+def test_failed_initialization_is_not_published():
+    """a failed initialization leaves no half-built singleton behind"""
+    with pytest.raises(RuntimeError):
+        get_settings(log_level='NOT_A_LEVEL')
+
+    assert Settings._instance is None
+    assert get_settings().log_level == LogLevel.INFO
+
+
+def test_install_skips_source_loading(tmp_path):
+    """installed settings are used without reading .env"""
+    (tmp_path / '.env').write_text('{{ environment_prefix }}LOG_LEVEL=ERROR\n')
+    get_settings(log_level='DEBUG')
+    payload = Settings.get_instance()._settings
+    Settings.reset()
+
+    Settings.install(payload)
+
+    assert get_settings().log_level == LogLevel.DEBUG
+
+
+@pytest.mark.parametrize('start_method', ['spawn', 'fork'])
+def test_process_pool_workers_share_parent_settings(tmp_path, monkeypatch, start_method):
+    """process pool workers receive the parent's settings instead of re-parsing sources"""
+    if start_method not in multiprocessing.get_all_start_methods():
+        pytest.skip(f'{start_method} start method not available')
+    (tmp_path / '.env').write_text('{{ environment_prefix }}LOG_LEVEL=WARNING\n')
+    get_settings(log_level='ERROR')
+    # A worker that re-read its sources would see this instead of the override.
+    monkeypatch.setenv('{{ environment_prefix }}LOG_LEVEL', 'CRITICAL')
+
+    initializer, initargs = settings_initializer()
+    context = multiprocessing.get_context(start_method)
+    with ProcessPoolExecutor(
+        max_workers=2, mp_context=context, initializer=initializer, initargs=initargs
+    ) as pool:
+        results = list(pool.map(_worker_settings, range(4)))
+
+    assert results == [(LogLevel.ERROR, False)] * 4
+
+
+def test_settings_instance_is_not_picklable():
+    """pickling the Settings proxy points at settings_initializer"""
+    import pickle
+
+    with pytest.raises(TypeError, match='settings_initializer'):
+        pickle.dumps(get_settings())
@@ -0,0 +1,43 @@
+"""Load the ``.angreal`` task modules without angreal installed."""
+
+import importlib.util
+import sys
+import types
+from pathlib import Path
+
+import pytest
+
+ANGREAL_DIR = Path(__file__).resolve().parents[3] / '.angreal'
+
+
+def _decorator(*args, **kwargs):
+    return lambda func: func
+
+
+def _fake_angreal():
+    angreal = types.ModuleType('angreal')
+    angreal.get_root = lambda: str(ANGREAL_DIR)
+    angreal.command = _decorator
+    angreal.argument = _decorator
+    angreal.command_group = lambda **kwargs: _decorator
+    integrations = types.ModuleType('angreal.integrations')
+    venv = types.ModuleType('angreal.integrations.venv')
+    venv.VirtualEnv = object
+    return {'angreal': angreal, 'angreal.integrations': integrations, 'angreal.integrations.venv': venv}
+
+
+@pytest.fixture
+def load_task(monkeypatch):
+    """import a task module (e.g. ``'task_tests'``) against a stand-in angreal"""
+    for name, module in _fake_angreal().items():
+        monkeypatch.setitem(sys.modules, name, module)
+    monkeypatch.syspath_prepend(str(ANGREAL_DIR))
+
+    def load(name):
+        spec = importlib.util.spec_from_file_location(f'_angreal_{name}', ANGREAL_DIR / f'{name}.py')
+        assert spec is not None and spec.loader is not None
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+
+    return load
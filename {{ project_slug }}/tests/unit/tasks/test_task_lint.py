@@ -0,0 +1,35 @@
+import contextlib
+import subprocess
+
+import pytest
+
+
+@pytest.fixture
+def commands(load_task, monkeypatch):
+    """the commands lint runs, in order; commands starting with a name in `failing` fail"""
+    task_lint = load_task('task_lint')
+    ran = []
+    failing = set()
+
+    def run(command, **kwargs):
+        ran.append(' '.join(command[:2]))
+        return subprocess.CompletedProcess(command, 1 if command[0] in failing else 0, '', '')
+
+    monkeypatch.setattr(task_lint, 'VirtualEnv', lambda **kwargs: contextlib.nullcontext())
+    monkeypatch.setattr(task_lint.subprocess, 'run', run)
+    return task_lint, ran, failing
+
+
+def test_mypy_runs_after_ruff_rewrites(commands):
+    """ruff's fixes and formatting finish before mypy reads the files"""
+    task_lint, ran, _ = commands
+    assert task_lint.lint() == 0
+    assert ran == ['ruff check', 'ruff format', 'mypy src/{{ package_name }}']
+
+
+def test_mypy_runs_when_ruff_fails(commands):
+    """a ruff failure still type checks and fails the task"""
+    task_lint, ran, failing = commands
+    failing.add('ruff')
+    assert task_lint.lint() == 1
+    assert ran == ['ruff check', 'mypy src/{{ package_name }}']
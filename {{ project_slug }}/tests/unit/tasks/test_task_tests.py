@@ -0,0 +1,108 @@
+import json
+import os
+import sys
+import time
+
+import pytest
+
+
+def _notebook(path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    cell = {'cell_type': 'code', 'source': 'x = 1', 'metadata': {}, 'outputs': [], 'execution_count': None}
+    path.write_text(json.dumps({'cells': [cell], 'metadata': {}, 'nbformat': 4, 'nbformat_minor': 5}))
+    return path
+
+
+@pytest.fixture
+def task_tests(load_task, tmp_path, monkeypatch):
+    module = load_task('task_tests')
+    monkeypatch.setattr(module, 'cwd', str(tmp_path))
+    return module
+
+
+@pytest.fixture
+def executed(task_tests, monkeypatch):
+    """notebooks _run_notebooks executed, without starting any"""
+    ran = []
+
+    def run(python, notebook, timeout):
+        ran.append(notebook.name)
+        name = os.path.relpath(notebook, task_tests.cwd)
+        return {'notebook': name, 'result': 'passed', 'seconds': 0.1, 'peak_rss_mb': 1.0, 'output': ''}
+
+    monkeypatch.setattr(task_tests, '_run_notebook', run)
+    return ran
+
+
+def _cache(tmp_path):
+    return json.loads((tmp_path / '.cache' / 'notebook_tests.json').read_text())
+
+
+def test_force_keeps_other_epochs_cached(task_tests, executed, tmp_path):
+    """forcing one epoch re-runs it and leaves the other epochs' cached results alone"""
+    first = _notebook(tmp_path / 'notebooks' / 'epoch_001' / 'a.ipynb')
+    third = _notebook(tmp_path / 'notebooks' / 'epoch_003' / 'b.ipynb')
+    assert task_tests._run_notebooks(sys.executable, [first, third], 1, 60, 'report.json')
+    assert executed == ['a.ipynb', 'b.ipynb']
+
+    assert task_tests._run_notebooks(sys.executable, [third], 1, 60, 'report.json', force=True)
+    assert executed == ['a.ipynb', 'b.ipynb', 'b.ipynb']
+    assert set(_cache(tmp_path)) == {'notebooks/epoch_001/a.ipynb', 'notebooks/epoch_003/b.ipynb'}
+
+    assert task_tests._run_notebooks(sys.executable, [first, third], 1, 60, 'report.json')
+    assert executed == ['a.ipynb', 'b.ipynb', 'b.ipynb']
+
+
+@pytest.fixture
+def command(task_tests, monkeypatch):
+    """make _run_notebook run a python snippet instead of nbval"""
+    snippet = {}
+    monkeypatch.setattr(
+        task_tests, '_nbval_command', lambda python, notebook: [python, '-c', snippet['code']]
+    )
+    return lambda code: snippet.update(code=code)
+
+
+def test_run_notebook_reports_result_and_peak_memory(task_tests, command, tmp_path):
+    """a passing run reports its sampled memory; a failing one keeps its output"""
+    pytest.importorskip('psutil')
+    notebook = tmp_path / 'a.ipynb'
+    command('import time; block = bytearray(64 * 2**20); time.sleep(1.5)')
+    entry = task_tests._run_notebook(sys.executable, notebook, 30)
+    assert (entry['notebook'], entry['result'], entry['output']) == ('a.ipynb', 'passed', '')
+    assert entry['peak_rss_mb'] >= 64
+
+    command('import sys; print("cell 3 raised"); sys.exit(1)')
+    entry = task_tests._run_notebook(sys.executable, notebook, 30)
+    assert entry['result'] == 'failed'
+    assert 'cell 3 raised' in entry['output']
+
+
+def test_run_notebook_without_psutil(task_tests, command, tmp_path, monkeypatch, capsys):
+    """without psutil the run still completes and memory is reported as unknown"""
+    monkeypatch.setattr(task_tests, 'psutil', None)
+    command('print("ok")')
+    entry = task_tests._run_notebook(sys.executable, tmp_path / 'a.ipynb', 30)
+    assert (entry['result'], entry['peak_rss_mb']) == ('passed', None)
+    task_tests._print_result(entry)
+    assert '- MB' in capsys.readouterr().out
+
+
+def test_run_notebook_timeout_kills_children(task_tests, command, tmp_path):
+    """a run past its timeout is reported as such and the process it started is killed too"""
+    psutil = pytest.importorskip('psutil')
+    pid_file = tmp_path / 'child.pid'
+    command(
+        'import pathlib, subprocess, sys, time\n'
+        'child = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(60)"])\n'
+        f'pathlib.Path({str(pid_file)!r}).write_text(str(child.pid))\n'
+        'time.sleep(60)\n'
+    )
+    start = time.perf_counter()
+    entry = task_tests._run_notebook(sys.executable, tmp_path / 'a.ipynb', 3)
+    assert entry['result'] == 'timeout'
+    assert time.perf_counter() - start < 15
+    try:
+        psutil.Process(int(pid_file.read_text())).wait(timeout=5)
+    except psutil.NoSuchProcess:
+        pass
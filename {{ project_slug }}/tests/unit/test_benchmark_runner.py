@@ -0,0 +1,62 @@
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+RUNNER = Path(__file__).resolve().parents[1] / 'benchmarks' / 'runner.py'
+
+
+@pytest.fixture
+def runner():
+    spec = importlib.util.spec_from_file_location('_benchmark_runner', RUNNER)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+STORED = {
+    'aaa': {'timestamp': '2024-05-01T10:00:00+00:00', 'passed': True},
+    'bbb': {'timestamp': '2024-05-02T10:00:00+00:00'},
+    'ccc': {'timestamp': '2024-05-03T10:00:00+00:00', 'passed': False},
+    'ddd': {'timestamp': '2024-05-04T10:00:00+00:00', 'passed': True},
+}
+
+
+def test_find_baseline_is_latest_other_passing_run(runner):
+    """the newest passing run of another commit wins; failed runs never become the baseline"""
+    assert runner.find_baseline(STORED, 'eee') == 'ddd'
+    assert runner.find_baseline(STORED, 'ddd') == 'bbb'
+    assert runner.find_baseline({'ddd': STORED['ddd']}, 'ddd') is None
+    assert runner.find_baseline({}, 'ddd') is None
+
+
+def test_find_baseline_resolves_ref(runner, monkeypatch):
+    """a ref is resolved through git and used even if that run regressed"""
+    monkeypatch.setattr(runner, '_git', lambda *args: 'ccc' if args == ('rev-parse', 'main') else None)
+    assert runner.find_baseline(STORED, 'eee', ref='main') == 'ccc'
+    assert runner.find_baseline(STORED, 'eee', ref='aaa') == 'aaa'
+    assert runner.find_baseline(STORED, 'eee', ref='v1.0') is None
+
+
+def test_compare_flags_regressions_past_threshold(runner):
+    """only benchmarks in both runs are compared; slower than 1 + threshold regresses"""
+    baseline = {
+        'fast': {'median': 1.0},
+        'slow': {'median': 1.0},
+        'zero': {'median': 0.0},
+        'gone': {'median': 1.0},
+    }
+    current = {
+        'fast': {'median': 1.1},
+        'slow': {'median': 1.5},
+        'zero': {'median': 0.1},
+        'new': {'median': 9.0},
+    }
+    rows = runner.compare(current, baseline, threshold=0.2)
+    assert rows == [
+        ('fast', 1.0, 1.1, pytest.approx(1.1), False),
+        ('slow', 1.0, 1.5, 1.5, True),
+        ('zero', 0.0, 0.1, float('inf'), True),
+    ]
+    assert [row[4] for row in runner.compare(current, baseline, threshold=0.6)] == [False, False, True]
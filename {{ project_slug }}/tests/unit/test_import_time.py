@@ -0,0 +1,79 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+# Cold-import budget for the package and the modules the notebook template imports.
+IMPORT_BUDGET_MS = 100
+
+# Modules that must only be imported when the code that needs them runs.
+HEAVY_MODULES = ('pydantic', 'dotenv', 'numpy', 'pandas', 'pyarrow')
+
+TEMPLATE_IMPORTS = 'import {{ package_name }}; from {{ package_name }}.utils.notebook import setup_notebook'
+
+
+def _run(code, *flags):
+    # Forward sys.path so the package resolves the same way as in this test process.
+    env = {**os.environ, 'PYTHONPATH': os.pathsep.join(sys.path)}
+    return subprocess.run(
+        [sys.executable, *flags, '-c', code],
+        check=True,
+        capture_output=True,
+        text=True,
+        env=env,
+    )
+
+
+def _cumulative_us(importtime_output, module):
+    """Cumulative microseconds of ``module`` in ``-X importtime`` output."""
+    for line in importtime_output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        _, cumulative, name = line[len('import time:') :].split('|')
+        if name.strip() == module:
+            return int(cumulative)
+    raise AssertionError(f'{module} not found in -X importtime output')
+
+
+def test_cold_import_within_budget():
+    """cold import of the package stays within the import-time budget"""
+    # Warm the bytecode cache, then keep the best of a few fresh interpreters.
+    _run(TEMPLATE_IMPORTS)
+    timings = []
+    for _ in range(3):
+        output = _run(TEMPLATE_IMPORTS, '-X', 'importtime').stderr
+        timings.append(
+            _cumulative_us(output, '{{ package_name }}') + _cumulative_us(output, '{{ package_name }}.utils')
+        )
+
+    best_ms = min(timings) / 1000
+    assert best_ms <= IMPORT_BUDGET_MS, f'import took {best_ms:.1f} ms, budget is {IMPORT_BUDGET_MS} ms'
+
+
+@pytest.mark.parametrize(
+    'code',
+    [
+        TEMPLATE_IMPORTS,
+        'import {{ package_name }}.core, {{ package_name }}.utils',
+    ],
+)
+def test_import_does_not_load_heavy_dependencies(code):
+    """importing the package surface does not import heavy dependencies"""
+    output = _run(f'{code}; import sys; print(",".join(m for m in {HEAVY_MODULES!r} if m in sys.modules))')
+
+    assert output.stdout.strip() == ''
+
+
+def test_lazy_names_resolve():
+    """lazily exported names resolve to their defining modules"""
+    import {{ package_name }}
+    from {{ package_name }} import core, utils
+    from {{ package_name }}.core.settings import get_settings
+    from {{ package_name }}.utils.cache import memoize
+
+    assert core.get_settings is get_settings
+    assert utils.memoize is memoize
+    assert {{ package_name }}.get_settings is get_settings
+    with pytest.raises(AttributeError):
+        core.does_not_exist  # noqa: B018
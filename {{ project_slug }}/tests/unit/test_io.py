@@ -0,0 +1,91 @@
+import numpy as np
+import pytest
+
+from {{ package_name }} import io
+
+pa = pytest.importorskip('pyarrow')
+
+
+@pytest.fixture
+def orders_csv(tmp_path):
+    path = tmp_path / 'orders.csv'
+    lines = ['order_id,year,amount'] + [f'{i},{2020 + i // 4},{i * 1.5}' for i in range(10)]
+    path.write_text('\n'.join(lines) + '\n')
+    return path
+
+
+@pytest.mark.parametrize('suffix', ['.parquet', '.arrow', '.npy'])
+def test_convert_and_load_roundtrip(orders_csv, suffix):
+    """every format loads back the CSV's values"""
+    dest = io.convert_csv(orders_csv, orders_csv.with_suffix(suffix), row_group_size=4)
+    assert dest.suffix == suffix
+    loaded = io.load(dest)
+    if suffix == '.npy':
+        assert isinstance(loaded, np.memmap)
+        assert loaded.shape == (10, 3)
+        assert loaded.dtype == np.float64
+        np.testing.assert_array_equal(loaded[:, 0], np.arange(10))
+        np.testing.assert_array_equal(loaded[:, 2], np.arange(10) * 1.5)
+    else:
+        assert loaded.column_names == ['order_id', 'year', 'amount']
+        assert loaded.column('order_id').to_pylist() == list(range(10))
+        assert loaded.column('amount').to_pylist() == [i * 1.5 for i in range(10)]
+
+
+def test_convert_defaults_to_parquet_next_to_source(orders_csv):
+    """without dest the output is the source with a .parquet suffix"""
+    dest = io.convert_csv(orders_csv, columns=['order_id', 'amount'])
+    assert dest == orders_csv.with_suffix('.parquet')
+    assert io.load(dest).column_names == ['order_id', 'amount']
+    assert io.file_format(dest) == 'parquet'
+    with pytest.raises(ValueError, match='format'):
+        io.file_format(orders_csv)
+
+
+def test_parquet_row_groups_and_filters(orders_csv):
+    """row groups and filters select rows; combining them is rejected"""
+    dest = io.convert_csv(orders_csv, orders_csv.with_suffix('.parquet'), row_group_size=4)
+    assert io.load(dest, row_groups=[1]).column('order_id').to_pylist() == [4, 5, 6, 7]
+    filtered = io.load(dest, columns=['order_id'], filters=[('year', '>=', 2022)])
+    assert filtered.column_names == ['order_id']
+    assert filtered.column('order_id').to_pylist() == [8, 9]
+    with pytest.raises(ValueError, match='either'):
+        io.load(dest, row_groups=[0], filters=[('year', '>=', 2022)])
+
+
+def test_arrow_batches_and_unsupported_selection(orders_csv):
+    """row_groups picks Arrow record batches; filters and npy selection are rejected"""
+    dest = io.convert_csv(orders_csv, orders_csv.with_suffix('.arrow'), row_group_size=4)
+    table = io.load(dest, columns=['amount'], row_groups=[0, 2])
+    assert table.column('amount').to_pylist() == [0.0, 1.5, 3.0, 4.5, 12.0, 13.5]
+    with pytest.raises(ValueError, match='only supported for Parquet'):
+        io.load(dest, filters=[('year', '>=', 2022)])
+    npy = io.convert_csv(orders_csv, orders_csv.with_suffix('.npy'))
+    with pytest.raises(ValueError, match='slice the array'):
+        io.load(npy, columns=['amount'])
+
+
+def test_npy_with_missing_ints_becomes_float_nan(tmp_path):
+    """an int column with empty cells is written as float64 with NaN, not garbage"""
+    path = tmp_path / 'counts.csv'
+    path.write_text('count,flag\n1,true\n,false\n3,\n')
+    values = io.load(io.convert_csv(path, tmp_path / 'counts.npy'))
+    assert values.dtype == np.float64
+    np.testing.assert_array_equal(values, [[1.0, 1.0], [np.nan, 0.0], [3.0, np.nan]])
+
+
+def test_npy_rejects_text_columns(tmp_path):
+    """string columns cannot go into a numeric array"""
+    path = tmp_path / 'names.csv'
+    path.write_text('name,n\na,1\nb,2\n')
+    with pytest.raises(ValueError, match='numeric'):
+        io.convert_csv(path, tmp_path / 'names.npy')
+
+
+def test_iter_csv_yields_fixed_size_chunks(orders_csv):
+    """chunks hold exactly chunk_size rows except the last"""
+    chunks = list(io.iter_csv(orders_csv, chunk_size=4, block_size=64))
+    assert [chunk.num_rows for chunk in chunks] == [4, 4, 2]
+    assert sum((chunk.column('order_id').to_pylist() for chunk in chunks), []) == list(range(10))
+    with pytest.raises(ValueError, match='chunk_size'):
+        next(io.iter_csv(orders_csv, chunk_size=0))
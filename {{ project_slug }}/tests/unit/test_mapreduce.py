@@ -0,0 +1,67 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+
+pytest.importorskip('pyarrow')
+
+from {{ package_name }} import io
+from {{ package_name }}.mapreduce import iter_chunks, map_reduce
+
+
+@pytest.fixture
+def orders_csv(tmp_path):
+    path = tmp_path / 'orders.csv'
+    pd.DataFrame({'order_id': range(100_000), 'amount': [1.5, 2.5] * 50_000}).to_csv(path, index=False)
+    return path
+
+
+def _amount_total(df):
+    return df['amount'].sum()
+
+
+def test_iter_csv_yields_exact_chunks(orders_csv):
+    """every chunk but the last holds exactly chunk_size rows, across block boundaries"""
+    chunks = list(io.iter_csv(orders_csv, 30_000, block_size=64 * 1024))
+    assert [len(chunk) for chunk in chunks] == [30_000, 30_000, 30_000, 10_000]
+    assert chunks[1].column('order_id')[0].as_py() == 30_000
+
+
+def test_iter_csv_chunks_own_their_rows(orders_csv):
+    """a chunk does not reference the rest of its parsed block"""
+    (chunk, *_) = io.iter_csv(orders_csv, 1_000, columns=['order_id'])
+    assert chunk.num_columns == 1
+    assert chunk.get_total_buffer_size() <= 1_000 * 8 + 64
+
+
+def test_iter_csv_rejects_empty_chunks(orders_csv):
+    """chunk_size must be positive"""
+    with pytest.raises(ValueError, match='chunk_size'):
+        next(io.iter_csv(orders_csv, 0))
+
+
+def test_csv_is_split_into_chunk_size_pieces(orders_csv):
+    """a 100k-row CSV with chunk_size=25000 gives four chunks, not one"""
+    assert [len(df) for df in iter_chunks(orders_csv, chunk_size=25_000)] == [25_000] * 4
+
+
+def test_map_reduce_over_csv(orders_csv):
+    """map_reduce covers every row once"""
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        total, stats = map_reduce(
+            orders_csv, _amount_total, lambda a, b: a + b, chunk_size=25_000, executor=executor
+        )
+    assert total == 200_000
+    assert (stats.chunks, stats.rows) == (4, 100_000)
+
+
+def test_npy_chunks(tmp_path):
+    """.npy files are split into row ranges of chunk_size"""
+    np = pytest.importorskip('numpy')
+    path = tmp_path / 'values.npy'
+    np.save(path, np.arange(10))
+    assert [chunk.tolist() for chunk in iter_chunks(path, chunk_size=4)] == [
+        [0, 1, 2, 3],
+        [4, 5, 6, 7],
+        [8, 9],
+    ]
@@ -0,0 +1,195 @@
+import time
+
+import pytest
+
+from {{ package_name }}.core import resources
+from {{ package_name }}.pipeline import Pipeline, format_report
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'raw.txt').write_text('1 2 3')
+    return tmp_path
+
+
+def _statuses(results):
+    return {result.name: result.status for result in results}
+
+
+def _double(values):
+    return [2 * v for v in values]
+
+
+def _triple(values):
+    return [3 * v for v in values]
+
+
+def _clean(raw, clean):
+    clean.write_text(raw.read_text().strip())
+
+
+def _scale(clean, scaled):
+    scaled.write_text(' '.join(str(v) for v in _double([int(v) for v in clean.read_text().split()])))
+
+
+class _ArgsOnlyError(RuntimeError):
+    """pickles like many library exceptions: its args survive, attributes set on it do not"""
+
+    def __reduce__(self):
+        return type(self), self.args
+
+
+def _slow_failure(raw, clean):
+    time.sleep(0.2)
+    raise _ArgsOnlyError('boom')
+
+
+def _build(helpers=()):
+    pipeline = Pipeline(state_file='.pipeline/state.json')
+    pipeline.add(_clean, inputs={'raw': 'raw.txt'}, outputs={'clean': 'clean.txt'})
+    pipeline.add(_scale, inputs={'clean': 'clean.txt'}, outputs={'scaled': 'scaled.txt'}, code=helpers)
+    return pipeline
+
+
+def test_order_follows_declared_files(workdir):
+    """stages run after the stages producing their inputs"""
+    pipeline = _build()
+    assert pipeline.order() == ['_clean', '_scale']
+    assert pipeline.dependencies() == {'_clean': set(), '_scale': {'_clean'}}
+    assert pipeline.order(targets=['_clean']) == ['_clean']
+
+
+def test_cycle_is_rejected(workdir):
+    """stages that feed each other are reported as a cycle"""
+    pipeline = Pipeline()
+    pipeline.add(_clean, inputs={'raw': 'a.txt'}, outputs={'clean': 'b.txt'}, name='first')
+    pipeline.add(_clean, inputs={'raw': 'b.txt'}, outputs={'clean': 'a.txt'}, name='second')
+    with pytest.raises(ValueError, match='cycle'):
+        pipeline.order()
+
+
+def test_unchanged_stages_are_skipped(workdir):
+    """a second run skips stages whose code and inputs are unchanged"""
+    assert _statuses(_build().run(max_workers=2)) == {'_clean': 'ran', '_scale': 'ran'}
+    assert (workdir / 'scaled.txt').read_text() == '2 4 6'
+    assert _statuses(_build().run(max_workers=2)) == {'_clean': 'skipped', '_scale': 'skipped'}
+
+
+def test_changed_input_reruns_downstream(workdir):
+    """editing an input reruns its stage and the stages after it"""
+    _build().run(max_workers=2)
+    (workdir / 'raw.txt').write_text('4 5')
+    assert _statuses(_build().run(max_workers=2)) == {'_clean': 'ran', '_scale': 'ran'}
+    assert (workdir / 'scaled.txt').read_text() == '8 10'
+
+
+def test_deleted_output_reruns_stage(workdir):
+    """a stage whose output was deleted is stale"""
+    _build().run(max_workers=2)
+    (workdir / 'scaled.txt').unlink()
+    assert _statuses(_build().run(max_workers=2)) == {'_clean': 'skipped', '_scale': 'ran'}
+
+
+def test_declared_code_dependency_invalidates_stage(workdir):
+    """changing a helper listed in code= reruns the stage"""
+    _build(helpers=[_double]).run(max_workers=2)
+    assert _statuses(_build(helpers=[_double]).run(max_workers=2))['_scale'] == 'skipped'
+    assert _statuses(_build(helpers=[_triple]).run(max_workers=2))['_scale'] == 'ran'
+
+
+def test_module_code_dependency_hashes_source(workdir):
+    """a module listed in code= is fingerprinted by its source file"""
+    import {{ package_name }}.utils.hashing as hashing
+
+    _build(helpers=[hashing]).run(max_workers=2)
+    assert _statuses(_build(helpers=[hashing]).run(max_workers=2))['_scale'] == 'skipped'
+
+
+def test_failure_blocks_downstream(workdir):
+    """a failing stage blocks the stages after it and is not recorded"""
+
+    def broken(raw, clean):
+        raise RuntimeError('boom')
+
+    pipeline = Pipeline(state_file='.pipeline/state.json')
+    pipeline.add(broken, inputs={'raw': 'raw.txt'}, outputs={'clean': 'clean.txt'})
+    pipeline.add(_scale, inputs={'clean': 'clean.txt'}, outputs={'scaled': 'scaled.txt'})
+    results = pipeline.run(max_workers=2)
+
+    assert _statuses(results) == {'broken': 'failed', '_scale': 'blocked'}
+    assert isinstance(results[0].error, RuntimeError)
+    assert _statuses(pipeline.run(max_workers=2))['broken'] == 'failed'
+
+
+def test_missing_output_fails_stage(workdir):
+    """a stage that does not write its declared outputs fails"""
+    pipeline = Pipeline(state_file='.pipeline/state.json')
+    pipeline.add(
+        lambda raw, clean: None, inputs={'raw': 'raw.txt'}, outputs={'clean': 'clean.txt'}, name='noop'
+    )
+    (result,) = pipeline.run(max_workers=1)
+    assert result.status == 'failed'
+    assert isinstance(result.error, FileNotFoundError)
+
+
+def test_dry_run_reports_without_running(workdir):
+    """dry runs report stale stages and write nothing"""
+    assert _statuses(_build().run(dry_run=True)) == {'_clean': 'ran', '_scale': 'ran'}
+    assert not (workdir / 'clean.txt').exists()
+
+
+def test_report_shows_wall_time_of_parallel_run(workdir):
+    """independent stages overlap, and the report's total is the run's wall time"""
+
+    def sleep_into(path):
+        def stage(out):
+            time.sleep(0.3)
+            out.write_text('done')
+
+        stage.__name__ = stage.__qualname__ = f'sleep_{path}'
+        return stage
+
+    pipeline = Pipeline(state_file='.pipeline/state.json')
+    for path in ('a', 'b', 'c'):
+        pipeline.add(sleep_into(path), outputs={'out': f'{path}.txt'})
+    results = pipeline.run(max_workers=3)
+
+    assert sum(r.seconds for r in results) >= 0.9
+    assert pipeline.last_run_seconds < 0.8
+    report = format_report(results, wall_seconds=pipeline.last_run_seconds)
+    assert f'{pipeline.last_run_seconds:9.2f}' in report.splitlines()[-2]
+
+
+def test_processes_use_shared_pool(workdir, monkeypatch):
+    """process runs go through core.resources.get_process_pool"""
+    calls = []
+    get_process_pool = resources.get_process_pool
+
+    def tracking_pool(*args, **kwargs):
+        calls.append(args)
+        return get_process_pool(*args, **kwargs)
+
+    monkeypatch.setattr(resources, 'get_process_pool', tracking_pool)
+    try:
+        results = _build().run(max_workers=1, processes=True)
+        assert _statuses(results) == {'_clean': 'ran', '_scale': 'ran'}
+        assert (workdir / 'scaled.txt').read_text() == '2 4 6'
+        assert calls
+        # The shared pool is left running for other callers.
+        assert get_process_pool().submit(abs, -1).result() == 1
+    finally:
+        resources.shutdown_pools()
+
+
+def test_failed_stage_in_process_pool_keeps_its_time(workdir):
+    """a stage failing in a worker process reports how long it ran"""
+    pipeline = Pipeline(state_file='.pipeline/state.json')
+    pipeline.add(_slow_failure, inputs={'raw': 'raw.txt'}, outputs={'clean': 'clean.txt'})
+    try:
+        (result,) = pipeline.run(max_workers=1, processes=True)
+    finally:
+        resources.shutdown_pools()
+    assert result.status == 'failed'
+    assert isinstance(result.error, _ArgsOnlyError)
+    assert result.seconds >= 0.2
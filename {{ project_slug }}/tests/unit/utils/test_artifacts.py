@@ -0,0 +1,75 @@
+import json
+
+import pytest
+
+from {{ package_name }}.utils.artifacts import MANIFEST_NAME, ArtifactStore, link_file
+
+CALLS = []
+
+
+def write_rows(output, rows, sep):
+    CALLS.append(output.name)
+    output.write_text(sep.join(rows.read_text().split()))
+
+
+@pytest.fixture(autouse=True)
+def _reset_calls():
+    CALLS.clear()
+
+
+@pytest.fixture
+def rows(tmp_path):
+    path = tmp_path / 'rows.txt'
+    path.write_text('a b c')
+    return path
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ArtifactStore(root=tmp_path / '.artifacts', epoch_dir=tmp_path / 'notebooks' / 'epoch_001')
+
+
+def test_produce_reuses_matching_artifact(store, rows):
+    """the same name, code, inputs and params are computed once"""
+    first = store.produce('rows.csv', write_rows, inputs={'rows': rows}, params={'sep': ','})
+    second = store.produce('rows.csv', write_rows, inputs={'rows': rows}, params={'sep': ','})
+    assert first == second == store.epoch_dir / 'artifacts' / 'rows.csv'
+    assert first.read_text() == 'a,b,c'
+    assert CALLS == ['rows.csv']
+
+
+def test_produce_keys_on_name(store, rows):
+    """another output name with the same inputs is computed, not served the first file's bytes"""
+    store.produce('out.csv', write_rows, inputs={'rows': rows}, params={'sep': ','})
+    json_path = store.produce('out.json', write_rows, inputs={'rows': rows}, params={'sep': ','})
+    assert CALLS == ['out.csv', 'out.json']
+    assert json_path.name == 'out.json'
+    manifest = json.loads((store.epoch_dir / MANIFEST_NAME).read_text())
+    assert manifest['out.json']['name'] == 'out.json'
+
+
+def test_produce_recomputes_on_changed_input_or_params(store, rows):
+    """changing an input file or a parameter invalidates the artifact"""
+    store.produce('rows.csv', write_rows, inputs={'rows': rows}, params={'sep': ','})
+    store.produce('rows.csv', write_rows, inputs={'rows': rows}, params={'sep': ';'})
+    rows.write_text('a b c d')
+    path = store.produce('rows.csv', write_rows, inputs={'rows': rows}, params={'sep': ';'})
+    assert len(CALLS) == 3
+    assert path.read_text() == 'a;b;c;d'
+
+
+def test_produce_without_writing_fails(store):
+    """a function that writes nothing is an error"""
+    with pytest.raises(FileNotFoundError, match='did not write'):
+        store.produce('missing.csv', lambda output: None)
+
+
+def test_link_file_shares_content(tmp_path):
+    """the target has the source's bytes and replaces an existing file"""
+    source = tmp_path / 'source.bin'
+    source.write_bytes(b'payload')
+    target = tmp_path / 'nested' / 'target.bin'
+    target.parent.mkdir()
+    target.write_bytes(b'stale')
+    assert link_file(source, target) in ('reflink', 'hardlink', 'copy')
+    assert target.read_bytes() == b'payload'
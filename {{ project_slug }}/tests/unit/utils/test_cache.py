@@ -0,0 +1,157 @@
+import fcntl
+import os
+import threading
+
+import numpy as np
+import pytest
+
+from {{ package_name }}.utils.cache import DiskCache, memoize
+from {{ package_name }}.utils.hashing import hash_value
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return DiskCache(tmp_path / 'cache')
+
+
+def _age(cache, key, seconds_ago):
+    """Set an entry's access time, which eviction orders by."""
+    (path,) = cache.directory.glob(f'*/{key}.*')
+    when = os.path.getmtime(path) - seconds_ago
+    os.utime(path, (when, when))
+
+
+def test_hash_value_datetime_and_timedelta_arrays():
+    """datetime64/timedelta64 arrays hash by content, dtype and shape"""
+    dates = np.array(['2024-01-01', '2024-01-02'], dtype='datetime64[ns]')
+    assert hash_value(dates) == hash_value(dates.copy())
+    assert hash_value(dates) != hash_value(dates.astype('datetime64[s]'))
+    assert hash_value(dates) != hash_value(dates[::-1])
+    assert hash_value(np.diff(dates)) != hash_value(np.diff(dates).astype('int64'))
+    assert hash_value(np.arange(6).reshape(2, 3)) != hash_value(np.arange(6).reshape(3, 2))
+
+
+def test_memoize_datetime_argument(cache):
+    """memoized calls accept datetime64 arguments"""
+
+    @memoize(cache=cache)
+    def span(dates):
+        return dates.max() - dates.min()
+
+    dates = np.array(['2024-01-01', '2024-03-01'], dtype='datetime64[D]')
+    assert span(dates) == span(dates) == np.timedelta64(60, 'D')
+    assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+
+
+def test_masked_array_round_trips_through_pickle(cache):
+    """ndarray subclasses are pickled instead of saved as .npy"""
+    masked = np.ma.masked_array([1.0, 2.0, 3.0], mask=[False, True, False])
+    cache.store('ab' * 32, masked)
+
+    found, value = cache.lookup('ab' * 32)
+    assert found
+    assert isinstance(value, np.ma.MaskedArray)
+    assert value.mask.tolist() == [False, True, False]
+    assert list(cache.directory.glob('*/*.pkl'))
+
+
+def test_stats_count_hits_misses_and_writes(cache):
+    """stats track hits, misses, writes and bytes written"""
+
+    @memoize(cache=cache)
+    def square(x):
+        return x * x
+
+    assert [square(2), square(2), square(3)] == [4, 4, 9]
+    stats = square.cache_stats()
+    assert (stats.hits, stats.misses, stats.writes) == (1, 2, 2)
+    assert stats.bytes_written > 0
+    assert stats.hit_rate == pytest.approx(1 / 3)
+
+
+def test_eviction_removes_least_recently_used(cache):
+    """entries accessed longest ago are evicted first"""
+    payload = b'x' * 1000
+    keys = [f'{i:02d}' * 32 for i in range(3)]
+    for age, key in zip((300, 200, 100), keys):
+        cache.store(key, payload)
+        _age(cache, key, age)
+    # Reading the oldest entry makes it the most recently used.
+    assert cache.lookup(keys[0])[0]
+
+    removed = cache.evict(max_bytes=2500)
+
+    assert removed == 1
+    assert cache.lookup(keys[1]) == (False, None)
+    assert cache.lookup(keys[0])[0] and cache.lookup(keys[2])[0]
+    assert cache.stats.evictions == 1
+
+
+def test_store_evicts_when_over_limit(tmp_path):
+    """a write past max_bytes evicts down below the limit"""
+    cache = DiskCache(tmp_path / 'cache', max_bytes=5000)
+    for i in range(10):
+        cache.store(f'{i:02d}' * 32, b'x' * 1000)
+    assert cache.size() <= 5000
+    assert cache.stats.evictions > 0
+
+
+def test_evict_skips_while_another_process_holds_the_lock(cache):
+    """eviction returns immediately when the lock file is held"""
+    cache.store('ab' * 32, b'x' * 1000)
+    with open(cache.directory / '.lock', 'a') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            assert cache.evict(max_bytes=0) == 0
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+    assert cache.evict(max_bytes=0) == 1
+
+
+def test_concurrent_writers_share_one_cache(cache):
+    """concurrent stores of the same and different keys stay readable and counted"""
+    barrier = threading.Barrier(8)
+
+    def write(i):
+        barrier.wait()
+        for j in range(20):
+            cache.store(f'{j % 5:02d}' * 32, np.full(100, j % 5))
+
+    threads = [threading.Thread(target=write, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert cache.stats.writes == 160
+    for j in range(5):
+        found, value = cache.lookup(f'{j:02d}' * 32)
+        assert found and (value == j).all()
+    assert not list(cache.directory.glob('*/*.tmp'))
+
+
+def test_memoize_reruns_when_input_file_changes(cache, tmp_path):
+    """rewriting a Path argument's file invalidates the cached result"""
+    calls = []
+
+    @memoize(cache=cache)
+    def word_count(path):
+        calls.append(path)
+        return len(path.read_text().split())
+
+    orders = tmp_path / 'orders.txt'
+    orders.write_text('a b c')
+    assert word_count(orders) == 3
+    assert word_count(orders) == 3
+    orders.write_text('a b c d e')
+    assert word_count(orders) == 5
+    assert len(calls) == 2
+
+
+def test_hash_value_path_tracks_directory_contents(tmp_path):
+    """a directory Path hashes differently once a file under it changes"""
+    (tmp_path / 'part-0.csv').write_text('1')
+    before = hash_value(tmp_path)
+    (tmp_path / 'part-1.csv').write_text('2')
+    assert hash_value(tmp_path) != before
+    assert hash_value(tmp_path / 'missing.csv') == hash_value(tmp_path / 'missing.csv')
@@ -0,0 +1,100 @@
+import numpy as np
+import pandas as pd
+import pandas.testing as tm
+import pytest
+
+from {{ package_name }}.utils.frames import analyze, compact, compact_series
+
+
+def _values_equal(before, after):
+    """same values and missing entries, whatever the dtypes"""
+    tm.assert_series_equal(before.astype(object), after.astype(object), check_dtype=False)
+
+
+def test_numpy_columns_are_downcast_losslessly():
+    """ints get the smallest type holding their range, floats shrink only when exact"""
+    df = pd.DataFrame(
+        {
+            'small': np.arange(100, dtype='int64'),
+            'negative': np.arange(-50, 50, dtype='int64'),
+            'halves': np.arange(100, dtype='float64') / 2,
+            'tenths': np.arange(100, dtype='float64') / 10,
+        }
+    )
+    result, report = compact(df, sparse_threshold=None)
+    assert result.dtypes.astype(str).to_dict() == {
+        'small': 'uint8',
+        'negative': 'int8',
+        'halves': 'float32',
+        'tenths': 'float64',
+    }
+    assert (report['saved'] >= 0).all()
+    for column in df:
+        _values_equal(df[column], result[column])
+
+
+def test_nullable_columns_stay_nullable():
+    """Int64/Float64 are downcast within the nullable family and keep pd.NA"""
+    df = pd.DataFrame(
+        {
+            'count': pd.array([1, None, 300], dtype='Int64'),
+            'signed': pd.array([-1, None, 1], dtype='Int64'),
+            'ratio': pd.array([0.5, None, 2.0], dtype='Float64'),
+            'precise': pd.array([0.1, None, 2.0], dtype='Float64'),
+            'empty': pd.array([None, None, None], dtype='Int64'),
+        }
+    )
+    result, _ = compact(df)
+    assert result.dtypes.astype(str).to_dict() == {
+        'count': 'UInt16',
+        'signed': 'Int8',
+        'ratio': 'Float32',
+        'precise': 'Float64',
+        'empty': 'Int64',
+    }
+    for column in df:
+        assert result[column].isna().tolist() == df[column].isna().tolist()
+        assert result[column][1] is pd.NA
+        _values_equal(df[column], result[column])
+
+
+def test_nullable_columns_are_not_made_sparse():
+    """a nullable column dominated by one value is downcast but stays dense"""
+    series = pd.Series(pd.array([0] * 99 + [None], dtype='Int64'))
+    converted = compact_series(series, sparse_threshold=0.5)
+    assert str(converted.dtype) == 'UInt8'
+    _values_equal(series, converted)
+
+
+def test_pyarrow_columns_are_left_alone():
+    """numeric extension dtypes outside the nullable family are not converted"""
+    pytest.importorskip('pyarrow')
+    series = pd.Series([1, 2, None], dtype='int64[pyarrow]')
+    assert compact_series(series) is series
+
+
+def test_strings_become_categorical():
+    """repeated strings become a categorical, unique ones do not"""
+    df = pd.DataFrame({'segment': ['a', 'b'] * 50, 'id': [str(i) for i in range(100)]})
+    result, _ = compact(df)
+    assert isinstance(result['segment'].dtype, pd.CategoricalDtype)
+    assert not isinstance(result['id'].dtype, pd.CategoricalDtype)
+    _values_equal(df['segment'], result['segment'])
+
+
+def test_sparse_numeric_column():
+    """a numpy column dominated by one value becomes sparse"""
+    series = pd.Series(np.r_[np.zeros(999), 1.5])
+    converted = compact_series(series)
+    assert isinstance(converted.dtype, pd.SparseDtype)
+    _values_equal(series, converted)
+
+
+def test_inplace_and_analyze_agree():
+    """inplace returns the same frame and analyze reports the same savings"""
+    df = pd.DataFrame({'n': np.arange(10, dtype='int64'), 'x': pd.array([1.0, None] * 5, dtype='Float64')})
+    expected = analyze(df)
+    result, report = compact(df, inplace=True)
+    assert result is df
+    tm.assert_frame_equal(report, expected)
+    assert df.dtypes.astype(str).tolist() == ['uint8', 'Float32']
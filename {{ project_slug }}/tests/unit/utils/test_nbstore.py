@@ -0,0 +1,94 @@
+import json
+
+import pytest
+
+from {{ package_name }}.__main__ import main
+from {{ package_name }}.utils import nbstore
+from {{ package_name }}.utils.nbstore import OutputStore, measure_notebook, restore_notebook, strip_notebook
+
+BIG = {'output_type': 'display_data', 'data': {'text/html': '<td>x</td>' * 500}, 'metadata': {}}
+SMALL = {'output_type': 'stream', 'name': 'stdout', 'text': 'ok\n'}
+
+
+def _notebook(path, *outputs):
+    cells = [
+        {'cell_type': 'markdown', 'metadata': {}, 'source': '# Title'},
+        {'cell_type': 'code', 'metadata': {}, 'source': 'df', 'outputs': list(outputs), 'execution_count': 1},
+    ]
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({'cells': cells, 'metadata': {}, 'nbformat': 4, 'nbformat_minor': 5}))
+    return path
+
+
+def _outputs(path):
+    return json.loads(path.read_text())['cells'][1]['outputs']
+
+
+@pytest.fixture
+def store(tmp_path):
+    return OutputStore(tmp_path / '.nbstore')
+
+
+def test_strip_moves_large_outputs_and_restore_puts_them_back(tmp_path, store):
+    """large outputs become placeholders and restore gives back the original notebook cells"""
+    path = _notebook(tmp_path / 'explore.ipynb', BIG, SMALL, BIG)
+    sizes = strip_notebook(path, store, threshold=1024)
+    assert sizes.outputs_moved == 2
+    assert sizes.moved_bytes == sizes.stored_bytes > sizes.inline_bytes > 0
+    stripped = _outputs(path)
+    assert stripped[1] == SMALL
+    assert stripped[0] == stripped[2]
+    assert len(list(store.directory.rglob('*.json.gz'))) == 1
+    assert strip_notebook(path, store, threshold=1024).outputs_moved == 0
+
+    assert restore_notebook(path, store) == 2
+    assert _outputs(path) == [BIG, SMALL, BIG]
+    assert restore_notebook(path, store) == 0
+
+
+def test_restore_keeps_placeholders_missing_from_store(tmp_path, store):
+    """a placeholder whose blob is gone stays in the notebook"""
+    path = _notebook(tmp_path / 'explore.ipynb', BIG)
+    strip_notebook(path, store, threshold=1024)
+    placeholder = _outputs(path)
+    assert restore_notebook(path, OutputStore(tmp_path / 'elsewhere')) == 0
+    assert _outputs(path) == placeholder
+
+
+def test_interrupted_save_leaves_notebook_intact(tmp_path, store, monkeypatch):
+    """a failure while writing keeps the original file and no temporary file behind"""
+    path = _notebook(tmp_path / 'explore.ipynb', BIG)
+    original = path.read_text()
+
+    def interrupted(*args, **kwargs):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(nbstore.json, 'dump', interrupted)
+    with pytest.raises(KeyboardInterrupt):
+        strip_notebook(path, store, threshold=1024)
+    assert path.read_text() == original
+    assert [p.name for p in tmp_path.iterdir() if p.is_file()] == ['explore.ipynb']
+
+
+def test_outputs_command_strips_reports_and_restores(tmp_path, capsys):
+    """the outputs subcommand round-trips every notebook under a directory"""
+    notebooks = tmp_path / 'notebooks'
+    first = _notebook(notebooks / 'epoch_001' / 'a.ipynb', BIG, SMALL)
+    second = _notebook(notebooks / 'epoch_002' / 'b.ipynb', BIG)
+    _notebook(notebooks / 'epoch_002' / '.ipynb_checkpoints' / 'b-checkpoint.ipynb', BIG)
+    args = [str(notebooks), '--store', str(tmp_path / '.nbstore'), '--threshold', '1024']
+
+    assert main(['outputs', 'report', *args]) == 0
+    report = capsys.readouterr().out
+    assert 'strippable' in report
+    assert 'epoch_001' in report and 'epoch_002' in report
+
+    assert main(['outputs', 'strip', *args]) == 0
+    assert 'Moved 2 outputs' in capsys.readouterr().out
+    assert measure_notebook(first).stored_bytes > 0
+    assert measure_notebook(second).inline_bytes == 0
+
+    assert main(['outputs', 'restore', *args]) == 0
+    assert 'Restored 2 outputs in 2 notebooks' in capsys.readouterr().out
+    assert _outputs(first) == [BIG, SMALL]
+    assert _outputs(second) == [BIG]
@@ -0,0 +1,140 @@
+import random
+import threading
+import time
+
+import pytest
+
+from {{ package_name }}.utils.prefetch import Prefetcher, PrefetchStats, prefetch
+
+
+class Source:
+    """generator-backed source that records how far it was read and whether it was closed"""
+
+    def __init__(self, items, fail_at=None):
+        self.items = items
+        self.fail_at = fail_at
+        self.read = 0
+        self.closed = threading.Event()
+
+    def __iter__(self):
+        try:
+            for i, item in enumerate(self.items):
+                if i == self.fail_at:
+                    raise ValueError(f'bad item {i}')
+                self.read += 1
+                yield item
+        finally:
+            self.closed.set()
+
+
+def _jittered(value):
+    time.sleep(random.uniform(0, 0.01))
+    return value * 10
+
+
+def test_yields_source_items_in_order():
+    """without func the items come through unchanged"""
+    assert list(prefetch(range(20), depth=3)) == list(range(20))
+
+
+def test_workers_keep_source_order():
+    """loads finishing out of order still come out in source order"""
+    random.seed(0)
+    with prefetch(range(40), depth=8, func=_jittered, workers=4) as items:
+        assert list(items) == [i * 10 for i in range(40)]
+
+
+def test_depth_must_be_positive():
+    """a zero-sized read-ahead is rejected"""
+    with pytest.raises(ValueError, match='depth'):
+        Prefetcher([], depth=0)
+
+
+def test_source_error_surfaces_at_its_position():
+    """items before a failing read are delivered, then the error, then nothing"""
+    items = prefetch(Source(range(10), fail_at=3))
+    assert [next(items) for _ in range(3)] == [0, 1, 2]
+    with pytest.raises(ValueError, match='bad item 3'):
+        next(items)
+    assert list(items) == []
+
+
+def test_func_error_surfaces_at_its_position():
+    """an exception from func is raised when its item is reached"""
+
+    def load(value):
+        if value == 4:
+            raise KeyError(value)
+        return value
+
+    received = []
+    with pytest.raises(KeyError):
+        for value in prefetch(range(10), depth=4, func=load, workers=2):
+            received.append(value)
+    assert received == [0, 1, 2, 3]
+
+
+def test_leaving_with_block_stops_reading_and_closes_source():
+    """breaking out of the loop cancels read-ahead and closes the source generator"""
+    source = Source(range(1_000))
+    with prefetch(source, depth=2) as items:
+        for value in items:
+            if value == 5:
+                break
+    assert source.closed.wait(timeout=5)
+    # At most the consumed items, a full queue and the one blocked in put were read.
+    assert source.read <= 6 + 2 + 1
+    assert list(items) == []
+
+
+def test_close_cancels_pending_loads():
+    """close drops queued loads that have not started"""
+    started = []
+
+    def load(value):
+        started.append(value)
+        time.sleep(0.05)
+        return value
+
+    items = prefetch(Source(range(100)), depth=4, func=load, workers=1)
+    assert next(items) == 0
+    items.close()
+    items.close()
+    time.sleep(0.2)
+    assert len(started) < 100
+    with pytest.raises(StopIteration):
+        next(items)
+
+
+def test_stats_count_items_and_stalls():
+    """a slow source shows up as stalls; a fast one as read-ahead depth"""
+    slow = prefetch(range(5), func=lambda value: time.sleep(0.02) or value)
+    assert list(slow) == list(range(5))
+    stats = slow.stats
+    assert stats.items == 5
+    assert stats.stalls >= 1
+    assert stats.stall_seconds > 0
+    assert 0 < stats.stall_fraction <= 1
+
+    fast = prefetch(range(5), depth=3)
+    consumed = []
+    for value in fast:
+        time.sleep(0.02)
+        consumed.append(value)
+    stats = fast.stats
+    assert stats.items == 5
+    assert stats.busy_seconds > 0
+    assert stats.max_depth >= 1
+    assert stats.mean_depth == stats.total_depth / 5
+    assert not stats.io_bound
+
+
+def test_stats_is_a_snapshot():
+    """stats returns a copy; derived values handle zero counts"""
+    items = prefetch(range(3))
+    snapshot = items.stats
+    list(items)
+    assert snapshot.items == 0
+    assert items.stats.items == 3
+    empty = PrefetchStats()
+    assert (empty.mean_depth, empty.stall_fraction, empty.io_bound) == (0.0, 0.0, False)
@@ -0,0 +1,140 @@
+import sys
+import tracemalloc
+import types
+
+import pytest
+
+from {{ package_name }}.utils import profiling
+from {{ package_name }}.utils.profiling import (
+    CellProfiler,
+    format_cells,
+    hottest_cells,
+    load_records,
+    notebook_name,
+)
+
+
+class _Events:
+    def __init__(self):
+        self.callbacks = {}
+
+    def register(self, event, callback):
+        self.callbacks.setdefault(event, []).append(callback)
+
+    def unregister(self, event, callback):
+        self.callbacks[event].remove(callback)
+
+
+@pytest.fixture
+def ipython():
+    return types.SimpleNamespace(events=_Events())
+
+
+@pytest.fixture
+def no_notebook(monkeypatch):
+    """no front end tells the notebook's name"""
+    for variable in ('JPY_SESSION_NAME', '__vsc_ipynb_file__'):
+        monkeypatch.delenv(variable, raising=False)
+    monkeypatch.delattr(sys.modules['__main__'], '__vsc_ipynb_file__', raising=False)
+    monkeypatch.delitem(sys.modules, 'ipykernel', raising=False)
+    monkeypatch.setattr(profiling, '_fallback_name', None)
+
+
+@pytest.fixture
+def untraced():
+    was_tracing = tracemalloc.is_tracing()
+    tracemalloc.stop()
+    yield
+    tracemalloc.stop()
+    if was_tracing:
+        tracemalloc.start()
+
+
+def test_unregister_keeps_users_tracemalloc_session(tmp_path, ipython, untraced):
+    """tracing that was on before register is still on after unregister"""
+    tracemalloc.start()
+    profiler = CellProfiler(tmp_path / 'cells.jsonl', trace_memory=True)
+    profiler.register(ipython)
+    profiler.unregister()
+    assert tracemalloc.is_tracing()
+
+
+def test_unregister_stops_tracing_it_started(tmp_path, ipython, untraced):
+    """tracing started by register is stopped by unregister"""
+    profiler = CellProfiler(tmp_path / 'cells.jsonl', trace_memory=True)
+    profiler.register(ipython)
+    assert tracemalloc.is_tracing()
+    profiler.unregister()
+    assert not tracemalloc.is_tracing()
+    assert ipython.events.callbacks == {'pre_run_cell': [], 'post_run_cell': []}
+
+
+def test_notebook_name_from_environment(monkeypatch, no_notebook):
+    """the front end's notebook path wins"""
+    monkeypatch.setenv('JPY_SESSION_NAME', '/work/notebooks/explore.ipynb')
+    assert notebook_name() == 'explore'
+
+
+def test_notebook_name_fallback_is_stable_and_unique(monkeypatch, no_notebook):
+    """without a name, each session gets its own and keeps it"""
+    first = notebook_name()
+    assert first != 'notebook'
+    assert notebook_name() == first
+    monkeypatch.setattr(profiling, '_fallback_name', None)
+    monkeypatch.setattr(profiling.os, 'getpid', lambda: -1)
+    assert notebook_name() != first
+
+
+def test_notebook_name_fallback_uses_kernel_id(monkeypatch, no_notebook):
+    """inside a Jupyter kernel the fallback is the kernel's id"""
+    kernel = types.SimpleNamespace(get_connection_file=lambda: '/run/jupyter/kernel-1234-abcd.json')
+    monkeypatch.setitem(sys.modules, 'ipykernel', kernel)
+    assert notebook_name() == 'kernel-1234-abcd'
+
+
+class _Clock:
+    """stands in for the timers and rss so a cell costs exactly what the test says"""
+
+    def __init__(self, monkeypatch):
+        self.wall = self.cpu = 0.0
+        self.rss = 100 * 2**20
+        monkeypatch.setattr(profiling.time, 'perf_counter', lambda: self.wall)
+        monkeypatch.setattr(profiling.time, 'process_time', lambda: self.cpu)
+        monkeypatch.setattr(profiling, 'current_rss', lambda: self.rss)
+
+    def run(self, profiler, source, wall, cpu=0.0, rss_mb=0, count=None):
+        profiler.pre_run_cell(types.SimpleNamespace(raw_cell=source))
+        self.wall += wall
+        self.cpu += cpu
+        self.rss += rss_mb * 2**20
+        profiler.post_run_cell(types.SimpleNamespace(execution_count=count, success=True))
+
+
+def test_post_run_cell_records_costs(tmp_path, monkeypatch):
+    """a cell's wall, cpu and rss change are measured between pre and post"""
+    clock = _Clock(monkeypatch)
+    profiler = CellProfiler(tmp_path / 'cells.jsonl')
+    clock.run(profiler, '\n# Load\ndf = load()\n', wall=2.5, cpu=1.25, rss_mb=64, count=3)
+    profiler.post_run_cell()
+    [record] = load_records(profiler.log_path)
+    assert record['execution_count'] == 3
+    assert record['first_line'] == '# Load'
+    assert record['success'] is True
+    assert (record['wall_s'], record['cpu_s']) == (2.5, 1.25)
+    assert (record['rss_mb'], record['rss_delta_mb']) == (164.0, 64.0)
+
+
+def test_hottest_cells_keeps_cells_sharing_a_first_line(tmp_path, monkeypatch):
+    """cells starting with the same line are ranked separately; a re-run replaces its earlier run"""
+    clock = _Clock(monkeypatch)
+    profiler = CellProfiler(tmp_path / 'cells.jsonl')
+    clock.run(profiler, 'import pandas as pd\ndf = pd.read_csv(path)', wall=3.0, rss_mb=10)
+    clock.run(profiler, 'import pandas as pd\ndf.describe()', wall=1.0, rss_mb=30)
+    clock.run(profiler, 'df.head()', wall=0.5, rss_mb=20)
+    clock.run(profiler, 'import pandas as pd\ndf = pd.read_csv(path)', wall=2.0)
+
+    ranked = hottest_cells(profiler.log_path)
+    assert [record['wall_s'] for record in ranked] == [2.0, 1.0, 0.5]
+    by_memory = hottest_cells(profiler.log_path, n=2, key='rss_delta_mb')
+    assert [record['rss_delta_mb'] for record in by_memory] == [30.0, 20.0]
+    assert 'import pandas as pd' in format_cells(ranked)
@@ -0,0 +1,171 @@
+import multiprocessing
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+import pandas as pd
+import pandas.testing as tm
+import pytest
+
+from {{ package_name }}.utils import shared
+from {{ package_name }}.utils.shared import SharedArena, SharedArray, SharedTable
+
+
+@pytest.fixture
+def arena():
+    with SharedArena() as arena:
+        yield arena
+
+
+def _exists(block):
+    try:
+        shm = shared._open_block(block)
+    except FileNotFoundError:
+        return False
+    shm.close()
+    return True
+
+
+def _roundtrip(handle):
+    """the handle as a worker receives it"""
+    return pickle.loads(pickle.dumps(handle))
+
+
+def _array_total(handle: SharedArray) -> float:
+    return float(handle.open().sum())
+
+
+def _totals_after_attaching_more(first: SharedArray, second: SharedArray) -> float:
+    view = first.open()
+    # Attaching another block drops unused mappings; the live view must keep its own.
+    second.open()
+    return float(view.sum())
+
+
+def _crash(handle: SharedArray) -> None:
+    handle.open()
+    os._exit(1)
+
+
+def test_share_array_roundtrip(arena):
+    """arrays come back equal, read-only unless asked otherwise"""
+    array = np.arange(12, dtype='float32').reshape(3, 4)
+    handle = _roundtrip(arena.share_array(array))
+    view = handle.open()
+    np.testing.assert_array_equal(view, array)
+    assert view.dtype == array.dtype
+    assert not view.flags.writeable
+    assert handle.open(writable=True).flags.writeable
+    dates = np.array(['2024-01-01', 'NaT'], dtype='datetime64[ns]')
+    np.testing.assert_array_equal(_roundtrip(arena.share_array(dates)).open(), dates)
+
+
+def test_share_array_rejects_object_dtype(arena):
+    """object arrays cannot be mapped"""
+    with pytest.raises(TypeError, match='object'):
+        arena.share_array(np.array(['a', None], dtype=object))
+
+
+def test_share_table_roundtrip(arena):
+    """categorical, tz-aware, nullable and string columns and a non-range index survive"""
+    df = pd.DataFrame(
+        {
+            'amount': [1.5, 2.5, np.nan],
+            'quantity': np.array([1, 2, 3], dtype='int16'),
+            'segment': pd.Categorical(['b', 'a', None], categories=['a', 'b'], ordered=True),
+            'created': pd.date_range('2024-03-30 23:00', periods=3, freq='h', tz='Europe/Berlin'),
+            'count': pd.array([1, None, 3], dtype='Int64'),
+            'label': pd.array(['x', None, 'z'], dtype='string'),
+            'flag': pd.array([True, None, False], dtype='boolean'),
+            'note': ['free', 'text', None],
+        },
+        index=pd.Index([10, 20, 30], name='order_id'),
+    )
+    handle = _roundtrip(arena.share_table(df))
+    assert isinstance(handle, SharedTable)
+    assert handle.index is not None
+    result = handle.open()
+    tm.assert_frame_equal(result, df)
+    assert result.equals(df)
+
+
+def test_share_table_index_kinds(arena):
+    """range, datetime and categorical indexes come back as they were"""
+    values = {'x': [1.0, 2.0, 3.0]}
+    for index in (
+        pd.RangeIndex(5, 11, 2),
+        pd.DatetimeIndex(['2024-01-01', '2024-01-02', '2024-01-03'], tz='UTC', name='day'),
+        pd.CategoricalIndex(['a', 'b', 'a'], name='group'),
+    ):
+        df = pd.DataFrame(values, index=index)
+        tm.assert_frame_equal(_roundtrip(arena.share_table(df)).open(), df)
+
+
+def test_share_table_mapping(arena):
+    """a mapping of arrays opens as a dict of views"""
+    table = {'a': np.arange(3), 'b': np.linspace(0, 1, 3)}
+    result = _roundtrip(arena.share_table(table)).open()
+    assert list(result) == ['a', 'b']
+    for name, values in table.items():
+        np.testing.assert_array_equal(result[name], values)
+    with pytest.raises(TypeError, match="'c'"):
+        arena.share_table({'c': np.array([object()])})
+
+
+def test_unshared_column_is_a_snapshot(arena):
+    """changing the source frame afterwards does not change the handle"""
+    df = pd.DataFrame({'count': pd.array([1, None], dtype='Int64')})
+    handle = arena.share_table(df)
+    df.loc[0, 'count'] = 99
+    assert handle.open()['count'].tolist() == [1, pd.NA]
+
+
+def test_release_and_close_unlink_blocks():
+    """release unlinks one block, close the rest, and both are safe to repeat"""
+    arena = SharedArena()
+    first = arena.share_array(np.arange(4))
+    second = arena.share_table(pd.DataFrame({'x': [1, 2]}))
+    assert arena.nbytes >= 32
+    arena.release(first)
+    arena.release(first)
+    assert not _exists(first.block)
+    assert _exists(second.block)
+    arena.close()
+    arena.close()
+    assert not _exists(second.block)
+    assert arena.nbytes == 0
+
+
+def test_views_outlive_close(arena):
+    """views in the owner stay readable after the block is unlinked"""
+    handle = arena.share_array(np.arange(5))
+    view = handle.open()
+    arena.close()
+    assert view.sum() == 10
+    assert not _exists(handle.block)
+
+
+def test_worker_crash_leaves_blocks_valid(arena):
+    """a worker that dies while mapping a block does not unlink it; a new pool can still read it"""
+    handle = arena.share_array(np.arange(100, dtype='float64'))
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+        with pytest.raises(BrokenProcessPool):
+            pool.submit(_crash, handle).result()
+    assert _exists(handle.block)
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+        assert pool.submit(_array_total, handle).result() == 4950.0
+    assert _exists(handle.block)
+    arena.close()
+    assert not _exists(handle.block)
+
+
+def test_worker_views_survive_attaching_more_blocks(arena):
+    """a worker's views stay valid when it maps further blocks"""
+    first = arena.share_array(np.arange(10, dtype='float64'))
+    second = arena.share_array(np.ones(3))
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+        assert pool.submit(_totals_after_attaching_more, first, second).result() == 45.0